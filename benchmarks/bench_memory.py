@@ -0,0 +1,153 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Memory footprint benchmark of parsed .rmb/.rab data in the Blender 2.49 representation
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import rmb_rab_parser
+from rmb_rab_parser import load_rmb, load_rab
+from bench_parse import TIERS, tier_files
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'memory.json')
+
+
+def retained(function):
+    """(result, bytes allocated by `function` that are still alive after it returned)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+def tuple_rows(values):
+    return [tuple(row) for row in values]
+
+def as_tuples(kind, parsed):
+    """The same data in the list of tuples layout the parser returned before the typed arrays"""
+    if kind == 'rmb':
+        return [(tuple_rows(mesh.vert_pos_list), tuple_rows(mesh.vert_norm_list), tuple_rows(mesh.vert_uv_list),
+                 tuple(mesh.indice_list), tuple_rows(mesh.skin.weight_list) if mesh.skin else None,
+                 tuple_rows(mesh.skin.indice_list) if mesh.skin else None) for mesh in parsed.meshes]
+
+    return [(tuple(bone.pos_frames), tuple(bone.rot_frames), list(bone.pos_frame_list), list(bone.rot_frame_list),
+             tuple_rows(bone.pos_key_list), tuple_rows(bone.rot_key_list), tuple_rows(bone.rot_accum_list)) for bone in parsed.bones]
+
+def item_count(kind, parsed):
+    """Vertices of a model or position + rotation keys of an action"""
+    if kind == 'rmb':
+        return sum([mesh.vertices_count for mesh in parsed.meshes])
+    return sum([bone.pos_frame_count + bone.rot_frame_count for bone in parsed.bones])
+
+def run(tiers, data_dir):
+    """{"<tier>/<kind>": {"arrays", "tuples", "items"}}, sizes in bytes"""
+    tier_paths = [(tier, tier_files(data_dir, tier)) for tier in tiers]
+
+    results = {}
+    for tier, paths in tier_paths:
+        for kind, filepath in zip(('rmb', 'rab'), paths):
+            load = load_rmb if kind == 'rmb' else load_rab
+            # the first parse fills the texture lookup cache, it is not part of the model
+            load(filepath)
+            parsed, arrays = retained(lambda: load(filepath))
+            _, tuples = retained(lambda: as_tuples(kind, parsed))
+            results[f'{tier}/{kind}'] = {'arrays': arrays, 'tuples': tuples, 'items': item_count(kind, parsed)}
+    return results
+
+def environment():
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system()}
+
+def print_results(results, baseline, tolerance):
+    """Print one row per measurement with the change against the baseline, returns the regressed keys"""
+    regressions = []
+    print(f"{'benchmark':<14} {'arrays MB':>10} {'tuples MB':>10} {'reduction':>10} {'B/item':>8} {'baseline MB':>12} {'change':>8}")
+    for key, result in results.items():
+        unit = 'vertices' if key.endswith('/rmb') else 'keys'
+        line = (f"{key:<14} {result['arrays'] / 1e6:>10.2f} {result['tuples'] / 1e6:>10.2f} {1 - result['arrays'] / result['tuples']:>10.1%}"
+                f" {result['arrays'] / max(1, result['items']):>8.1f}")
+        if key in baseline:
+            change = result['arrays'] / baseline[key]['arrays'] - 1
+            line += f" {baseline[key]['arrays'] / 1e6:>12.2f} {change:>+8.1%}"
+            if change > tolerance:
+                regressions.append(key)
+                line += '  REGRESSION'
+        print(line + f'  ({unit})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory held by parsed synthetic .rmb/.rab files per size tier, typed arrays against lists of tuples")
+    parser.add_argument('--tiers', type=str, nargs='+', choices=list(TIERS), default=list(TIERS), help='Size tiers to run')
+    parser.add_argument('--data', type=str, default=None, help='Folder for the synthetic files, kept between runs (default: a temporary folder)')
+    parser.add_argument('--baseline', type=str, default=BASELINE_FILE, help=f'Baseline JSON file to compare with (default: {os.path.relpath(BASELINE_FILE)})')
+    parser.add_argument('--save-baseline', action='store_true', default=False, help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Growth against the baseline reported as a regression (default: 0.1 = 10%%)')
+    parser.add_argument('--json', type=str, default=None, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    # Blender 2.49 parses without numpy, the numpy views of the converter hold no copies at all
+    rmb_rab_parser.numpy = None
+
+    data_dir = args.data or tempfile.mkdtemp(prefix='rmb_bench_')
+    os.makedirs(data_dir, exist_ok=True)
+    try:
+        results = run(args.tiers, data_dir)
+    finally:
+        if args.data is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as file:
+            stored = json.load(file)
+        baseline = stored['results']
+        if stored['environment'] != environment():
+            print(f"Note: the baseline was measured on {stored['environment']}, this run is {environment()}")
+
+    regressions = print_results(results, baseline, args.tolerance)
+    report = {'environment': environment(), 'results': results}
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) use more memory than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
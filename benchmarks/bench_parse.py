@@ -0,0 +1,192 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Parse throughput benchmark of the .rmb/.rab parsing layer on synthetic models
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import model_cache
+from rmb_rab_parser import load_rmb, load_rab
+from rmb_rab_writer import write_synthetic_model
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# numpy changes every parse path, so there is one baseline with and one without it
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+BASELINE_FILE = os.path.join(BASELINE_DIR, 'parse.json' if numpy is not None else 'parse_no_numpy.json')
+
+# tier -> (meshes, vertices per mesh, bones, keys per bone)
+TIERS = {
+    'small': (1, 1000, 16, 30),
+    'medium': (4, 10000, 48, 300),
+    'large': (8, 60000, 96, 2000),
+}
+
+# parse modes: streamed reads, memory mapped numpy views, model cache sidecar hits
+MODES = ['stream', 'mmap', 'cache']
+
+
+def tier_files(data_dir, tier):
+    """(rmb, rab) of a tier, written on first use"""
+    name = f'm8{list(TIERS).index(tier)}'
+    rmb_file = os.path.join(data_dir, f'{name}.rmb')
+    rab_file = os.path.join(data_dir, f'{name}_walk.rab')
+    if not os.path.exists(rmb_file) or not os.path.exists(rab_file):
+        meshes, vertices, bones, keys = TIERS[tier]
+        write_synthetic_model(data_dir, name, meshes, vertices, bones, keys, ['walk'])
+    return rmb_file, rab_file
+
+# small files are parsed again until a measurement took this long, so their best time is stable
+MIN_SECONDS = 0.5
+
+def best_time(function, repeat, min_seconds=MIN_SECONDS):
+    """Best of at least `repeat` runs, more runs while the total is below `min_seconds`"""
+    best = None
+    total = 0.0
+    runs = 0
+    # like timeit, garbage collection pauses are not part of the measurement
+    gc.disable()
+    try:
+        while runs < repeat or total < min_seconds:
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            total += elapsed
+            runs += 1
+    finally:
+        gc.enable()
+    return best
+
+def loader(mode, kind):
+    load = load_rmb if kind == 'rmb' else load_rab
+    if mode == 'stream':
+        return lambda filepath: load(filepath, use_mmap=False)
+    elif mode == 'mmap':
+        return lambda filepath: load(filepath, use_mmap=True)
+    return model_cache.load_rmb if kind == 'rmb' else model_cache.load_rab
+
+def item_count(kind, parsed):
+    """Vertices of a model or position + rotation keys of an action"""
+    if kind == 'rmb':
+        return sum([mesh.vertices_count for mesh in parsed.meshes])
+    return sum([bone.pos_frame_count + bone.rot_frame_count for bone in parsed.bones])
+
+def run(tiers, modes, repeat, data_dir):
+    """{"<tier>/<kind>/<mode>": {"seconds", "mb_s", "items_s"}}"""
+    # every file is written up front, the texture lookup caches the directory listing
+    tier_paths = [(tier, tier_files(data_dir, tier)) for tier in tiers]
+
+    results = {}
+    for tier, paths in tier_paths:
+        files = dict(zip(('rmb', 'rab'), paths))
+        for mode in modes:
+            model_cache.set_cache_dir(os.path.join(data_dir, model_cache.MODEL_CACHE_DIR) if mode == 'cache' else None)
+            for kind, filepath in files.items():
+                load = loader(mode, kind)
+                # the first load builds the sidecar and warms the page cache
+                parsed = load(filepath)
+                seconds = best_time(lambda: load(filepath), repeat)
+                results[f'{tier}/{kind}/{mode}'] = {
+                    'seconds': seconds,
+                    'mb_s': os.path.getsize(filepath) / seconds / 1e6,
+                    'items_s': item_count(kind, parsed) / seconds,
+                }
+    model_cache.set_cache_dir(None)
+    return results
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': numpy.__version__ if numpy is not None else None, 'machine': platform.machine(), 'system': platform.system()}
+
+def print_results(results, baseline, tolerance):
+    """Print one row per measurement with the change against the baseline, returns the regressed keys"""
+    regressions = []
+    print(f"{'benchmark':<22} {'MB/s':>10} {'items/s':>14} {'baseline MB/s':>14} {'change':>8}")
+    for key, result in results.items():
+        unit = 'vertices' if '/rmb/' in key else 'keys'
+        line = f"{key:<22} {result['mb_s']:>10.1f} {result['items_s']:>14,.0f}"
+        if key in baseline:
+            change = result['mb_s'] / baseline[key]['mb_s'] - 1
+            line += f" {baseline[key]['mb_s']:>14.1f} {change:>+8.1%}"
+            if change < -tolerance:
+                regressions.append(key)
+                line += '  REGRESSION'
+        print(line + f'  ({unit})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse throughput (MB/s, vertices/s, keys/s) of synthetic .rmb/.rab files per size tier")
+    parser.add_argument('--tiers', type=str, nargs='+', choices=list(TIERS), default=list(TIERS), help='Size tiers to run')
+    parser.add_argument('--modes', type=str, nargs='+', choices=MODES, default=None, help='Parse modes to run (default: all, mmap needs numpy)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, the best one is reported')
+    parser.add_argument('--data', type=str, default=None, help='Folder for the synthetic files, kept between runs (default: a temporary folder)')
+    parser.add_argument('--baseline', type=str, default=BASELINE_FILE, help=f'Baseline JSON file to compare with (default: {os.path.relpath(BASELINE_FILE)})')
+    parser.add_argument('--save-baseline', action='store_true', default=False, help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Slowdown against the baseline reported as a regression (default: 0.5 = 50%%, sub millisecond runs vary a lot on busy machines)')
+    parser.add_argument('--json', type=str, default=None, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    modes = args.modes or [mode for mode in MODES if mode != 'mmap' or numpy is not None]
+    data_dir = args.data or tempfile.mkdtemp(prefix='rmb_bench_')
+    os.makedirs(data_dir, exist_ok=True)
+    try:
+        results = run(args.tiers, modes, args.repeat, data_dir)
+    finally:
+        if args.data is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as file:
+            stored = json.load(file)
+        baseline = stored['results']
+        if stored['environment'] != environment():
+            print(f"Note: the baseline was measured on {stored['environment']}, this run is {environment()}")
+
+    regressions = print_results(results, baseline, args.tolerance)
+    report = {'environment': environment(), 'repeat': args.repeat, 'results': results}
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Generate synthetic .rmb/.rab/.txt models for tests and benchmarks
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from rmb_rab_writer import write_synthetic_model, RMB_MAX_VERTICES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic models: <name>.rmb, <name>_<action>.rab, <name>.txt and placeholder textures")
+    parser.add_argument('output', type=str, help='Folder the models are written to')
+    parser.add_argument('--name', type=str, default='m9', help='Model name prefix, the model number is appended (no "_" allowed)')
+    parser.add_argument('--count', type=int, default=1, help='Number of models')
+    parser.add_argument('--meshes', type=int, default=2, help='Meshes per model')
+    parser.add_argument('--vertices', type=int, default=5000, help=f'Vertices per mesh (at most {RMB_MAX_VERTICES})')
+    parser.add_argument('--bones', type=int, default=32, help='Bones per model')
+    parser.add_argument('--keys', type=int, default=60, help='Position and rotation keys per bone and action')
+    parser.add_argument('--actions', type=str, nargs='*', default=['walk', 'idle'], help='Action names, one .rab file each')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed, the same seed writes the same files')
+    args = parser.parse_args()
+
+    if '_' in args.name or any('_' in action for action in args.actions):
+        parser.error('model and action names can not contain "_", it separates them in the .rab file names')
+
+    os.makedirs(args.output, exist_ok=True)
+    for i in range(args.count):
+        name = f'{args.name}{i:04d}'
+        txt_path = write_synthetic_model(args.output, name, args.meshes, args.vertices, args.bones, args.keys, args.actions, args.seed + i * 1000)
+        print(txt_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,12 @@ import sys
 import Blender
 import os
 from rmb_rab_import import rmb_rab_import
+from Blender.Mathutils import Vector, Quaternion
+import texture_index
+import model_cache
+import progress_events
+import stage_timer
+import script_profiler
 from collections import defaultdict
 import logging
 
@@ -61,48 +67,127 @@ def fix_transforms(obj):
     obj.SizeY *= 0.01
     obj.SizeZ *= 0.01
 
+def import_file(filepath):
+    # the converter reads the stage/error events while the session is running
+    progress_events.stage('import', filepath)
+    if not rmb_rab_import(filepath):
+        progress_events.error("Failed to import {0}".format(os.path.basename(filepath)), filepath)
+        return False
+    return True
+
+def save_blend(filepath):
+    progress_events.stage('save', filepath)
+    with stage_timer.stage('save', filepath):
+        Blender.Save(filepath, 1)
+    progress_events.saved(filepath)
+
 def importer(output, rmb_file, rab_files):
-    rmb_rab_import(rmb_file)
+    # the mesh is saved to <rmb>.blend, then every action is imported into <rmb>_all.blend,
+    # the same files as the converter's conversion units
+    if not import_file(rmb_file):
+        return
 
     rmb_filename = os.path.basename(rmb_file)
-    rmb_filename_no_ext = rmb_filename.replace('.rmb', '')
+    rmb_filename_no_ext = os.path.splitext(rmb_filename)[0]
     output_filepath = os.path.join(output, rmb_filename_no_ext)
     if not os.path.exists(output_filepath):
         os.makedirs(output_filepath)
 
-    rmb_blend_path = os.path.join(output_filepath, rmb_filename.replace('.rmb', '.blend'))
+    mesh_obj = find_mesh_object(rmb_filename_no_ext)
+
+    # fix transforms
+    if mesh_obj:
+        fix_transforms(mesh_obj)
+        logger.info("Transforms fixed for {0}".format(mesh_obj.getName()))
+    else:
+        logger.error("Mesh object not found for {0}".format(rmb_filename_no_ext))
+
+    rmb_blend_path = os.path.join(output_filepath, rmb_filename_no_ext + '.blend')
+    save_blend(rmb_blend_path)
     logger.info("Mesh file {0} imported.".format(rmb_blend_path))
 
-    last_action_path = None
-    for rab_file in rab_files:
-        rmb_rab_import(rab_file)
+    if not rab_files:
+        return
 
-        rab_filename = os.path.basename(rab_file)
-        rab_blend_path = os.path.join(output_filepath, rab_filename.replace('.rab', '.blend'))
+    for rab_file in rab_files:
+        if not import_file(rab_file):
+            continue
+        logger.info("Action file {0} imported.".format(rab_file))
 
-        last_action_path = rab_blend_path
-        logger.info("Action file {0} imported.".format(rab_blend_path))
+    all_blend_path = os.path.join(output_filepath, rmb_filename_no_ext + '_all.blend')
+    save_blend(all_blend_path)
+    logger.info("Actions saved to {0}".format(all_blend_path))
 
-    output_filepath = rmb_blend_path if rab_files is None or len(rab_files) == 0 or len(rab_files) > 1 else last_action_path
-    if len(rab_files) > 1:
-        output_filepath = rmb_blend_path.split('.')[0] + '_all' + rmb_blend_path.split('.')[1]
-    
+def find_mesh_object(name):
     # find the mesh object by name
-    mesh_obj = None
     for obj in Blender.Object.Get():
-        if obj.getName().startswith(rmb_filename_no_ext):
-            mesh_obj = obj
-            break
+        if obj.getName().startswith(name):
+            return obj
+    return None
 
-    # fix transforms
-    if mesh_obj:
-        fix_transforms(mesh_obj)
-        logger.info("Transforms fixed for {0}".format(mesh_obj.getName()))
-    else:
-        logger.error("Mesh object not found for {0}".format(rmb_filename_no_ext))
+def strip_action(name):
+    # unlink the active action and put the armature back into rest pose,
+    # actions without users are not written by Blender.Save
+    for obj in Blender.Object.Get():
+        if obj.getType() != 'Armature' or obj.getName() != name:
+            continue
+
+        try:
+            obj.action = None
+        except (AttributeError, TypeError):
+            pass
+
+        pose = obj.getPose()
+        for pbone in pose.bones.values():
+            pbone.loc = Vector(0, 0, 0)
+            pbone.quat = Quaternion(1, 0, 0, 0)
+            pbone.size = Vector(1, 1, 1)
+        pose.update()
+
+def session_importer(output, rmb_file, rab_files, save_mesh=True):
+    # import the mesh once, then apply, save and strip the actions one by one,
+    # parallel sessions of the same model pass save_mesh=False except the first one
+    with script_profiler.profile(rmb_file):
+        if not import_file(rmb_file):
+            return
+
+        rmb_filename = os.path.basename(rmb_file)
+        rmb_filename_no_ext = rmb_filename.replace('.rmb', '')
+        output_filepath = os.path.join(output, rmb_filename_no_ext)
+        if not os.path.exists(output_filepath):
+            try:
+                os.makedirs(output_filepath)
+            except OSError:
+                # created meanwhile by a parallel session
+                if not os.path.isdir(output_filepath):
+                    raise
+
+        mesh_obj = find_mesh_object(rmb_filename_no_ext)
+        if mesh_obj:
+            fix_transforms(mesh_obj)
+            logger.info("Transforms fixed for {0}".format(mesh_obj.getName()))
+        else:
+            logger.error("Mesh object not found for {0}".format(rmb_filename_no_ext))
 
-    Blender.Save(output_filepath, 1)
-    Blender.Quit()
+        if save_mesh:
+            rmb_blend_path = os.path.join(output_filepath, rmb_filename.replace('.rmb', '.blend'))
+            save_blend(rmb_blend_path)
+            logger.info("Mesh file {0} imported.".format(rmb_blend_path))
+
+    for rab_file in rab_files:
+        with script_profiler.profile(rab_file):
+            # a failed action is reported and skipped, the session goes on with the next one
+            if not import_file(rab_file):
+                strip_action(rmb_filename_no_ext)
+                continue
+
+            rab_filename = os.path.basename(rab_file)
+            rab_blend_path = os.path.join(output_filepath, rab_filename.replace('.rab', '.blend'))
+            save_blend(rab_blend_path)
+            logger.info("Action file {0} imported.".format(rab_blend_path))
+
+            with stage_timer.stage('strip', rab_blend_path):
+                strip_action(rmb_filename_no_ext)
 
 def parse_arguments():
     parsed_args = defaultdict(list)
@@ -125,11 +210,37 @@ def parse_arguments():
         else:
             i += 1
     
-    return parsed_args['--out'][0], parsed_args['--rmb'][0], parsed_args['--rab']
+    return parsed_args
 
 def main():
-    output, rmb, rabs = parse_arguments()
-    importer(output, rmb, rabs)
+    args = parse_arguments()
+    output, rmb, rabs = args['--out'][0], args['--rmb'][0], args['--rab']
+
+    if args['--texture-cache']:
+        texture_index.set_cache_file(args['--texture-cache'][0])
+    if args['--model-cache']:
+        model_cache.set_cache_dir(args['--model-cache'][0])
+    if args['--timings']:
+        stage_timer.start('blender249')
+    if args['--profile']:
+        script_profiler.start(args['--profile'][0], 'blender249')
+
+    try:
+        if '--session' in args:
+            session_importer(output, rmb, rabs, '--skip-mesh' not in args)
+        else:
+            # every action goes into the same .blend file, the whole import is one profiled job
+            with script_profiler.profile(rmb):
+                importer(output, rmb, rabs)
+    except Exception as e:
+        progress_events.error("Blender 2.49 import failed: {0}".format(e), rmb)
+        raise
+    finally:
+        texture_index.save_cache()
+        if args['--timings']:
+            stage_timer.write(args['--timings'][0])
+
+    Blender.Quit()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -19,15 +19,24 @@
 
 
 from collections import defaultdict
-from io import BufferedReader
+import json
 import os
-import struct
 import sys
+import time
 import bpy
 from math import radians
 from bpy_extras import node_shader_utils, image_utils
 import logging
 
+# Blender does not put the script directory on sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from rmb_rab_format import RMB_HEADER, RMB_TEXTURE, RMB_MESH
+import texture_index
+import model_cache
+import progress_events
+import stage_timer
+import script_profiler
+
 
 def setup_logging():
     logger = logging.getLogger("Blender36_ConvertLogger")
@@ -55,44 +64,6 @@ def setup_logging():
 logger = setup_logging()
 
 
-class BinaryReader():
-	"""General BinaryReader class"""
-	def __init__(self, inputFile: BufferedReader):
-		self.inputFile: BufferedReader = inputFile
-		self.endian = '<'
-		self.debug = False
-		self.mode = self.inputFile.mode if hasattr(self.inputFile, 'mode') else None
-
-	def read_bytes(self, count) -> bytes:
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(count)
-		return data
-	
-	def read_int32(self) -> int:
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(4)
-		data = struct.unpack(self.endian+'i', data)[0]
-		return data
-
-	def read_string(self, limit=1000) -> str:
-		if self.mode != 'rb':
-			return None
-		
-		completed = False
-		data = ''
-		for i in range(limit):
-			char = struct.unpack('c', self.inputFile.read(1))[0]
-			if char == b'\x00' or completed == True:
-				completed = True
-				continue # not break to set cursor to right position
-
-			data += char.decode('utf-8', errors='ignore')
-		return data
-
 class MeshTexture():
 	def __init__(self, diffuse=None, specular=None, normal=None):
 		self.diffuse = diffuse
@@ -136,6 +107,7 @@ def prepare_object(rmb_file, obj):
 	model = parse_model(rmb_file)
 	if model is None:
 		logger.error(f"Model not found: {rmb_file}")
+		progress_events.error(f"Model not found: {rmb_file}", rmb_file)
 		return
 	
 	def find_mesh(name):
@@ -155,76 +127,62 @@ def prepare_object(rmb_file, obj):
 				logger.error(f"Mesh not found data: {obj.name}")
 
 def find_texture_file(filepath):
-	if filepath is None:
-		return None
-		
-	dirname = os.path.dirname(filepath)
-	filename = os.path.basename(filepath)
-	files = os.listdir(dirname)
-	for file in files:
-		if file.lower() == filename.lower():
-			return dirname + os.sep + file
-		
-	return None
+	return texture_index.find_texture(filepath)
 
 def get_specific_texture(base_name: str, tex_type: str) -> str:
-	filename = base_name.split('.')[0]
-	ext = base_name.split('.')[-1]
-	filename = filename + tex_type + '.' + ext
-
-	if os.path.exists(filename):
-		return filename
-	else:
-		return None
+	return texture_index.find_specific_texture(base_name, tex_type)
 	
 def parse_model(filename):
-	directory = "E:\\map_zone\\models"
-	texture_directory = "E:\\map_zone\\models\\texture"
-
-	filepath = os.path.join(directory, filename)
+	# the converter passes the .rmb path it resolved, relative to its working directory
+	filepath = os.path.abspath(filename)
 	if not os.path.exists(filepath):
 		logger.error(f"File not found: {filepath}")
 		return None
+
+	# same texture directory lookup as the Blender 2.49 importer
+	texture_directory = texture_index.find_texture_dir(os.path.dirname(filepath))
 	
+	if model_cache.enabled():
+		# names from the pre-parsed model, the file itself is not read
+		cached = model_cache.load_rmb(filepath)
+		texture_names = [texture.name for texture in cached.textures]
+		mesh_names = [mesh.name for mesh in cached.meshes]
+	else:
+		with open(filepath, 'rb') as file:
+			header = RMB_HEADER.unpack_from(file.read(RMB_HEADER.size))
+			texture_count = header['texture_count']
+			mesh_count = header['mesh_count']
+			texture_names = [record['name'] for record in RMB_TEXTURE.unpack_array(file.read(RMB_TEXTURE.size * texture_count), 0, texture_count)]
+			mesh_names = [record['name'] for record in RMB_MESH.unpack_array(file.read(RMB_MESH.size * mesh_count), 0, mesh_count)]
+
 	model = Model(filename)
-	with open(filepath, 'rb') as file:
-		reader = BinaryReader(file)
-		# skip header
-		reader.read_bytes(20)
-		texture_count = reader.read_int32()
-		mesh_count = reader.read_int32()
-		reader.read_bytes(8)
-
-		model.textures = []
-		for a in range(texture_count):
-			texture = MeshTexture() 
-			texname = reader.read_string(limit=260)          # 260 bytes texture name
-
-			texpath = os.path.join(texture_directory, texname)
-			texture.diffuse = texpath
-			
-			# get specular texture
-			specular = get_specific_texture(os.path.join(texture_directory, texname), '_sp')
-			if specular is not None:
-				texture.specular = specular
-
-			# get normal texture
-			normal = get_specific_texture(os.path.join(texture_directory, texname), '_n')
-			if normal is not None:
-				texture.normal = normal
-
-			model.textures.append(texture)
-
-		model.meshes = []
-		for i in range(mesh_count):
-			mesh = ModelMesh()
-			reader.read_bytes(8)
-			mesh.name = reader.read_string(limit=64)
-			reader.read_bytes(64+20+2000)
-			model.meshes.append(mesh)
-
-		logger.info(f"Textures: {len(model.textures)}")
-		logger.info(f"Meshes: {len(model.meshes)}")
+	model.textures = []
+	for texname in texture_names:
+		texture = MeshTexture() 
+
+		texpath = os.path.join(texture_directory, texname)
+		texture.diffuse = texpath
+		
+		# get specular texture
+		specular = get_specific_texture(os.path.join(texture_directory, texname), '_sp')
+		if specular is not None:
+			texture.specular = specular
+
+		# get normal texture
+		normal = get_specific_texture(os.path.join(texture_directory, texname), '_n')
+		if normal is not None:
+			texture.normal = normal
+
+		model.textures.append(texture)
+
+	model.meshes = []
+	for name in mesh_names:
+		mesh = ModelMesh()
+		mesh.name = name
+		model.meshes.append(mesh)
+
+	logger.info(f"Textures: {len(model.textures)}")
+	logger.info(f"Meshes: {len(model.meshes)}")
 
 	return model
 
@@ -308,7 +266,7 @@ def parse_arguments():
         else:
             i += 1
     
-    return parsed_args['--out'][0], parsed_args['--rmb'][0]
+    return parsed_args
 
 def get_active_space_view3d(context: bpy.types.Context) -> bpy.types.SpaceView3D:
 	if context.space_data and context.space_data.type == 'VIEW_3D':
@@ -332,32 +290,126 @@ def enable_shading():
 	if space:
 		space.shading.type = 'MATERIAL'
 
-def main():
+def export_blend(output, rmb_file):
+	"""Set up the materials of the open .blend file, export it to FBX and resave it, returns stage timings"""
+	timings = {}
+
 	# get selected object
 	obj = bpy.context.scene.objects[0]
 	if obj == None:
 		logger.error("No object selected")
-		return
+		progress_events.error("No object selected", bpy.data.filepath)
+		return timings
 	
 	blend_file_path = bpy.data.filepath
 	blend_file_name = bpy.path.basename(blend_file_path)
 
-	output, rmb_file = parse_arguments()
 	if not os.path.exists(output):
 		os.makedirs(output)
 
 	# prepare object
-	prepare_object(rmb_file, obj)
+	start = time.perf_counter()
+	progress_events.stage('materials', blend_file_path)
+	with stage_timer.stage('materials', blend_file_path):
+		prepare_object(rmb_file, obj)
+	timings['materials'] = time.perf_counter() - start
 	
 	# export object to fbx
+	start = time.perf_counter()
 	export_filepath = os.path.join(output, blend_file_name.replace(".blend", ".fbx"))
-	export_fbx(export_filepath)
+	progress_events.stage('export', export_filepath)
+	with stage_timer.stage('export', blend_file_path):
+		export_fbx(export_filepath)
 	logger.info(f"Exported object to {export_filepath}")
+	progress_events.saved(export_filepath)
+	timings['export'] = time.perf_counter() - start
 
 
 	# NOTE: Extra logic here to resave blend file with shading enabled
-	enable_shading()
-	bpy.ops.wm.save_mainfile()
+	start = time.perf_counter()
+	progress_events.stage('save', blend_file_path)
+	with stage_timer.stage('save', blend_file_path):
+		enable_shading()
+		bpy.ops.wm.save_mainfile()
+	timings['save'] = time.perf_counter() - start
+
+	return timings
+
+# prefix of the server reply lines, everything else on stdout is Blender output
+SERVER_REPLY = 'EXPORT_RESULT '
+
+def serve():
+	"""Export worker: one JSON job per stdin line, one SERVER_REPLY line per job on stdout.
+
+	Job: {"id", "blend", "out", "rmb", "texture_cache", "model_cache", "timings", "profile"}
+	Reply: {"id", "status": "ok"|"error", "error", "timings": {"open", "materials", "export", "save"}}"""
+	logger.info("Export server started")
+	for line in sys.stdin:
+		line = line.strip()
+		if not line:
+			continue
+
+		reply = {'id': None, 'status': 'ok', 'error': None, 'timings': {}}
+		job = {}
+		try:
+			job = json.loads(line)
+			reply['id'] = job.get('id')
+
+			# every job sets or clears the caches, timer and profiler, nothing carries over from the previous job
+			texture_index.set_cache_file(job.get('texture_cache'))
+			model_cache.set_cache_dir(job.get('model_cache'))
+			if job.get('timings'):
+				stage_timer.start('blender36')
+			else:
+				stage_timer.stop()
+			script_profiler.start(job.get('profile'), 'blender36')
+
+			with script_profiler.profile(job['blend']):
+				start = time.perf_counter()
+				with stage_timer.stage('open', job['blend']):
+					bpy.ops.wm.open_mainfile(filepath=job['blend'])
+				reply['timings']['open'] = time.perf_counter() - start
+
+				reply['timings'].update(export_blend(job['out'], job['rmb']))
+		except Exception as e:
+			logger.error(f"Export job failed: {e}")
+			reply['status'] = 'error'
+			reply['error'] = str(e)
+		finally:
+			texture_index.save_cache()
+			if job.get('timings'):
+				stage_timer.write(job['timings'])
+			stage_timer.stop()
+
+		sys.stdout.write(SERVER_REPLY + json.dumps(reply) + '\n')
+		sys.stdout.flush()
+
+def main():
+	args = parse_arguments()
+	if args['--texture-cache']:
+		texture_index.set_cache_file(args['--texture-cache'][0])
+	if args['--model-cache']:
+		model_cache.set_cache_dir(args['--model-cache'][0])
+
+	if '--server' in args:
+		serve()
+		return
+
+	if args['--timings']:
+		stage_timer.start('blender36')
+	if args['--profile']:
+		script_profiler.start(args['--profile'][0], 'blender36')
+	try:
+		with script_profiler.profile(bpy.data.filepath):
+			export_blend(args['--out'][0], args['--rmb'][0])
+	except Exception as e:
+		# Blender exits with code 0 after a script error, the event is what the converter sees
+		progress_events.error(f"FBX export failed: {e}", bpy.data.filepath)
+		raise
+	finally:
+		texture_index.save_cache()
+		if args['--timings']:
+			stage_timer.write(args['--timings'][0])
 
 
 if __name__ == '__main__':
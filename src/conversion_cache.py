@@ -0,0 +1,173 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Content addressed manifest that lets the converter skip up to date .blend/.fbx outputs
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import json
+import os
+
+
+CACHE_MANIFEST = '.conversion_cache.json'
+CACHE_VERSION = 1
+
+# scripts that run inside Blender, a change in any of them invalidates every output
+SCRIPT_FILES = [
+    'bpy249_import.py',
+    'rmb_rab_import.py',
+    'rmb_rab_parser.py',
+    'rmb_rab_format.py',
+    'texture_index.py',
+    'model_cache.py',
+    'bpy36_export.py',
+]
+
+
+def file_digest(filepath):
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def script_files():
+    # Blender is started with ./bpy249_import.py and ./bpy36_export.py, so the scripts live in the working directory
+    return [os.path.abspath(name) for name in SCRIPT_FILES]
+
+
+class ConversionUnit():
+    """One output .blend and the .fbx exported from it, with every file it is built from"""
+    def __init__(self, name, inputs, blend_file, fbx_file, options, rab_file=None):
+        self.name = name
+        self.inputs = inputs
+        self.blend_file = blend_file
+        self.fbx_file = fbx_file
+        self.options = options
+        self.rab_file = rab_file
+        self.key = None
+
+
+class ConversionCache():
+    """Manifest of ConversionUnit outputs keyed by a sha256 over the unit inputs and options.
+
+    An output is up to date if the unit key is unchanged and the file still has the recorded
+    hash (size and mtime are compared first, files are only re-hashed when those changed)."""
+    def __init__(self, manifest_path, force=False):
+        self.manifest_path = manifest_path
+        self.force = force
+        self.units = {}
+        self.digests = {}
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as file:
+                    data = json.load(file)
+                if data.get('version') == CACHE_VERSION:
+                    self.units = data.get('units', {})
+            except (OSError, ValueError):
+                pass
+
+    def digest(self, filepath):
+        """sha256 of a file (memoized per size and mtime), None if it does not exist"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+
+        memo_key = (filepath, st.st_size, st.st_mtime)
+        if memo_key not in self.digests:
+            self.digests[memo_key] = file_digest(filepath)
+        return self.digests[memo_key]
+
+    def unit_key(self, unit):
+        if unit.key is None:
+            sha = hashlib.sha256()
+            sha.update(json.dumps(unit.options, sort_keys=True).encode('utf-8'))
+            for filepath in unit.inputs:
+                sha.update(f"\n{os.path.basename(filepath).lower()}:{self.digest(filepath)}".encode('utf-8'))
+            unit.key = sha.hexdigest()
+        return unit.key
+
+    def file_record(self, filepath):
+        st = os.stat(filepath)
+        return {'sha256': self.digest(filepath), 'size': st.st_size, 'mtime': st.st_mtime}
+
+    def matches(self, filepath, record):
+        if record is None:
+            return False
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return False
+
+        if st.st_size == record['size'] and st.st_mtime == record['mtime']:
+            return True
+        return self.digest(filepath) == record['sha256']
+
+    def is_fresh(self, unit, output):
+        """True if the 'blend' or 'fbx' output of `unit` is up to date"""
+        if self.force:
+            return False
+
+        entry = self.units.get(unit.name)
+        if entry is None or entry.get('key') != self.unit_key(unit):
+            return False
+        if not self.matches(unit.blend_file, entry.get('blend')):
+            return False
+        if output == 'fbx':
+            return self.matches(unit.fbx_file, entry.get('fbx'))
+        return True
+
+    def count(self, units, stale):
+        stale = set([unit.name for unit in stale])
+        for unit in units:
+            if unit.name in stale:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+    def record(self, unit, blend=False, fbx=False):
+        """Store the outputs written for `unit` in this run"""
+        entry = self.units.get(unit.name)
+        if blend:
+            # a new .blend makes the previous .fbx stale
+            entry = {'key': self.unit_key(unit)}
+        elif entry is None or entry.get('key') != self.unit_key(unit):
+            # exported from a .blend that was not built from the current inputs
+            return
+
+        if (blend or fbx) and os.path.exists(unit.blend_file):
+            # the export resaves the .blend, so it is recorded again after the .fbx
+            entry['blend'] = self.file_record(unit.blend_file)
+        if fbx and os.path.exists(unit.fbx_file):
+            entry['fbx'] = self.file_record(unit.fbx_file)
+
+        self.units[unit.name] = entry
+
+    def save(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({'version': CACHE_VERSION, 'units': self.units}, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def report(self):
+        total = self.hits + self.misses
+        forced = ' (--force)' if self.force else ''
+        return f"Cache: {self.hits} of {total} outputs up to date, {self.misses} rebuilt{forced}"
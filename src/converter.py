@@ -19,15 +19,35 @@
 
 
 import argparse
+import atexit
+from collections import defaultdict, deque
+import itertools
 import configparser
+import glob
+import json
+import marshal
+import pstats
 import subprocess
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 import zipfile
 import logging
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
+from rmb_rab_parser import inspect_file, rmb_texture_files, texture_files
+from conversion_cache import CACHE_MANIFEST, ConversionCache, ConversionUnit, script_files
+from native_export import export_native_fbx
+import model_cache
+from model_cache import MODEL_CACHE_DIR
+import progress_events
+import stage_timer
+from stage_timer import TIMINGS_DIR, StageTimer
+from script_profiler import PROFILE_EXT
+from gltf_export import export_native_glb
 
 
 CLI = False
@@ -240,86 +260,751 @@ def ask_to_download_blender36():
         print("Invalid input. Please enter 'y' or 'n'.")
         ask_to_download_blender36()
 
-def progress_bar(iteration, total, bar_length=50):
+def progress_bar(iteration, total, bar_length=50, label=None):
     progress = (iteration / total)
     arrow = '=' * int(round(bar_length * progress))
     spaces = ' ' * (bar_length - len(arrow))
+    # fixed width, so a shorter label overwrites the previous one
+    label = f' {label[-40:]:<40}' if label is not None else ''
 
-    sys.stdout.write(f'\r[{arrow}{spaces}] {int(progress * 100)}% ({iteration}/{total})')
+    sys.stdout.write(f'\r[{arrow}{spaces}] {int(progress * 100)}% ({iteration}/{total}){label}')
     sys.stdout.flush()
 
-def import_model(output, rmb_file, rab_files, all_in_one, mesh_only):
+class Progress():
+    """Aggregate progress bar shared by concurrent Blender jobs"""
+    def __init__(self, total):
+        self.total = total
+        self.count = 0
+        self.label = None
+        self.lock = threading.Lock()
+
+    def advance(self):
+        with self.lock:
+            self.count += 1
+            if CLI:
+                progress_bar(self.count, self.total, label=self.label)
+
+    def stage(self, label):
+        """Show the stage a Blender process just started next to the bar"""
+        with self.lock:
+            self.label = label
+            if CLI:
+                progress_bar(self.count, self.total, label=self.label)
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+def split_jobs(items, jobs):
+    """Split `items` round robin into at most `jobs` non empty chunks (one empty chunk for no items)"""
+    jobs = max(1, min(jobs or default_jobs(), len(items)))
+    return [items[i::jobs] for i in range(jobs)]
+
+# Blender output lines kept per process for error reports, older lines are dropped
+SUPERVISOR_TAIL_LINES = 200
+
+def log_event(source, event):
+    """Log a progress event of a Blender process as soon as it is read, errors are printed too"""
+    kind = event.get('event')
+    if kind == progress_events.EVENT_ERROR:
+        logger.error(f"{source}: {event.get('message')}")
+        print(f"\n{source}: {event.get('message')}")
+    elif kind == progress_events.EVENT_STAGE:
+        logger.debug(f"{source}: {event.get('stage')} {event.get('file')}")
+    elif kind == progress_events.EVENT_SAVED:
+        logger.info(f"{source}: saved {event.get('file')}")
+
+class SupervisedProcess():
+    """Blender process whose stdout and stderr are read line by line while it runs.
+
+    Event lines (see progress_events.py) are logged and passed to `on_event` as they
+    arrive. Of the other output only the last `tail_lines` lines are kept."""
+    def __init__(self, command, source, on_event=None, tail_lines=SUPERVISOR_TAIL_LINES):
+        self.command = command
+        self.source = source
+        self.on_event = on_event
+        self.tail = deque(maxlen=tail_lines)
+        self.errors = []
+        self.saved = []
+        self.returncode = None
+        # time.time() of the launch and seconds until the exit
+        self.launched = None
+        self.wall = None
+
+    def run(self):
+        self.launched = time.time()
+        process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace')
+        for line in process.stdout:
+            self.read_line(line)
+        self.returncode = process.wait()
+        self.wall = time.time() - self.launched
+        return self.returncode
+
+    def read_line(self, line):
+        event = progress_events.parse(line)
+        if event is None:
+            self.tail.append(line)
+            return
+
+        if event['event'] == progress_events.EVENT_ERROR:
+            self.errors.append(event.get('message'))
+        elif event['event'] == progress_events.EVENT_SAVED:
+            self.saved.append(event.get('file'))
+
+        log_event(self.source, event)
+        if self.on_event:
+            self.on_event(event)
+
+    def output(self):
+        return ''.join(self.tail)
+
+# stages listed at the end of every run
+TIMING_REPORT = 'timing_report.json'
+TIMING_TOP_STAGES = 10
+
+class TimingReport():
+    """Wall and CPU time per stage of every model of a run.
+
+    The converter times its own stages, the Blender scripts write theirs to a sidecar
+    file (--timings, see stage_timer.py) that is collected when the process is done."""
+    def __init__(self, output):
+        self.dir = os.path.join(output, TIMINGS_DIR)
+        self.timers = {}
+        self.records = defaultdict(list)
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+
+    def sidecar(self, process):
+        """Path a Blender process writes its stage timings to"""
+        os.makedirs(self.dir, exist_ok=True)
+        return os.path.join(self.dir, f"{process}_{os.getpid()}_{next(self.ids)}.json")
+
+    def stage(self, model, name, filepath=None):
+        """`with timing_report.stage(model, name):` times a stage of the converter itself"""
+        with self.lock:
+            if model not in self.timers:
+                self.timers[model] = StageTimer('converter')
+            return self.timers[model].stage(name, filepath)
+
+    def collect(self, model, process, sidecar, filepath, wall, launched=None):
+        """Add the stages of a finished Blender process, its startup (launch until the
+        script started) and its total, the CPU time is the one the script measured"""
+        data = stage_timer.read(sidecar)
+        records = [{'process': process, 'stage': 'total', 'file': filepath, 'wall': wall, 'cpu': data['cpu'] if data else None}]
+        if data is not None:
+            if launched is not None:
+                records.append({'process': process, 'stage': 'startup', 'file': filepath, 'wall': max(0.0, data['started'] - launched), 'cpu': None})
+            records += data['stages']
+
+        with self.lock:
+            self.records[model].extend(records)
+
+    def model_records(self, model):
+        timer = self.timers.get(model)
+        return (timer.records if timer else []) + self.records.get(model, [])
+
+    def report(self, top=TIMING_TOP_STAGES):
+        """{"models": {model: {"wall", "cpu", "actions": {action: {"process/stage": {"count", "wall", "cpu"}}}}},
+        "slowest": [{"stage", "count", "wall", "cpu", "max_wall"}]}, Blender process totals are not in "slowest" """
+        models = {}
+        slowest = {}
+        with self.lock:
+            names = sorted(set(self.timers) | set(self.records))
+            for model in names:
+                actions = {}
+                for record in self.model_records(model):
+                    # stages of a .rab/.blend file belong to its action, the others to the model
+                    action = os.path.splitext(os.path.basename(record['file']))[0] if record['file'] else model
+                    key = f"{record['process']}/{record['stage']}"
+                    entry = actions.setdefault(action, {}).setdefault(key, {'count': 0, 'wall': 0.0, 'cpu': 0.0})
+                    entry['count'] += 1
+                    entry['wall'] += record['wall']
+                    entry['cpu'] += record['cpu'] or 0.0
+
+                    if record['stage'] != 'total':
+                        total = slowest.setdefault(key, {'stage': key, 'count': 0, 'wall': 0.0, 'cpu': 0.0, 'max_wall': 0.0})
+                        total['count'] += 1
+                        total['wall'] += record['wall']
+                        total['cpu'] += record['cpu'] or 0.0
+                        total['max_wall'] = max(total['max_wall'], record['wall'])
+
+                # the converter and the Blender processes overlap, the model total is the sum of the leaf stages
+                leaves = [entry for stages in actions.values() for key, entry in stages.items() if not key.endswith('/total')]
+                models[model] = {'wall': sum([entry['wall'] for entry in leaves]), 'cpu': sum([entry['cpu'] for entry in leaves]), 'actions': actions}
+
+        return {'models': models, 'slowest': sorted(slowest.values(), key=lambda entry: -entry['wall'])[:top]}
+
+    def finish(self, output):
+        """Write TIMING_REPORT into `output` and print the slowest stages"""
+        report = self.report()
+        with open(os.path.join(output, TIMING_REPORT), 'w') as file:
+            json.dump(report, file, indent=2)
+
+        lines = [f"Slowest stages (report: {os.path.join(output, TIMING_REPORT)}):",
+                 f"  {'stage':<28} {'count':>6} {'wall s':>9} {'cpu s':>9} {'max s':>8}"]
+        for entry in report['slowest']:
+            lines.append(f"  {entry['stage']:<28} {entry['count']:>6} {entry['wall']:>9.3f} {entry['cpu']:>9.3f} {entry['max_wall']:>8.3f}")
+        for line in lines:
+            logger.info(line)
+            print(line)
+
+        # the sidecars are collected, only failed processes can leave files behind
+        try:
+            os.rmdir(self.dir)
+        except OSError:
+            pass
+        return report
+
+# set by use_timing_report(), every conversion of the run records its stages there
+timing_report = None
+
+def use_timing_report(output):
+    global timing_report
+    timing_report = TimingReport(output)
+    return timing_report
+
+def model_name(rmb_file):
+    return os.path.splitext(os.path.basename(rmb_file))[0]
+
+def timed(rmb_file, name, filepath=None):
+    """Stage of the converter for the model of `rmb_file`, not timed without a timing report"""
+    if timing_report is None:
+        return stage_timer.stage(name)
+    return timing_report.stage(model_name(rmb_file), name, filepath)
+
+def timing_args(sidecar):
+    return ['--timings', sidecar] if sidecar else []
+
+# merged profile of the jobs of a run and its top functions, written next to the .prof files
+PROFILE_MERGED = 'profile_merged.pstats'
+PROFILE_SUMMARY = 'profile_summary.txt'
+PROFILE_TOP = 20
+
+class ProfileData():
+    """pstats.Stats input of a .prof file read with marshal"""
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+def profile_key(func):
+    # profiles of Blender 2.49 are Python 2 data, their file and function names load as bytes
+    return tuple([part.decode('utf-8', 'replace') if isinstance(part, bytes) else part for part in func])
+
+def load_profile(filepath):
+    """ProfileData of a .prof file written by Python 2 or 3, None if it is empty or broken"""
+    try:
+        with open(filepath, 'rb') as file:
+            raw = marshal.load(file)
+    except (EOFError, ValueError, TypeError) as e:
+        logger.warning(f"Skipping profile {filepath}: {e}")
+        return None
+    if not isinstance(raw, dict):
+        logger.warning(f"Skipping profile {filepath}: not a pstats file")
+        return None
+
+    stats = {}
+    for func, (cc, nc, tt, ct, callers) in raw.items():
+        stats[profile_key(func)] = (cc, nc, tt, ct, {profile_key(caller): value for caller, value in callers.items()})
+    return ProfileData(stats) if stats else None
+
+class ScriptProfiles():
+    """.prof files the Blender scripts write with --profile (see script_profiler.py),
+    one per imported mesh/action and per exported .blend file, merged at the end of the run"""
+    def __init__(self, dirname, top=PROFILE_TOP):
+        self.dir = os.path.abspath(dirname)
+        self.top = top
+        os.makedirs(self.dir, exist_ok=True)
+        # the summary covers the jobs of this run only
+        for filepath in self.files():
+            os.remove(filepath)
+
+    def args(self):
+        return ['--profile', self.dir]
+
+    def files(self):
+        return sorted(glob.glob(os.path.join(self.dir, f'*{PROFILE_EXT}')))
+
+    def merged(self):
+        """(pstats.Stats of every job, job count), (None, 0) without profiles"""
+        stats = None
+        count = 0
+        for filepath in self.files():
+            data = load_profile(filepath)
+            if data is None:
+                continue
+            if stats is None:
+                stats = pstats.Stats(data)
+            else:
+                stats.add(data)
+            count += 1
+        return stats, count
+
+    def finish(self):
+        """Write PROFILE_MERGED and PROFILE_SUMMARY and print the functions with the most own time"""
+        stats, count = self.merged()
+        if stats is None:
+            logger.info(f"No profiles written to {self.dir}")
+            print(f"No profiles written to {self.dir}")
+            return None
+
+        stats.dump_stats(os.path.join(self.dir, PROFILE_MERGED))
+        with open(os.path.join(self.dir, PROFILE_SUMMARY), 'w') as file:
+            stats.stream = file
+            stats.sort_stats('tottime').print_stats(self.top)
+            stats.sort_stats('cumulative').print_stats(self.top)
+        stats.stream = sys.stdout
+
+        lines = [f"Profile hotspots of {count} job(s) (summary: {os.path.join(self.dir, PROFILE_SUMMARY)}):",
+                 f"  {'own s':>9} {'total s':>9} {'calls':>10}  function"]
+        stats.sort_stats('tottime')
+        for func in stats.fcn_list[:self.top]:
+            cc, nc, tt, ct, callers = stats.stats[func]
+            lines.append(f"  {tt:>9.3f} {ct:>9.3f} {nc:>10}  {pstats.func_std_string(pstats.func_strip_path(func))}")
+        for line in lines:
+            logger.info(line)
+            print(line)
+        return stats
+
+# set by use_script_profiles(), the Blender scripts of the run are then started with --profile
+script_profiles = None
+
+def use_script_profiles(dirname, top=PROFILE_TOP):
+    global script_profiles
+    script_profiles = ScriptProfiles(dirname, top)
+    return script_profiles
+
+def profile_args():
+    return script_profiles.args() if script_profiles else []
+
+# the commands are argv lists, paths with spaces need no quoting and run on every platform
+def rab_args(rab_files):
+    return [arg for rab_file in rab_files for arg in ('--rab', rab_file)]
+
+def session_249_command(output, rmb_file, rab_files, save_mesh, texture_cache=None, sidecar=None):
+    """Blender 2.49 session importing the mesh once and saving one .blend per action"""
+    skip_mesh = [] if save_mesh else ['--skip-mesh']
+    return ([blender_249_path, '-b', '-P', './bpy249_import.py', '--', '--out', output, '--rmb', rmb_file] + rab_args(rab_files) + ['--session'] + skip_mesh
+            + cache_args(texture_cache) + timing_args(sidecar) + profile_args())
+
+def import_249_command(output, rmb_file, rab_files, texture_cache=None, sidecar=None):
+    """Blender 2.49 import of the mesh and every action into the same .blend file"""
+    return ([blender_249_path, '-b', '-P', './bpy249_import.py', '--', '--out', output, '--rmb', rmb_file] + rab_args(rab_files)
+            + cache_args(texture_cache) + timing_args(sidecar) + profile_args())
+
+def export_36_command(blend_file, output, rmb_file, texture_cache=None, sidecar=None):
+    """Blender 3.6 export of one .blend file to FBX"""
+    return ([blender_36_path, '-b', blend_file, '--python', './bpy36_export.py', '--', '--out', output, '--rmb', rmb_file]
+            + cache_args(texture_cache) + timing_args(sidecar) + profile_args())
+
+def run_session_249(output, rmb_file, rab_files, save_mesh, texture_cache=None, progress=None, on_saved=None):
+    """Run one Blender 2.49 session, returns (returncode, saved .blend files, error messages, last output lines).
+
+    `on_saved(blend_file)` is called as soon as the session reports a saved file."""
+    sidecar = timing_report.sidecar('blender249') if timing_report else None
+    command_249 = session_249_command(output, rmb_file, rab_files, save_mesh, texture_cache, sidecar)
+
+    # the session reports one 'saved' event per .blend file
+    def on_event(event):
+        if event['event'] == progress_events.EVENT_STAGE and progress:
+            progress.stage(f"{event.get('stage')} {os.path.basename(event.get('file') or '')}")
+        elif event['event'] == progress_events.EVENT_SAVED:
+            if progress:
+                progress.advance()
+            if on_saved:
+                on_saved(event.get('file'))
+
+    session = SupervisedProcess(command_249, f"Blender 2.49 {os.path.basename(rmb_file)}", on_event)
+    session.run()
+    if timing_report:
+        timing_report.collect(model_name(rmb_file), 'blender249', sidecar, rmb_file, session.wall, session.launched)
+
+    return session.returncode, session.saved, session.errors, session.output()
+
+def check_sessions_249(chunks, results, save_mesh=True):
+    """Report failed sessions of split_jobs `chunks`, returns True if every .blend file was saved.
+
+    Error events were already reported while the sessions were running."""
+    ok = True
+    for i, (chunk, (returncode, saved, errors, output)) in enumerate(zip(chunks, results)):
+        expected = len(chunk) + (1 if i == 0 and save_mesh else 0)
+        if returncode != 0:
+            logger.error(f"Error while executing Blender 2.49 for {chunk}. Code: {returncode}, Output: {output}")
+            print(f"Error while executing Blender 2.49 for {chunk}. Code: {returncode}")
+            ok = False
+
+        if returncode == 0 and len(saved) < expected:
+            logger.error(f"Blender 2.49 saved {len(saved)} of {expected} .blend files for {chunk}, {len(errors)} error(s), Output: {output}")
+            print(f"Blender 2.49 saved {len(saved)} of {expected} .blend files for {chunk}")
+            ok = False
+
+    return ok
+
+def model_cache_dir(texture_cache):
+    # the parsed model sidecars live next to the texture index in the output folder
+    return os.path.join(os.path.dirname(texture_cache), MODEL_CACHE_DIR) if texture_cache else None
+
+def cache_args(texture_cache):
+    return ['--texture-cache', texture_cache, '--model-cache', model_cache_dir(texture_cache)] if texture_cache else []
+
+def warm_model_cache(rmb_file, rab_files):
+    """Build the parsed model sidecars once, before the Blender processes read them in parallel"""
+    if not model_cache.enabled():
+        return
+
+    for filepath in [rmb_file] + list(rab_files):
+        try:
+            with timed(rmb_file, 'model_cache', filepath):
+                if filepath.endswith('.rmb'):
+                    model_cache.load_rmb(filepath)
+                else:
+                    model_cache.load_rab(filepath)
+        except Exception as e:
+            # the Blender scripts parse the file themselves
+            logger.warning(f"Failed to cache {filepath}: {e}")
+
+def import_model(output, rmb_file, rab_files, all_in_one, mesh_only, texture_cache=None, jobs=None, save_mesh=True, results=None):
+    """Import the mesh and actions with Blender 2.49, returns True if every .blend file was saved.
+
+    The .blend files saved without an error are added to `results` (UnitResults)."""
     if all_in_one:
         # import mesh and all actions in the same .blend file
         logger.info("Importing mesh and all actions in the same .blend file...")
         print("Importing mesh and all actions in the same .blend file...")
-        rab_formatted = ' '.join([f'--rab "{rab_file}"' for rab_file in rab_files]) if not mesh_only else ''
-        command_249 = f"{blender_249_path} -b -P ./bpy249_import.py -- --out {output} --rmb {rmb_file} {rab_formatted}"
-
-        process = subprocess.run(command_249, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
-        if process.returncode != 0:
-            logger.error(f"Error while executing Blender 2.49: {process.stderr}")
-            print(f"Error while executing Blender 2.49: {process.stderr}")
+        sidecar = timing_report.sidecar('blender249') if timing_report else None
+        command_249 = import_249_command(output, rmb_file, rab_files if not mesh_only else [], texture_cache, sidecar)
+
+        # one .blend file with every action, a failed action makes it incomplete
+        process = SupervisedProcess(command_249, f"Blender 2.49 {os.path.basename(rmb_file)}")
+        process.run()
+        if timing_report:
+            timing_report.collect(model_name(rmb_file), 'blender249', sidecar, rmb_file, process.wall, process.launched)
+        if results is not None:
+            results.add_sessions([(process.returncode, process.saved, process.errors, '')])
+        if process.returncode != 0 or process.errors or not process.saved:
+            logger.error(f"Error while executing Blender 2.49. Code: {process.returncode}, Output: {process.output()}")
+            print(f"Error while executing Blender 2.49. Code: {process.returncode}")
             return False
-        elif 'error' in process.stdout.lower():
-            logger.info(process.stdout)
-            print(process.stdout)
     else:
-        # import mesh
-        logger.info("Importing RMB mesh...")
-        print("Importing RMB mesh...")
-        command_249 = f"{blender_249_path} -b -P ./bpy249_import.py -- --out {output} --rmb {rmb_file}"
-        # process = subprocess.run(command_249, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        process = subprocess.run(command_249, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
-        if process.returncode != 0:
-            logger.error(f"Error while executing Blender 2.49: {process.stderr}")
-            print(f"Error while executing Blender 2.49: {process.stderr}")
-            return False
-        elif 'error' in process.stdout.lower():
-            logger.info(process.stdout)
-            print(process.stdout)
-
+        # import mesh once per job and save every action to its own .blend,
+        # the actions are split between `jobs` concurrent Blender 2.49 sessions
         if mesh_only:
-            return True
-        
-        if len(rab_files) == 0:
+            rab_files = []
+
+        if not rab_files and not save_mesh:
             return True
 
-        # import actions separately
-        logger.info(f"Importing {len(rab_files)} RAB actions...")
-        print(f"Importing {len(rab_files)} RAB actions...")
-        total = len(rab_files)
-        for i, rab_file in enumerate(rab_files):
-            command_249 = f"{blender_249_path} -b -P ./bpy249_import.py -- --out {output} --rmb {rmb_file} --rab {rab_file}"
-            process = subprocess.run(command_249, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
-            if process.returncode != 0:
-                logger.error(f"\nError while executing Blender 2.49: {process.stderr}\n")
-                print(f"\nError while executing Blender 2.49: {process.stderr}\n")
-                return False
-            elif 'error' in process.stdout.lower():
-                logger.info(process.stdout)
-                print(process.stdout)
+        chunks = split_jobs(rab_files, jobs)
+        logger.info(f"Importing {'RMB mesh and ' if save_mesh else ''}{len(rab_files)} RAB actions in {len(chunks)} job(s)...")
+        print(f"Importing {'RMB mesh and ' if save_mesh else ''}{len(rab_files)} RAB actions in {len(chunks)} job(s)...")
 
-            if CLI:
-                progress_bar(i+1, total)
+        # the first job saves the mesh .blend, the others only their actions
+        progress = Progress(len(rab_files) + (1 if save_mesh else 0))
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [executor.submit(run_session_249, output, rmb_file, chunk, i == 0 and save_mesh, texture_cache, progress) for i, chunk in enumerate(chunks)]
+            sessions = [future.result() for future in futures]
 
         # break line after progress bar in CLI
         if CLI:
             print()
 
+        if results is not None:
+            results.add_sessions(sessions)
+        if not check_sessions_249(chunks, sessions, save_mesh):
+            return False
+
     return True
 
-def export_blend_to_fbx(blend_file, output, rmb_file):
-    command = f'{blender_36_path} -b {blend_file} --python ./bpy36_export.py -- --out {output} --rmb {rmb_file}'
-    process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    if process.returncode != 0:
-        logger.error(f"\nError while executing Blender 3.6. Code: {process.returncode}, Error: {process.stderr}\n")
-        print(f"\nError while executing Blender 3.6. Code: {process.returncode}, Error: {process.stderr}\n")
-    # elif 'error' in process.stdout.lower():
-    #     logger.info(process.stdout)
-    #     print(process.stdout)
-
-def parse_txt_file(input_file, mesh_only, anim_types) -> tuple[str, list[str]]:
+# prefix of the reply lines of `bpy36_export.py --server`
+EXPORT_SERVER_REPLY = 'EXPORT_RESULT '
+
+class ExportWorker():
+    """Long lived export server process (`bpy36_export.py --server`) running one job at a time"""
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.next_id = 0
+        # last Blender output lines, logged if the worker dies
+        self.tail = deque(maxlen=SUPERVISOR_TAIL_LINES)
+
+    def start(self):
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace', bufsize=1)
+
+    def run(self, job):
+        """Send a job, returns the reply dict (status 'error' if the worker died).
+
+        The error and saved events of the job are collected like SupervisedProcess does,
+        a job that reported an error or saved no FBX file fails even if the reply is 'ok'."""
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+
+        self.next_id += 1
+        job = dict(job, id=self.next_id)
+        errors = []
+        saved = []
+        try:
+            self.process.stdin.write(json.dumps(job) + '\n')
+            self.process.stdin.flush()
+            for line in self.process.stdout:
+                if not line.startswith(EXPORT_SERVER_REPLY):
+                    event = progress_events.parse(line)
+                    if event is None:
+                        self.tail.append(line)
+                        continue
+                    if event['event'] == progress_events.EVENT_ERROR:
+                        errors.append(event.get('message'))
+                    elif event['event'] == progress_events.EVENT_SAVED:
+                        saved.append(event.get('file'))
+                    log_event("Blender 3.6 export server", event)
+                    continue
+                reply = json.loads(line[len(EXPORT_SERVER_REPLY):])
+                if reply.get('id') != job['id']:
+                    continue
+                if reply.get('status') == 'ok' and (errors or not saved):
+                    reply['status'] = 'error'
+                    reply['error'] = '; '.join(errors) if errors else "No FBX file was saved"
+                return reply
+        except (OSError, ValueError) as e:
+            logger.error(f"Export worker failed: {e}")
+
+        # the worker is gone (crash or EOF), the next job starts a new one
+        returncode = self.close()
+        logger.error(f"Export worker exited with code {returncode}, Output: {''.join(self.tail)}")
+        return {'id': job['id'], 'status': 'error', 'error': f"Export worker exited with code {returncode}", 'timings': {}}
+
+    def close(self, timeout=30):
+        if self.process is None:
+            return None
+
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            return process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return process.wait()
+
+class ExportWorkerPool():
+    """Up to `size` ExportWorker processes, started on demand and reused for every export"""
+    def __init__(self, command, size):
+        self.command = command
+        self.slots = threading.BoundedSemaphore(max(1, size))
+        self.lock = threading.Lock()
+        self.idle = []
+        self.workers = []
+
+    def run(self, job):
+        with self.slots:
+            with self.lock:
+                if self.idle:
+                    worker = self.idle.pop()
+                else:
+                    worker = ExportWorker(self.command)
+                    self.workers.append(worker)
+            try:
+                return worker.run(job)
+            finally:
+                with self.lock:
+                    self.idle.append(worker)
+
+    def export(self, blend_file, output, rmb_file, texture_cache=None):
+        """Same contract as export_blend_to_fbx: returns 0 on success"""
+        sidecar = timing_report.sidecar('blender36') if timing_report else None
+        start = time.time()
+        reply = self.run({'blend': blend_file, 'out': output, 'rmb': rmb_file, 'texture_cache': texture_cache, 'model_cache': model_cache_dir(texture_cache), 'timings': sidecar,
+                          'profile': script_profiles.dir if script_profiles else None})
+        if timing_report:
+            # the server is already running, there is no startup per job
+            timing_report.collect(model_name(rmb_file), 'blender36', sidecar, blend_file, time.time() - start)
+        if reply.get('status') != 'ok':
+            logger.error(f"\nError while exporting {blend_file}: {reply.get('error')}\n")
+            print(f"\nError while exporting {blend_file}: {reply.get('error')}\n")
+            return 1
+
+        logger.info(f"Exported {blend_file}: " + ', '.join([f"{stage} {seconds:.2f}s" for stage, seconds in reply.get('timings', {}).items()]))
+        return 0
+
+    def close(self):
+        with self.lock:
+            workers, self.workers, self.idle = self.workers, [], []
+        for worker in workers:
+            worker.close()
+
+# set by use_export_server(), export_blend_to_fbx() then reuses Blender 3.6 processes
+export_pool = None
+
+def use_export_server(size, command=None):
+    global export_pool
+    if export_pool is not None:
+        export_pool.close()
+
+    export_pool = ExportWorkerPool(command or [blender_36_path, '-b', '--python', './bpy36_export.py', '--', '--server'], size)
+    atexit.register(export_pool.close)
+    return export_pool
+
+def export_blend_to_fbx(blend_file, output, rmb_file, texture_cache=None):
+    if export_pool is not None:
+        return export_pool.export(blend_file, output, rmb_file, texture_cache)
+
+    sidecar = timing_report.sidecar('blender36') if timing_report else None
+    command = export_36_command(blend_file, output, rmb_file, texture_cache, sidecar)
+    process = SupervisedProcess(command, f"Blender 3.6 {os.path.basename(blend_file)}")
+    returncode = process.run()
+    if timing_report:
+        timing_report.collect(model_name(rmb_file), 'blender36', sidecar, blend_file, process.wall, process.launched)
+    # Blender exits with 0 after a script error, the export is failed if no FBX file was reported
+    if returncode == 0 and (process.errors or not process.saved):
+        returncode = 1
+    if returncode != 0:
+        logger.error(f"\nError while executing Blender 3.6 for {blend_file}. Code: {process.returncode}, Output: {process.output()}\n")
+        print(f"\nError while executing Blender 3.6 for {blend_file}. Code: {process.returncode}\n")
+
+    return returncode
+
+def export_blends_to_fbx(blend_files, output, rmb_file, texture_cache=None, jobs=None):
+    """Export .blend files on up to `jobs` concurrent Blender 3.6 processes, returns [(blend_file, returncode)]"""
+    if not blend_files:
+        return []
+
+    progress = Progress(len(blend_files))
+
+    def export(blend_file):
+        returncode = export_blend_to_fbx(blend_file, output, rmb_file, texture_cache)
+        progress.advance()
+        return returncode
+
+    workers = max(1, min(jobs or default_jobs(), len(blend_files)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        returncodes = list(executor.map(export, blend_files))
+
+    # break line after progress bar in CLI
+    if CLI:
+        print()
+
+    return list(zip(blend_files, returncodes))
+
+def print_export_summary(results):
+    failed = [(blend_file, returncode) for blend_file, returncode in results if returncode != 0]
+    logger.info(f"FBX export: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    print(f"FBX export: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    for blend_file, returncode in failed:
+        logger.error(f"\tCode {returncode}: {blend_file}")
+        print(f"\tCode {returncode}: {blend_file}")
+
+    return len(failed)
+
+class ModelJob():
+    """Blender 2.49 sessions (one per chunk of actions) and Blender 3.6 exports of one model"""
+    def __init__(self, name, rmb_file, rab_files, chunks, fbx_output, save_mesh=True, exports=None):
+        self.name = name
+        self.rmb_file = rmb_file
+        self.rab_files = rab_files
+        self.chunks = chunks
+        self.fbx_output = fbx_output
+        self.save_mesh = save_mesh
+        # .blend files that only need the export
+        self.exports = exports or []
+        self.session_results = [(-1, [], [], '')] * len(chunks)
+        self.export_futures = []
+        self.export_results = []
+        self.imported = False
+        self.cached = 0
+
+def interleave(lists):
+    """[[a1, a2], [b1]] -> [a1, b1, a2]"""
+    result = []
+    for i in range(max([len(items) for items in lists] or [0])):
+        for items in lists:
+            if i < len(items):
+                result.append(items[i])
+    return result
+
+def schedule_models(models, output, texture_cache=None, jobs=None, export_jobs=None):
+    """Run the Blender 2.49 sessions of all `models` on one pool and export every saved .blend right away.
+
+    Sessions are queued round robin over the models and run on up to `jobs` workers, Blender 3.6
+    exports on up to `export_jobs` workers. A session waits (stops reading its output) while
+    2 * `export_jobs` exports are queued, so imports never run far ahead of exports."""
+    jobs = max(1, jobs or default_jobs())
+    export_jobs = max(1, export_jobs or jobs)
+
+    # every .blend is counted once when saved and once when exported
+    progress = Progress(sum([2 * (len(model.rab_files) + (1 if model.save_mesh else 0)) + len(model.exports) for model in models]))
+    slots = threading.BoundedSemaphore(2 * export_jobs)
+    export_lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=export_jobs) as export_executor:
+        def export(model, blend_file, gated=True):
+            try:
+                return export_blend_to_fbx(blend_file, model.fbx_output, model.rmb_file, texture_cache)
+            finally:
+                if gated:
+                    slots.release()
+                progress.advance()
+
+        def run_session(model, i):
+            def on_saved(blend_file):
+                slots.acquire()
+                with export_lock:
+                    model.export_futures.append((blend_file, export_executor.submit(export, model, blend_file)))
+
+            try:
+                model.session_results[i] = run_session_249(output, model.rmb_file, model.chunks[i], i == 0 and model.save_mesh, texture_cache, progress, on_saved)
+            except Exception as e:
+                model.session_results[i] = (-1, [], [str(e)], str(e))
+
+        # .blend files that are already imported go straight to the export pool
+        for model in models:
+            for blend_file in model.exports:
+                model.export_futures.append((blend_file, export_executor.submit(export, model, blend_file, False)))
+
+        tasks = interleave([[(model, i) for i in range(len(model.chunks))] for model in models])
+        with ThreadPoolExecutor(max_workers=jobs) as import_executor:
+            for future in [import_executor.submit(run_session, model, i) for model, i in tasks]:
+                future.result()
+
+        for model in models:
+            model.export_results = [(blend_file, future.result()) for blend_file, future in model.export_futures]
+
+    # break line after progress bar in CLI
+    if CLI:
+        print()
+
+    for model in models:
+        model.imported = check_sessions_249(model.chunks, model.session_results, model.save_mesh)
+
+def model_chunks(rab_files, save_mesh, jobs):
+    # no session at all if neither the mesh nor any action has to be imported
+    return split_jobs(rab_files, jobs) if rab_files or save_mesh else []
+
+def pipeline_model(output, rmb_file, rab_files, mesh_only, texture_cache=None, jobs=None, export_jobs=None, save_mesh=True, exports=None, results=None):
+    """Import separate actions and export every saved .blend right away, the outputs written
+    without an error are added to `results` (UnitResults)"""
+    if mesh_only:
+        rab_files = []
+
+    rmb_filename = os.path.basename(rmb_file).replace('.rmb', '')
+    chunks = model_chunks(rab_files, save_mesh, jobs)
+    model = ModelJob(rmb_filename, rmb_file, rab_files, chunks, os.path.join(output, rmb_filename), save_mesh, exports)
+
+    logger.info(f"Pipelining {'RMB mesh and ' if save_mesh else ''}{len(rab_files)} RAB actions: {len(chunks)} import job(s)...")
+    print(f"Pipelining {'RMB mesh and ' if save_mesh else ''}{len(rab_files)} RAB actions: {len(chunks)} import job(s)...")
+    schedule_models([model], output, texture_cache, max(1, len(chunks)), export_jobs or jobs)
+    if results is not None:
+        results.add_model(model)
+
+    failed = print_export_summary(model.export_results)
+    if not model.imported:
+        return "Error: Failed to import model to Blender 2.49."
+    if failed:
+        return f"Error: {failed} of {len(model.export_results)} FBX exports failed."
+
+    return True
+
+def parse_txt_file(input_file, mesh_only, anim_types, verbose=True) -> tuple[str, list[str]]:
     with open(input_file, 'r') as file:
         content = file.read()
 
@@ -327,7 +1012,8 @@ def parse_txt_file(input_file, mesh_only, anim_types) -> tuple[str, list[str]]:
 
         mesh_file = root.find('.//Mesh/FileName').text
         logger.info(f"Mesh FileName (.rmb): {mesh_file}")
-        print(f"Mesh FileName (.rmb): {mesh_file}")
+        if verbose:
+            print(f"Mesh FileName (.rmb): {mesh_file}")
 
         if mesh_only:
             return mesh_file, []
@@ -353,22 +1039,175 @@ def parse_txt_file(input_file, mesh_only, anim_types) -> tuple[str, list[str]]:
         rab_files = sorted(rab_files)
 
         logger.info(f"Found {len(rab_files)} (.rab) files:")
-        print(f"Found {len(rab_files)} (.rab) files:")
+        if verbose:
+            print(f"Found {len(rab_files)} (.rab) files:")
         for rab_file in rab_files:
             logger.info(f'\t{rab_file}')
-            print(f'\t{rab_file}')
+            if verbose:
+                print(f'\t{rab_file}')
 
         return mesh_file, rab_files
 
-def parse_rmb_file(input_file, mesh_only, anim_types) -> tuple[str, list[str]]:
+def parse_rmb_file(input_file, mesh_only, anim_types, verbose=True) -> tuple[str, list[str]]:
     config_filename = os.path.basename(input_file).replace('.rmb', '.txt')
     config_file = os.path.join(os.path.dirname(input_file), config_filename)
     if not os.path.exists(config_file):
-        return input_file, []
+        # relative to the folder of the input file, like the names in a .txt config
+        return os.path.basename(input_file), []
     
-    return parse_txt_file(config_file, mesh_only, anim_types)
+    return parse_txt_file(config_file, mesh_only, anim_types, verbose)
+
+def conversion_units(output, rmb_file, rab_files, all_in_one, mesh_only, anim_types, textures=None):
+    """ConversionUnit per output .blend of a model: the mesh, then the _all file (if there are
+    actions) or one per action, the files bpy249_import.py saves"""
+    rmb_filename = os.path.basename(rmb_file).replace('.rmb', '')
+    model_dir = os.path.join(output, rmb_filename)
+    options = {'all_in_one': bool(all_in_one), 'mesh_only': bool(mesh_only), 'anim_types': sorted(anim_types or [])}
+
+    if textures is None:
+        try:
+            textures = rmb_texture_files(rmb_file)
+        except Exception as e:
+            logger.warning(f"Textures of {rmb_file} are not part of the cache key: {e}")
+            textures = []
+    inputs = [rmb_file] + textures + script_files()
+
+    def unit(name, unit_inputs, rab_file=None):
+        return ConversionUnit(f"{rmb_filename}/{name}", unit_inputs, os.path.join(model_dir, f"{name}.blend"), os.path.join(model_dir, f"{name}.fbx"), options, rab_file)
+
+    units = [unit(rmb_filename, inputs)]
+    if mesh_only:
+        return units
 
-def process(input_file, output_dir, all_in_one, rmb2blend, blend2fbx, mesh_only, anim_types, download_blender):
+    if all_in_one:
+        if rab_files:
+            units.append(unit(f"{rmb_filename}_all", inputs + rab_files))
+    else:
+        for rab_file in rab_files:
+            units.append(unit(os.path.basename(rab_file).replace('.rab', ''), inputs + [rab_file], rab_file))
+
+    return units
+
+def stale_units(cache, units, rmb2blend, blend2fbx):
+    """(units to import, units to export) whose outputs are not up to date in the cache"""
+    to_import = [unit for unit in units if rmb2blend and not cache.is_fresh(unit, 'blend')]
+    to_export = [unit for unit in units if blend2fbx and (unit in to_import or not cache.is_fresh(unit, 'fbx'))]
+    cache.count(units, to_import + to_export)
+    return to_import, to_export
+
+def output_key(filepath):
+    # the scripts report the paths they built, the units hold the converter's
+    return os.path.normcase(os.path.abspath(filepath))
+
+class UnitResults():
+    """.blend files imported and exported without an error in this run.
+
+    A Blender process that failed or reported an error event counts for none of its
+    files, a file written by it may be incomplete."""
+    def __init__(self):
+        self.imported = set()
+        self.exported = set()
+
+    def add_sessions(self, sessions):
+        """Blender 2.49 results (returncode, saved .blend files, error messages, output)"""
+        for returncode, saved, errors, output in sessions:
+            if returncode == 0 and not errors:
+                self.imported.update([output_key(blend_file) for blend_file in saved])
+
+    def add_exports(self, exports):
+        """[(blend_file, returncode)] of the Blender 3.6 exports"""
+        self.exported.update([output_key(blend_file) for blend_file, returncode in exports if returncode == 0])
+
+    def add_model(self, model):
+        self.add_sessions(model.session_results)
+        self.add_exports(model.export_results)
+
+def record_units(cache, to_import, to_export, results):
+    """Store the outputs of the units that were imported/exported without an error in the cache manifest"""
+    for unit in to_import + [unit for unit in to_export if unit not in to_import]:
+        key = output_key(unit.blend_file)
+        cache.record(unit, blend=unit in to_import and key in results.imported, fbx=unit in to_export and key in results.exported)
+    cache.save()
+
+def convert_model(output, rmb_file, rab_files, units, to_import, to_export, all_in_one, mesh_only, texture_cache=None, jobs=None, export_jobs=None, pipeline=False, results=None):
+    """Import and export the stale conversion units of one model, returns an error message or None.
+
+    The outputs written without an error are added to `results` (UnitResults)."""
+    if not to_import and not to_export:
+        logger.info("All outputs are up to date.")
+        print("All outputs are up to date.")
+        return None
+
+    rmb_filename = os.path.basename(rmb_file).replace('.rmb', '')
+    mesh_unit = units[0]
+    stale_rab_files = [unit.rab_file for unit in to_import if unit.rab_file]
+    exports = [unit.blend_file for unit in to_export if unit not in to_import]
+    warm_model_cache(rmb_file, stale_rab_files)
+
+    # Export every action as soon as its .blend file is saved
+    if pipeline and to_import and to_export and not all_in_one:
+        result = pipeline_model(output, rmb_file, stale_rab_files, False, texture_cache, jobs, export_jobs, mesh_unit in to_import, exports, results)
+        return None if result is True else result
+
+    # Import model and save in .blend file
+    if to_import:
+        if all_in_one:
+            result = import_model(output, rmb_file, rab_files, all_in_one, mesh_only, texture_cache, jobs, results=results)
+        else:
+            result = import_model(output, rmb_file, stale_rab_files, all_in_one, mesh_only, texture_cache, jobs, mesh_unit in to_import, results)
+        if not result:
+            return "Error: Failed to import model to Blender 2.49."
+
+    # Export mesh and actions to FBX
+    if to_export:
+        # check if the .blend file exists
+        if mesh_unit in to_export and not os.path.exists(mesh_unit.blend_file):
+            return f"Error: Blend file {mesh_unit.blend_file} does not exist."
+
+        blend_files = [unit.blend_file for unit in to_export]
+        logger.info(f"Exporting {len(blend_files)} .blend file(s) of {rmb_filename} to FBX...")
+        print(f"Exporting {len(blend_files)} .blend file(s) of {rmb_filename} to FBX...")
+        exported = export_blends_to_fbx(blend_files, os.path.join(output, rmb_filename), rmb_file, texture_cache, export_jobs or jobs)
+        if results is not None:
+            results.add_exports(exported)
+
+        failed = print_export_summary(exported)
+        if failed:
+            return f"Error: {failed} of {len(exported)} FBX exports failed."
+
+    return None
+
+# output format -> writer of the native backend
+NATIVE_EXPORTERS = {
+    'fbx': export_native_fbx,
+    'glb': export_native_glb,
+}
+
+def convert_native(output, rmb_file, rab_files, all_in_one, mesh_only, output_format='fbx'):
+    """Write the FBX/GLB files of one model without Blender, returns an error message or None"""
+    start = time.perf_counter()
+    try:
+        with timed(rmb_file, f'native_{output_format}', rmb_file):
+            written = NATIVE_EXPORTERS[output_format](rmb_file, rab_files, output, all_in_one, mesh_only)
+    except Exception as e:
+        logger.exception(f"Native {output_format.upper()} export of {rmb_file} failed")
+        return f"Error: Native {output_format.upper()} export of {rmb_file} failed: {e}"
+
+    logger.info(f"Wrote {len(written)} {output_format.upper()} file(s) in {time.perf_counter() - start:.3f}s")
+    print(f"Wrote {len(written)} {output_format.upper()} file(s) in {time.perf_counter() - start:.3f}s")
+    return None
+
+def resolve_model_files(input_file, mesh_only, anim_types, verbose=True):
+    """.txt config or .rmb mesh -> (absolute rmb path, [absolute rab paths])"""
+    ext = os.path.splitext(input_file)[1]
+    rmb_file, rab_files = parse_txt_file(input_file, mesh_only, anim_types, verbose) if ext == '.txt' else parse_rmb_file(input_file, mesh_only, anim_types, verbose)
+    # the Blender scripts get the same paths, whatever their working directory is
+    dirname = os.path.dirname(os.path.abspath(input_file))
+    rmb_file = os.path.join(dirname, rmb_file)
+    rab_files = [os.path.join(dirname, rab_file) for rab_file in rab_files]
+    return rmb_file, rab_files
+
+def process(input_file, output_dir, all_in_one, rmb2blend, blend2fbx, mesh_only, anim_types, download_blender, jobs=None, export_jobs=None, pipeline=False, force=False, backend='blender', output_format='fbx'):
     # download Blender 2.49 and 3.6
     if download_blender:
         if not CLI:
@@ -381,10 +1220,10 @@ def process(input_file, output_dir, all_in_one, rmb2blend, blend2fbx, mesh_only,
         ask_to_download_blender36()
         return
 
-    if not os.path.exists(blender_249_path):
+    if backend == 'blender' and not os.path.exists(blender_249_path):
         return f"Error: Blender 2.49 path does not exist.\nPath: {blender_249_path}"
 
-    if not os.path.exists(blender_36_path):
+    if backend == 'blender' and not os.path.exists(blender_36_path):
         return f"Error: Blender 3.6 path does not exist.\nPath: {blender_36_path}"
 
     # check if the input file exists
@@ -395,6 +1234,10 @@ def process(input_file, output_dir, all_in_one, rmb2blend, blend2fbx, mesh_only,
     if not rmb2blend and blend2fbx and anim_types:
         return "Error: --anim-types can only be used with --rmb2blend"
     
+    # the native backend has no .blend stage
+    if backend == 'native' and rmb2blend != blend2fbx:
+        return "Error: --backend native writes the FBX files directly, --rmb2blend and --blend2fbx can not be used alone"
+
     # if --rmb2blend and --blend2fbx are not set, set both
     if not rmb2blend and not blend2fbx:
         rmb2blend = True
@@ -411,55 +1254,440 @@ def process(input_file, output_dir, all_in_one, rmb2blend, blend2fbx, mesh_only,
     os.makedirs(output_dir, exist_ok=True)
 
     # Parse the input file
-    rmb_file, rab_files = parse_txt_file(input_file, mesh_only, anim_types) if ext == '.txt' else parse_rmb_file(input_file, mesh_only, anim_types)
-    rmb_file = os.path.join(os.path.dirname(input_file), rmb_file)
-    rab_files = [os.path.join(os.path.dirname(input_file), rab_file) for rab_file in rab_files]
+    rmb_file, rab_files = resolve_model_files(input_file, mesh_only, anim_types)
 
-    # Import model and save in .blend file
-    if rmb2blend:
-        result = import_model(output, rmb_file, rab_files, all_in_one, mesh_only)
-        if not result:
-            return "Error: Failed to import model to Blender 2.49."
+    # pre-parsed .rmb/.rab files, shared by the native writers and the Blender scripts
+    model_cache.set_cache_dir(os.path.join(output, MODEL_CACHE_DIR))
+    # wall/CPU time per stage, written to timing_report.json at the end
+    report = use_timing_report(output)
 
-    # Export mesh to FBX
-    if blend2fbx:
-        rmb_filename = os.path.basename(rmb_file).replace('.rmb', '')
-        logger.info(f"Exporting Mesh {rmb_filename} to FBX...")
-        print(f"Exporting Mesh {rmb_filename} to FBX...")
+    if backend == 'native':
+        error = convert_native(output, rmb_file, rab_files, all_in_one, mesh_only, output_format)
+        report.finish(output)
+        return error if error else output_dir
 
-        # check if the .blend file exists
-        blend_file = os.path.join(output, rmb_filename, f"{rmb_filename}.blend")
-        if not os.path.exists(blend_file):
-            return f"Error: Blend file {blend_file} does not exist."
-    
-        export_blend_to_fbx(blend_file, os.path.join(output, rmb_filename), rmb_file)
+    # texture directory listings shared by every Blender process of this run
+    texture_cache = os.path.join(output, 'texture_index.json')
 
-        # return the output directory if mesh_only is set
-        if mesh_only:
-            return output_dir
+    # outputs whose inputs (files, Blender scripts and options) did not change since the last run are skipped
+    cache = ConversionCache(os.path.join(output, CACHE_MANIFEST), force)
+    units = conversion_units(output, rmb_file, rab_files, all_in_one, mesh_only, anim_types)
+    to_import, to_export = stale_units(cache, units, rmb2blend, blend2fbx)
 
-        # Export all in one actions to FBX
-        if all_in_one:
-            logger.info(f"Exporting all actions to one FBX")
-            print(f"Exporting all actions to one FBX")
-            actions_blend_file = os.path.splitext(blend_file)[0] + '_all' + os.path.splitext(blend_file)[1]
-            export_blend_to_fbx(actions_blend_file, os.path.join(output, rmb_filename), rmb_file)
-            return output_dir
-
-        # Export actions to FBX
-        total = len(rab_files)
-        logger.info(f"Exporting {total} actions to FBX...")
-        print(f"Exporting {total} actions to FBX...")
-        for i, rab_file in enumerate(rab_files):
-            blend_file = os.path.join(output, rmb_filename, f"{os.path.basename(rab_file).replace('.rab', '')}.blend")
-            export_blend_to_fbx(blend_file, os.path.join(output, rmb_filename), rmb_file)
-            
-            if CLI:
-                progress_bar(i+1, total)
+    results = UnitResults()
+    try:
+        error = convert_model(output, rmb_file, rab_files, units, to_import, to_export, all_in_one, mesh_only, texture_cache, jobs, export_jobs, pipeline, results)
+    finally:
+        record_units(cache, to_import, to_export, results)
+        logger.info(cache.report())
+        print(cache.report())
+        report.finish(output)
+        if script_profiles:
+            script_profiles.finish()
+
+    if error:
+        return error
 
     # return the output directory
     return output_dir
 
+def find_files(paths, extensions):
+    """Expand files and directories (recursively) into a sorted list of files with the given extensions"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename)[1].lower() in extensions:
+                        found.append(os.path.join(dirpath, filename))
+        else:
+            found.append(path)
+
+    return found
+
+def inspect(paths):
+    """Print header stats of .rmb/.rab files as JSON lines without a Blender import"""
+    failed = 0
+    for filepath in find_files(paths, ('.rmb', '.rab')):
+        try:
+            stats = inspect_file(filepath)
+        except Exception as e:
+            failed += 1
+            stats = {'file': filepath, 'error': str(e)}
+
+        print(json.dumps(stats))
+
+    return failed
+
+def inspect_main(argv):
+    parser = argparse.ArgumentParser(prog='converter_cli.exe inspect', description="Print header stats of .rmb/.rab files (one JSON object per line)")
+    parser.add_argument('paths', type=str, nargs='+', help='.rmb/.rab files or directories to scan recursively')
+    args = parser.parse_args(argv)
+
+    failed = inspect(args.paths)
+    sys.exit(1 if failed else 0)
+
+def discover_models(paths):
+    """Expand files, directories and glob patterns into model .txt/.rmb files.
+
+    A .rmb with a .txt config next to it is converted through the .txt only."""
+    files = []
+    for path in paths:
+        matches = sorted(glob.glob(path)) if any(c in path for c in '*?[') else [path]
+        files += find_files(matches, ('.txt', '.rmb'))
+
+    configs = set([os.path.splitext(f)[0].lower() for f in files if f.lower().endswith('.txt')])
+    models = []
+    seen = set()
+    for filepath in files:
+        filepath = os.path.abspath(filepath)
+        if filepath in seen:
+            continue
+        seen.add(filepath)
+
+        if filepath.lower().endswith('.rmb') and os.path.splitext(filepath)[0].lower() in configs:
+            continue
+        models.append(filepath)
+
+    return models
+
+def print_batch_report(models, errors):
+    failed = len(errors)
+    lines = []
+    for model in models:
+        saved = sum([len(result[1]) for result in model.session_results])
+        expected = len(model.rab_files) + (1 if model.save_mesh else 0)
+        exported = len([1 for blend_file, returncode in model.export_results if returncode == 0])
+        ok = model.imported and exported == len(model.export_results)
+        failed += 0 if ok else 1
+        lines.append(f"  {'OK' if ok else 'FAILED':<7} {model.name}: {saved}/{expected} .blend, {exported}/{len(model.export_results)} FBX, {model.cached} up to date")
+    for input_file, error in errors:
+        lines.append(f"  {'FAILED':<7} {input_file}: {error}")
+
+    total = len(models) + len(errors)
+    logger.info(f"Batch report: {total - failed} of {total} models converted")
+    print(f"Batch report: {total - failed} of {total} models converted")
+    for line in lines:
+        logger.info(line)
+        print(line)
+
+    return failed
+
+def batch_native(inputs, output, mesh_only, anim_types, jobs, output_format='fbx'):
+    """Write the FBX/GLB files of every model without Blender, returns the number of failed models"""
+    def convert(input_file):
+        rmb_file, rab_files = resolve_model_files(input_file, mesh_only, anim_types)
+        if not os.path.exists(rmb_file):
+            raise FileNotFoundError(f"Mesh file {rmb_file} does not exist")
+        with timed(rmb_file, f'native_{output_format}', rmb_file):
+            return NATIVE_EXPORTERS[output_format](rmb_file, rab_files, output, False, mesh_only)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [(input_file, executor.submit(convert, input_file)) for input_file in inputs]
+
+    failed = 0
+    lines = []
+    for input_file, future in futures:
+        try:
+            lines.append(f"  {'OK':<7} {os.path.basename(input_file)}: {len(future.result())} {output_format.upper()}")
+        except Exception as e:
+            failed += 1
+            lines.append(f"  {'FAILED':<7} {input_file}: {e}")
+
+    logger.info(f"Batch report: {len(inputs) - failed} of {len(inputs)} models converted in {time.perf_counter() - start:.3f}s")
+    print(f"Batch report: {len(inputs) - failed} of {len(inputs)} models converted in {time.perf_counter() - start:.3f}s")
+    for line in lines:
+        logger.info(line)
+        print(line)
+
+    return failed
+
+def batch(paths, output, mesh_only, anim_types, jobs=None, export_jobs=None, force=False, backend='blender', output_format='fbx'):
+    """Convert every model found in `paths` on one global Blender 2.49/3.6 worker budget"""
+    jobs = max(1, jobs or default_jobs())
+    inputs = discover_models(paths)
+    os.makedirs(output, exist_ok=True)
+    model_cache.set_cache_dir(os.path.join(output, MODEL_CACHE_DIR))
+    report = use_timing_report(output)
+    if backend == 'native':
+        failed = batch_native(inputs, output, mesh_only, anim_types, jobs, output_format)
+        report.finish(output)
+        return failed
+
+    cache = ConversionCache(os.path.join(output, CACHE_MANIFEST), force)
+
+    models = []
+    stale = []
+    errors = []
+    for input_file in inputs:
+        try:
+            rmb_file, rab_files = resolve_model_files(input_file, mesh_only, anim_types)
+        except Exception as e:
+            errors.append((input_file, f"Failed to parse: {e}"))
+            continue
+
+        if not os.path.exists(rmb_file):
+            errors.append((input_file, f"Mesh file {rmb_file} does not exist"))
+            continue
+
+        os.makedirs(os.path.join(output, os.path.splitext(os.path.basename(input_file))[0]), exist_ok=True)
+        rmb_filename = os.path.basename(rmb_file).replace('.rmb', '')
+
+        units = conversion_units(output, rmb_file, rab_files, False, mesh_only, anim_types)
+        to_import, to_export = stale_units(cache, units, True, True)
+        stale.append((to_import, to_export))
+
+        model = ModelJob(os.path.basename(input_file), rmb_file, [unit.rab_file for unit in to_import if unit.rab_file], [], os.path.join(output, rmb_filename),
+                         units[0] in to_import, [unit.blend_file for unit in to_export if unit not in to_import])
+        model.cached = len([unit for unit in units if unit not in to_import and unit not in to_export])
+        models.append(model)
+        if to_import:
+            warm_model_cache(rmb_file, model.rab_files)
+
+    # with many models every model gets one session, with few the actions are spread over the workers
+    model_jobs = max(1, jobs // max(1, len([model for model in models if model.rab_files or model.save_mesh])))
+    for model in models:
+        model.chunks = model_chunks(model.rab_files, model.save_mesh, model_jobs)
+        model.session_results = [(-1, [], [], '')] * len(model.chunks)
+
+    logger.info(f"Converting {len(models)} models ({sum([len(m.rab_files) for m in models])} actions to import) with {jobs} import and {export_jobs or jobs} export job(s)...")
+    print(f"Converting {len(models)} models ({sum([len(m.rab_files) for m in models])} actions to import) with {jobs} import and {export_jobs or jobs} export job(s)...")
+
+    results = UnitResults()
+    try:
+        schedule_models(models, output, os.path.join(output, 'texture_index.json'), jobs, export_jobs)
+    finally:
+        for model in models:
+            results.add_model(model)
+        for to_import, to_export in stale:
+            record_units(cache, to_import, to_export, results)
+        logger.info(cache.report())
+        print(cache.report())
+        report.finish(output)
+        if script_profiles:
+            script_profiles.finish()
+
+    return print_batch_report(models, errors)
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(prog='converter_cli.exe batch', description="Convert every model .txt/.rmb found in directories or glob patterns")
+    parser.add_argument('paths', type=str, nargs='+', help='Model .txt/.rmb files, directories (scanned recursively) or glob patterns')
+    parser.add_argument('-o', '--output', type=str, required=True, help='Path to the folder where the output files will be saved')
+    parser.add_argument('--mesh-only', action='store_true', default=False, help='Import only the .rmb meshes')
+    parser.add_argument('--anim-types', type=str, nargs='+', default=['all'], help='Animation type(s) to export (e.g., idle, idle1, walk)')
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(), help='Number of concurrent Blender 2.49 sessions (default: CPU count)')
+    parser.add_argument('--export-jobs', type=int, default=None, help='Number of concurrent Blender 3.6 FBX exports (default: same as --jobs)')
+    parser.add_argument('--export-server', action='store_true', default=False, help='Keep Blender 3.6 running and reuse it for every FBX export')
+    parser.add_argument('--force', action='store_true', default=False, help='Rebuild every output, even if it is up to date in the conversion cache')
+    parser.add_argument('--backend', choices=['blender', 'native'], default='blender', help='Convert with Blender 2.49/3.6 or write the FBX files directly (native, no .blend files)')
+    parser.add_argument('--format', choices=['fbx', 'glb'], default='fbx', help='Output format, glb is always written by the native backend')
+    parser.add_argument('--profile', type=str, default=None, metavar='DIR', help='Profile every Blender import/export job with cProfile into DIR (one .prof per model/action) and print the merged hotspots')
+    parser.add_argument('--profile-top', type=int, default=PROFILE_TOP, help=f'Number of functions in the merged profile summary (default: {PROFILE_TOP})')
+    parser.add_argument('--plan', type=str, nargs='?', const='-', default=None, metavar='FILE', help='Print the job graph with cost estimates as JSON (to FILE or stdout) without running Blender')
+    args = parser.parse_args(argv)
+    if args.format == 'glb':
+        args.backend = 'native'
+
+    # dry run, only the model configs and the .rmb/.rab headers are read
+    if args.plan:
+        plan = plan_jobs(discover_models(args.paths), args.output, False, args.mesh_only, args.anim_types, args.jobs, args.backend, args.format)
+        write_plan(plan, args.plan)
+        sys.exit(1 if plan.errors else 0)
+
+    for path in (blender_249_path, blender_36_path):
+        if args.backend == 'blender' and not os.path.exists(path):
+            print(f"Error: Blender path does not exist.\nPath: {path}")
+            sys.exit(1)
+
+    if args.export_server and args.backend == 'blender':
+        use_export_server(args.export_jobs or args.jobs)
+
+    # the native backend runs no Blender scripts to profile
+    if args.profile and args.backend == 'blender':
+        use_script_profiles(args.profile, args.profile_top)
+
+    failed = batch(args.paths, args.output, args.mesh_only, args.anim_types, args.jobs, args.export_jobs, args.force, args.backend, args.format)
+    sys.exit(1 if failed else 0)
+
+# --plan: version of the plan JSON and rough seconds per job, a process startup plus work per vertex and key
+PLAN_VERSION = 1
+PLAN_COSTS = {
+    'blender249': {'startup': 1.5, 'vertex': 2e-5, 'key': 1e-4},
+    'blender36': {'startup': 2.0, 'vertex': 1e-5, 'key': 2e-5},
+    'converter': {'startup': 0.0, 'vertex': 5e-7, 'key': 5e-7},
+}
+
+def converter_command():
+    # converter_cli.exe is its own interpreter
+    if getattr(sys, 'frozen', False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(__file__)]
+
+class JobPlan():
+    """Job graph of a run, built from the model configs and the .rmb/.rab headers without launching Blender.
+
+    A job runs one process (blender249, blender36 or the converter for the native backend) and
+    lists its command, input and output files, the bytes of its .rmb/.rab sources, the vertex and
+    key counts and an estimated cost in seconds. `depends_on` holds the ids of the jobs writing its inputs."""
+    def __init__(self, output, backend='blender', output_format='fbx', all_in_one=False, mesh_only=False, anim_types=None, rmb2blend=True, blend2fbx=True):
+        self.output = output
+        self.backend = backend
+        self.output_format = output_format
+        self.all_in_one = all_in_one
+        self.mesh_only = mesh_only
+        self.anim_types = anim_types or []
+        self.rmb2blend = rmb2blend
+        self.blend2fbx = blend2fbx
+        self.texture_cache = os.path.join(output, 'texture_index.json')
+        self.models = []
+        self.jobs = []
+        self.errors = []
+        self.headers = {}
+        self.counts = defaultdict(int)
+
+    def header(self, filepath):
+        """(bytes, vertices, keys, texture names) of a .rmb/.rab file from its header, memoized per file"""
+        if filepath not in self.headers:
+            info = inspect_file(filepath)
+            if info['type'] == 'rmb':
+                self.headers[filepath] = (info['size'], sum([mesh['vertices_count'] for mesh in info['meshes']]), 0, info['textures'])
+            else:
+                self.headers[filepath] = (info['size'], 0, sum([bone['pos_frame_count'] + bone['rot_frame_count'] for bone in info['bones']]), [])
+        return self.headers[filepath]
+
+    def add_job(self, model, kind, process, command, sources, inputs, outputs, depends_on=()):
+        """Add a job converting the .rmb/.rab `sources`, returns its id"""
+        size = vertices = keys = 0
+        for filepath in sources:
+            file_size, file_vertices, file_keys, _ = self.header(filepath)
+            size += file_size
+            vertices += file_vertices
+            keys += file_keys
+
+        costs = PLAN_COSTS[process]
+        job_id = f"{model}/{kind}/{self.counts[model, kind]}"
+        self.counts[model, kind] += 1
+        self.jobs.append({
+            'id': job_id,
+            'model': model,
+            'kind': kind,
+            'process': process,
+            'command': command,
+            'inputs': inputs,
+            'outputs': outputs,
+            'depends_on': list(depends_on),
+            'bytes': size,
+            'vertices': vertices,
+            'keys': keys,
+            'cost': round(costs['startup'] + costs['vertex'] * vertices + costs['key'] * keys, 3),
+        })
+        return job_id
+
+    def add_model(self, input_file, jobs=None):
+        """Add the jobs of one model .txt/.rmb, the actions are split over `jobs` Blender 2.49 sessions"""
+        try:
+            rmb_file, rab_files = resolve_model_files(input_file, self.mesh_only, self.anim_types, verbose=False)
+            if not os.path.exists(rmb_file):
+                raise FileNotFoundError(f"Mesh file {rmb_file} does not exist")
+            for filepath in [rmb_file] + rab_files:
+                self.header(filepath)
+        except Exception as e:
+            self.errors.append({'input': input_file, 'error': str(e)})
+            return
+
+        model = model_name(rmb_file)
+        if self.mesh_only:
+            rab_files = []
+        textures = texture_files(self.header(rmb_file)[3], os.path.dirname(rmb_file))
+        units = conversion_units(self.output, rmb_file, rab_files, self.all_in_one, self.mesh_only, self.anim_types, textures)
+        sources = [rmb_file] + rab_files
+        self.models.append({'name': model, 'input': input_file, 'rmb': rmb_file, 'rabs': rab_files, 'textures': textures,
+                            'bytes': sum([self.header(filepath)[0] for filepath in sources])})
+
+        if self.backend == 'native':
+            ext = f'.{self.output_format}'
+            outputs = [os.path.splitext(unit.fbx_file)[0] + ext for unit in units]
+            options = (['-a'] if self.all_in_one else []) + (['--mesh-only'] if self.mesh_only else []) + (['--anim-types'] + self.anim_types if self.anim_types else [])
+            command = converter_command() + ['-i', input_file, '-o', self.output, '--backend', 'native', '--format', self.output_format] + options
+            self.add_job(model, 'native', 'converter', command, sources, sources + textures, outputs)
+            return
+
+        # .blend file -> id of the import job writing it
+        writers = {}
+        if self.rmb2blend and self.all_in_one:
+            command = import_249_command(self.output, rmb_file, rab_files, self.texture_cache)
+            job_id = self.add_job(model, 'import', 'blender249', command, sources, sources + textures, [unit.blend_file for unit in units])
+            writers.update([(unit.blend_file, job_id) for unit in units])
+        elif self.rmb2blend:
+            # the sessions of import_model: every one imports the mesh, the first one saves it
+            for i, chunk in enumerate(split_jobs(units[1:], jobs)):
+                chunk_rabs = [unit.rab_file for unit in chunk]
+                chunk_units = units[:1] + chunk if i == 0 else chunk
+                command = session_249_command(self.output, rmb_file, chunk_rabs, i == 0, self.texture_cache)
+                job_id = self.add_job(model, 'import', 'blender249', command, [rmb_file] + chunk_rabs, [rmb_file] + chunk_rabs + textures, [unit.blend_file for unit in chunk_units])
+                writers.update([(unit.blend_file, job_id) for unit in chunk_units])
+
+        if self.blend2fbx:
+            fbx_output = os.path.join(self.output, model)
+            for unit in units:
+                # the .blend of a unit holds the mesh and the actions it was imported with
+                unit_sources = [rmb_file] + [filepath for filepath in unit.inputs if filepath in rab_files]
+                command = export_36_command(unit.blend_file, fbx_output, rmb_file, self.texture_cache)
+                depends_on = [writers[unit.blend_file]] if unit.blend_file in writers else []
+                self.add_job(model, 'export', 'blender36', command, unit_sources, [unit.blend_file, rmb_file] + textures, [unit.fbx_file], depends_on)
+
+    def critical_path(self):
+        """Estimated seconds of the longest chain of dependent jobs"""
+        finish = {}
+        for job in self.jobs:
+            finish[job['id']] = job['cost'] + max([finish[dependency] for dependency in job['depends_on']] + [0.0])
+        return round(max(list(finish.values()) + [0.0]), 3)
+
+    def to_dict(self):
+        by_process = defaultdict(float)
+        for job in self.jobs:
+            by_process[job['process']] += job['cost']
+        return {
+            'version': PLAN_VERSION,
+            'output': self.output,
+            'backend': self.backend,
+            'format': self.output_format,
+            'options': {'all_in_one': self.all_in_one, 'mesh_only': self.mesh_only, 'anim_types': self.anim_types, 'rmb2blend': self.rmb2blend, 'blend2fbx': self.blend2fbx},
+            'costs': PLAN_COSTS,
+            'models': self.models,
+            'jobs': self.jobs,
+            'errors': self.errors,
+            'totals': {
+                'models': len(self.models),
+                'jobs': len(self.jobs),
+                'bytes': sum([model['bytes'] for model in self.models]),
+                'cost': round(sum(by_process.values()), 3),
+                'cost_by_process': {process: round(cost, 3) for process, cost in sorted(by_process.items())},
+                'critical_path': self.critical_path(),
+            },
+        }
+
+def plan_jobs(inputs, output, all_in_one=False, mesh_only=False, anim_types=None, jobs=None, backend='blender', output_format='fbx', rmb2blend=True, blend2fbx=True):
+    """JobPlan of converting every model in `inputs`, the Blender 2.49 workers are spread over the models like batch()"""
+    plan = JobPlan(output, backend, output_format, all_in_one, mesh_only, anim_types, rmb2blend, blend2fbx)
+    model_jobs = max(1, (jobs or default_jobs()) // max(1, len(inputs)))
+    for input_file in inputs:
+        plan.add_model(input_file, model_jobs)
+    return plan
+
+def write_plan(plan, destination):
+    """Write the plan JSON to `destination`, '-' is stdout"""
+    data = json.dumps(plan.to_dict(), indent=1)
+    if destination == '-':
+        sys.stdout.write(data + '\n')
+        sys.stdout.flush()
+    else:
+        with open(destination, 'w') as file:
+            file.write(data + '\n')
+    logger.info(f"Plan of {len(plan.models)} models and {len(plan.jobs)} jobs written to {destination}")
+
 def print_intro():
     """Print application intro and author details."""
     print("=======================================")
@@ -478,8 +1706,17 @@ def print_intro():
     print()
 
 def main():
-    # details about the tool
-    print_intro()
+    # header-only inspection prints JSON and never launches Blender
+    if len(sys.argv) > 1 and sys.argv[1] == 'inspect':
+        inspect_main(sys.argv[2:])
+
+    # convert whole directories on one worker budget
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+
+    # details about the tool, a plan on stdout is JSON only
+    if not [arg for arg in sys.argv[1:] if arg.split('=')[0] == '--plan']:
+        print_intro()
 
     parser = argparse.ArgumentParser(description="Convert RMB/RAB to FBX CLI Tool. Created by Trolll")
     parser.add_argument('-i', '--input', type=str, default='', help='Path to the model .rmb mesh file or .txt config file')
@@ -490,13 +1727,32 @@ def main():
     parser.add_argument('--mesh-only', action='store_true', default=False, help='Import only the .rmb mesh')
     parser.add_argument('--anim-types', type=str, nargs='+', help='Animation type(s) to export (e.g., idle, idle1, walk)')
     parser.add_argument('--download-blender' , action='store_true', default=False, help='Download Blender 2.49 and 3.6')
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(), help='Number of concurrent Blender 2.49 imports for separate actions (default: CPU count)')
+    parser.add_argument('--export-jobs', type=int, default=None, help='Number of concurrent Blender 3.6 FBX exports (default: same as --jobs)')
+    parser.add_argument('--pipeline', action='store_true', default=False, help='Export each action to FBX as soon as its .blend file is saved')
+    parser.add_argument('--export-server', action='store_true', default=False, help='Keep Blender 3.6 running and reuse it for every FBX export')
+    parser.add_argument('--force', action='store_true', default=False, help='Rebuild every output, even if it is up to date in the conversion cache')
+    parser.add_argument('--backend', choices=['blender', 'native'], default='blender', help='Convert with Blender 2.49/3.6 or write the FBX files directly (native, no .blend files)')
+    parser.add_argument('--format', choices=['fbx', 'glb'], default='fbx', help='Output format, glb is always written by the native backend')
+    parser.add_argument('--profile', type=str, default=None, metavar='DIR', help='Profile every Blender import/export job with cProfile into DIR (one .prof per model/action) and print the merged hotspots')
+    parser.add_argument('--profile-top', type=int, default=PROFILE_TOP, help=f'Number of functions in the merged profile summary (default: {PROFILE_TOP})')
+    parser.add_argument('--plan', type=str, nargs='?', const='-', default=None, metavar='FILE', help='Print the job graph with cost estimates as JSON (to FILE or stdout) without running Blender')
     
     args = parser.parse_args()
+    if args.format == 'glb':
+        args.backend = 'native'
     anim_types = args.anim_types if isinstance(args.anim_types, list) else [args.anim_types] if args.anim_types else []
 
+    # dry run, only the model configs and the .rmb/.rab headers are read
+    if args.plan:
+        rmb2blend, blend2fbx = (args.rmb2blend, args.blend2fbx) if args.rmb2blend or args.blend2fbx else (True, True)
+        plan = plan_jobs([args.input], args.output, args.all_in_one, args.mesh_only, anim_types, args.jobs, args.backend, args.format, rmb2blend, blend2fbx)
+        write_plan(plan, args.plan)
+        sys.exit(1 if plan.errors else 0)
+
     global blender_249_path, blender_36_path
 
-    if not os.path.exists(blender_249_path):
+    if args.backend == 'blender' and not os.path.exists(blender_249_path):
         logger.info(f"Blender 2.49 path {blender_249_path} does not exist.")
         print(f"Blender 2.49 path {blender_249_path} does not exist.")
         ask_to_download_blender249()
@@ -513,7 +1769,7 @@ def main():
         input()
         sys.exit()
 
-    if not os.path.exists(blender_36_path):
+    if args.backend == 'blender' and not os.path.exists(blender_36_path):
         logger.info(f"Blender 3.6 path {blender_36_path} does not exist.")
         print(f"Blender 3.6 path {blender_36_path} does not exist.")
         ask_to_download_blender36()
@@ -529,7 +1785,14 @@ def main():
         input()
         sys.exit()
 
-    result = process(args.input, args.output, args.all_in_one, args.rmb2blend, args.blend2fbx, args.mesh_only, anim_types, args.download_blender)
+    if args.export_server and args.backend == 'blender':
+        use_export_server(args.export_jobs or args.jobs)
+
+    # the native backend runs no Blender scripts to profile
+    if args.profile and args.backend == 'blender':
+        use_script_profiles(args.profile, args.profile_top)
+
+    result = process(args.input, args.output, args.all_in_one, args.rmb2blend, args.blend2fbx, args.mesh_only, anim_types, args.download_blender, args.jobs, args.export_jobs, args.pipeline, args.force, args.backend, args.format)
     # check if the result is a error message
     if result and result.startswith("Error:"):
         logger.error(result)
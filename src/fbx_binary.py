@@ -0,0 +1,179 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Minimal binary FBX (7.4) document writer
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from itertools import chain
+import struct
+import sys
+import zlib
+from rmb_rab_parser import flat_array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+FBX_VERSION = 7400
+FBX_HEAD_MAGIC = b'Kaydara FBX Binary  \x00\x1a\x00'
+# node records of 7.4 files: end offset, property count, property list length, name length
+FBX_NODE_HEADER = struct.Struct('<IIIB')
+FBX_NULL_RECORD = b'\x00' * FBX_NODE_HEADER.size
+
+# FileId/CreationTime/footer id have to match each other, these are the values the
+# Blender FBX exporter writes as well (files are not validated beyond that)
+FBX_FILE_ID = b'\x28\xb3\x2a\xeb\xb6\x24\xcc\xc2\xbf\xc8\xb0\x2a\xa9\x2b\xfc\xf1'
+FBX_TIME_ID = '1970-01-01 10:00:00:000'
+FBX_FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
+FBX_FOOT_MAGIC = b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b'
+
+# nodes that are closed by a null record even without children
+FBX_ALWAYS_NULL_RECORD = (b'AnimationStack', b'AnimationLayer')
+
+# array property code -> (array module typecode, numpy dtype)
+FBX_ARRAY_TYPES = {
+    'd': ('d', '<f8'),
+    'f': ('f', '<f4'),
+    'l': ('q', '<i8'),
+    'i': ('i', '<i4'),
+    'b': ('b', 'i1'),
+}
+
+# arrays with more bytes than this are zlib compressed (encoding 1)
+FBX_COMPRESS_MIN = 1 << 20
+
+
+def pack_array(code, values):
+    """Flat little endian bytes of `values` (numpy array, typed array, flat or nested sequence) -> (count, bytes)"""
+    typecode, dtype = FBX_ARRAY_TYPES[code]
+    if numpy is not None:
+        data = numpy.ascontiguousarray(values, dtype=dtype).ravel()
+        return len(data), data.tobytes()
+
+    # the typed arrays of the parser are copied in one step, not per element
+    data = flat_array(values)
+    if data is not None and data.typecode == typecode and sys.byteorder == 'little':
+        return len(data), data.tobytes()
+    if data is None and len(values) > 0 and isinstance(values[0], (tuple, list)):
+        values = chain.from_iterable(values)
+    data = array(typecode, data if data is not None else values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return len(data), data.tobytes()
+
+
+class FBXElem():
+    """Node of a binary FBX document: a name, typed properties and child nodes"""
+    def __init__(self, name):
+        self.name = name.encode('ascii') if isinstance(name, str) else name
+        self.props = []
+        self.elems = []
+
+    def add(self, name, *values):
+        """Child node with the given properties (int -> I, float -> D, str -> S, bytes -> R)"""
+        elem = FBXElem(name)
+        for value in values:
+            if isinstance(value, bool):
+                elem.add_bool(value)
+            elif isinstance(value, int):
+                elem.add_int32(value)
+            elif isinstance(value, float):
+                elem.add_float64(value)
+            elif isinstance(value, str):
+                elem.add_string(value)
+            else:
+                elem.add_bytes(value)
+        self.elems.append(elem)
+        return elem
+
+    def add_bool(self, value):
+        self.props.append(b'C' + struct.pack('<?', value))
+
+    def add_int16(self, value):
+        self.props.append(b'Y' + struct.pack('<h', value))
+
+    def add_int32(self, value):
+        self.props.append(b'I' + struct.pack('<i', value))
+
+    def add_int64(self, value):
+        self.props.append(b'L' + struct.pack('<q', value))
+
+    def add_float32(self, value):
+        self.props.append(b'F' + struct.pack('<f', value))
+
+    def add_float64(self, value):
+        self.props.append(b'D' + struct.pack('<d', value))
+
+    def add_string(self, value):
+        data = value.encode('utf-8') if isinstance(value, str) else value
+        self.props.append(b'S' + struct.pack('<I', len(data)) + data)
+
+    def add_bytes(self, value):
+        self.props.append(b'R' + struct.pack('<I', len(value)) + value)
+
+    def add_array(self, code, values):
+        count, data = pack_array(code, values)
+        self.add_raw_array(code, count, data)
+
+    def add_raw_array(self, code, count, data):
+        encoding = 0
+        if len(data) > FBX_COMPRESS_MIN:
+            data = zlib.compress(data, 1)
+            encoding = 1
+        self.props.append(code.encode('ascii') + struct.pack('<III', count, encoding, len(data)) + data)
+
+    def write(self, file):
+        """Write the node at the current position, end offsets are absolute file positions"""
+        props = b''.join(self.props)
+        start = file.tell()
+        file.write(b'\x00' * FBX_NODE_HEADER.size)
+        file.write(self.name)
+        file.write(props)
+
+        for elem in self.elems:
+            elem.write(file)
+        if self.elems or not self.props or self.name in FBX_ALWAYS_NULL_RECORD:
+            file.write(FBX_NULL_RECORD)
+
+        # patch the header now that the end offset is known
+        end = file.tell()
+        file.seek(start)
+        file.write(FBX_NODE_HEADER.pack(end, len(self.props), len(props), len(self.name)))
+        file.seek(end)
+
+
+def write_fbx(filepath, elems, version=FBX_VERSION):
+    """Write top level `elems` as a binary FBX file"""
+    with open(filepath, 'wb') as file:
+        file.write(FBX_HEAD_MAGIC)
+        file.write(struct.pack('<I', version))
+
+        for elem in elems:
+            elem.write(file)
+        file.write(FBX_NULL_RECORD)
+
+        file.write(FBX_FOOT_ID)
+        file.write(b'\x00' * 4)
+        # pad to 16 bytes, a full 16 bytes if already aligned
+        pad = ((file.tell() + 15) & ~15) - file.tell()
+        file.write(b'\x00' * (pad or 16))
+        file.write(struct.pack('<I', version))
+        file.write(b'\x00' * 120)
+        file.write(FBX_FOOT_MAGIC)
@@ -0,0 +1,400 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Write parsed RMB/RAB data straight to binary glTF 2.0 (.glb), without Blender
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from itertools import chain
+import json
+from operator import truediv
+import os
+import struct
+import sys
+from urllib.parse import quote
+from native_export import export_native, split_matrix, rotation_to_quat, mat4_mul, mat4_inverse, IDENTITY
+from rmb_rab_parser import flat_array
+from texture_index import find_texture
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN = 0x004E4942
+
+# accessor component types
+GLTF_UNSIGNED_BYTE = 5121
+GLTF_UNSIGNED_SHORT = 5123
+GLTF_FLOAT = 5126
+# buffer view targets
+GLTF_ARRAY_BUFFER = 34962
+GLTF_ELEMENT_ARRAY_BUFFER = 34963
+
+# component type -> (array module typecode, numpy dtype)
+GLTF_COMPONENTS = {
+    GLTF_UNSIGNED_BYTE: ('B', 'u1'),
+    GLTF_UNSIGNED_SHORT: ('H', '<u2'),
+    GLTF_FLOAT: ('f', '<f4'),
+}
+GLTF_WIDTHS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}
+
+# rmb/rab data is in centimeters, glTF in meters
+GLTF_UNIT_SCALE = 0.01
+
+# images used as the core `source` of a .dds texture if one lies next to it
+DDS_FALLBACK_EXTS = ('.png', '.jpg', '.jpeg')
+
+
+def stream(values, component_type, width):
+    """Little endian buffer of `values`. numpy views of the mapped file are used as they are.
+    Without numpy the typed arrays of the parser are written as they are if their type matches,
+    other values are packed into an array (flat or nested sequences)."""
+    typecode, dtype = GLTF_COMPONENTS[component_type]
+    if numpy is not None:
+        return numpy.ascontiguousarray(values, dtype=dtype).reshape(-1, width)
+
+    data = flat_array(values)
+    if data is not None and data.typecode == typecode and sys.byteorder == 'little':
+        return data
+    if data is None and len(values) > 0 and isinstance(values[0], (tuple, list)):
+        values = chain.from_iterable(values)
+    # a copy, the array of the parser is never byteswapped
+    data = array(typecode, data if data is not None else values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+def bounds(data, width):
+    """Per component (min, max) lists of a stream"""
+    if numpy is not None:
+        if len(data) == 0:
+            return [0.0] * width, [0.0] * width
+        return data.min(axis=0).tolist(), data.max(axis=0).tolist()
+
+    columns = [data[i::width] for i in range(width)]
+    if len(data) == 0:
+        return [0.0] * width, [0.0] * width
+    return [min(column) for column in columns], [max(column) for column in columns]
+
+def flat_skin_streams(weights, indices, bone_map, bone_count, component_type):
+    """JOINTS_0 and WEIGHTS_0 arrays from the flat skin arrays of the parser without a per vertex
+    Python loop. None if an influence has an unknown bone or a vertex has no weight."""
+    size = max(indices) + 1 if len(indices) > 0 else 0
+    lookup = [bone_map[i] if i < len(bone_map) else -1 for i in range(size)] if len(bone_map) > 0 else list(range(size))
+    joints = list(map(lookup.__getitem__, indices))
+    if joints and (min(joints) < 0 or max(joints) >= bone_count):
+        return None
+
+    totals = list(map(sum, zip(weights[0::4], weights[1::4], weights[2::4], weights[3::4])))
+    if totals and min(totals) <= 0:
+        return None
+
+    joints = array(GLTF_COMPONENTS[component_type][0], joints)
+    weights = array('f', map(truediv, weights, chain.from_iterable(zip(totals, totals, totals, totals))))
+    if sys.byteorder != 'little':
+        joints.byteswap()
+        weights.byteswap()
+    return joints, weights
+
+def skin_streams(mesh, bone_count, parent_bone):
+    """(JOINTS_0, WEIGHTS_0, joint component type) of a rigged mesh.
+
+    Skin indices go through the bone map, influences of unknown bones are dropped and
+    the weights are normalized. Vertices without weight are bound to the parent bone."""
+    bone_map = mesh.skin.bone_map
+    fallback = parent_bone.index if parent_bone is not None else 0
+    component_type = GLTF_UNSIGNED_BYTE if bone_count <= 256 else GLTF_UNSIGNED_SHORT
+
+    if numpy is not None:
+        weights = numpy.asarray(mesh.skin.weight_list, dtype=numpy.float64).reshape(-1, 4)
+        joints = numpy.asarray(mesh.skin.indice_list, dtype=numpy.int64).reshape(-1, 4)
+        if len(bone_map) > 0:
+            lookup = numpy.asarray(bone_map, dtype=numpy.int64)
+            valid = joints < len(lookup)
+            joints = numpy.where(valid, lookup[numpy.minimum(joints, len(lookup) - 1)], -1)
+        valid = (joints >= 0) & (joints < bone_count)
+        joints = numpy.where(valid, joints, 0)
+        weights = numpy.where(valid, weights, 0.0)
+
+        total = weights.sum(axis=1)
+        empty = total <= 0
+        weights = weights / numpy.where(empty, 1.0, total)[:, None]
+        weights[empty, 0] = 1.0
+        joints[empty, 0] = fallback
+        return stream(joints, component_type, 4), stream(weights, GLTF_FLOAT, 4), component_type
+
+    weights = flat_array(mesh.skin.weight_list)
+    indices = flat_array(mesh.skin.indice_list)
+    if weights is not None and indices is not None and len(weights) == len(indices):
+        streams = flat_skin_streams(weights, indices, bone_map, bone_count, component_type)
+        if streams is not None:
+            return streams[0], streams[1], component_type
+
+    # vertices with dropped influences or without weight
+    joint_list = []
+    weight_list = []
+    for vertex_weights, vertex_indices in zip(mesh.skin.weight_list, mesh.skin.indice_list):
+        joints = []
+        weights = []
+        for weight, index in zip(vertex_weights, vertex_indices):
+            if len(bone_map) > 0:
+                index = bone_map[index] if index < len(bone_map) else -1
+            if 0 <= index < bone_count:
+                joints.append(index)
+                weights.append(weight)
+            else:
+                joints.append(0)
+                weights.append(0.0)
+
+        total = sum(weights)
+        if total > 0:
+            weights = [weight / total for weight in weights]
+        else:
+            joints[0], weights[0] = fallback, 1.0
+        joint_list.append(joints)
+        weight_list.append(weights)
+    return stream(joint_list, component_type, 4), stream(weight_list, GLTF_FLOAT, 4), component_type
+
+def continuous_quats(quats):
+    """Flip quaternions into the hemisphere of the previous key, so linear keys take the short way"""
+    result = []
+    for q in quats:
+        if result and sum([a*b for a, b in zip(result[-1], q)]) < 0:
+            q = tuple([-v for v in q])
+        result.append(tuple(q))
+    return result
+
+
+class GLTFWriter():
+    """Builds the JSON of one .glb file and collects its binary chunk as a list of buffers"""
+    def __init__(self):
+        self.gltf = {
+            'asset': {'version': '2.0', 'generator': 'rmb_rab_converter'},
+            'scene': 0,
+            'scenes': [{'nodes': []}],
+            'nodes': [],
+            'buffers': [],
+            'bufferViews': [],
+            'accessors': [],
+        }
+        self.pieces = []
+        self.length = 0
+        self.images = {}
+
+    def add(self, key, item):
+        """Append `item` to a top level list, returns its index"""
+        items = self.gltf.setdefault(key, [])
+        items.append(item)
+        return len(items) - 1
+
+    def add_view(self, data, target=None):
+        nbytes = memoryview(data).nbytes
+        pad = -self.length % 4
+        self.pieces.append((pad, data))
+        view = {'buffer': 0, 'byteOffset': self.length + pad, 'byteLength': nbytes}
+        if target is not None:
+            view['target'] = target
+        self.length += pad + nbytes
+        return self.add('bufferViews', view)
+
+    def add_accessor(self, data, component_type, accessor_type, target=None, with_bounds=False):
+        width = GLTF_WIDTHS[accessor_type]
+        accessor = {
+            'bufferView': self.add_view(data, target),
+            'componentType': component_type,
+            'count': memoryview(data).nbytes // (width * struct.calcsize(GLTF_COMPONENTS[component_type][0])),
+            'type': accessor_type,
+        }
+        if with_bounds:
+            accessor['min'], accessor['max'] = bounds(data, width)
+        return self.add('accessors', accessor)
+
+    def add_node(self, node, parent=None):
+        index = self.add('nodes', node)
+        if parent is None:
+            self.gltf['scenes'][0]['nodes'].append(index)
+        else:
+            self.gltf['nodes'][parent].setdefault('children', []).append(index)
+        return index
+
+    def add_skeleton(self, name, bones):
+        """Root node with the unit scale and a node per bone -> (root index, {bone index: node index})"""
+        root = self.add_node({'name': name, 'scale': [GLTF_UNIT_SCALE] * 3})
+        node_ids = {}
+        for bone in bones:
+            translation, rotation, scale = split_matrix(bone.local_matrix)
+            node = {'name': bone.name, 'translation': list(translation), 'rotation': list(rotation_to_quat(rotation)), 'scale': list(scale)}
+            parent = node_ids[bone.parent.index] if bone.parent is not None else root
+            node_ids[bone.index] = self.add_node(node, parent)
+        return root, node_ids
+
+    def add_image_uri(self, filepath, output_dir):
+        try:
+            uri = os.path.relpath(filepath, output_dir)
+        except ValueError:
+            # different drive on Windows
+            uri = filepath
+        return self.add('images', {'name': os.path.basename(filepath), 'uri': quote(uri.replace(os.sep, '/'))})
+
+    def use_extension(self, name, required):
+        for key in ('extensionsUsed', 'extensionsRequired') if required else ('extensionsUsed',):
+            names = self.gltf.setdefault(key, [])
+            if name not in names:
+                names.append(name)
+
+    def add_image(self, filepath, output_dir):
+        """Texture index of an image referenced by uri, .dds images use MSFT_texture_dds.
+
+        A .png/.jpg next to the .dds is the fallback `source` for loaders without DDS support,
+        without one the extension is required, as the glTF spec asks."""
+        if filepath in self.images:
+            return self.images[filepath]
+
+        image = self.add_image_uri(filepath, output_dir)
+        if os.path.splitext(filepath)[1].lower() == '.dds':
+            texture = {'extensions': {'MSFT_texture_dds': {'source': image}}}
+            fallbacks = [find_texture(os.path.splitext(filepath)[0] + ext) for ext in DDS_FALLBACK_EXTS]
+            fallbacks = [fallback for fallback in fallbacks if fallback is not None]
+            if fallbacks:
+                texture['source'] = self.add_image_uri(fallbacks[0], output_dir)
+            self.use_extension('MSFT_texture_dds', not fallbacks)
+        else:
+            texture = {'source': image}
+
+        self.images[filepath] = self.add('textures', texture)
+        return self.images[filepath]
+
+    def add_material(self, mesh, texture, output_dir):
+        """Material named like the Blender 3.6 export, diffuse also drives the emission.
+        Specular maps have no core glTF slot and are left out."""
+        material = {'name': f'{mesh.name}_mat', 'pbrMetallicRoughness': {'metallicFactor': 0.0, 'roughnessFactor': 0.5}}
+        if texture is not None:
+            if texture.diffuse is not None and os.path.exists(texture.diffuse):
+                index = self.add_image(texture.diffuse, output_dir)
+                material['pbrMetallicRoughness']['baseColorTexture'] = {'index': index}
+                material['emissiveTexture'] = {'index': index}
+                material['emissiveFactor'] = [1.0, 1.0, 1.0]
+            if texture.normal is not None:
+                material['normalTexture'] = {'index': self.add_image(texture.normal, output_dir)}
+        return self.add('materials', material)
+
+    def add_mesh(self, mesh, material):
+        # rmb uvs have their origin in the top left corner like glTF, so they are written as they are
+        attributes = {
+            'POSITION': self.add_accessor(stream(mesh.vert_pos_list, GLTF_FLOAT, 3), GLTF_FLOAT, 'VEC3', GLTF_ARRAY_BUFFER, with_bounds=True),
+            'NORMAL': self.add_accessor(stream(mesh.vert_norm_list, GLTF_FLOAT, 3), GLTF_FLOAT, 'VEC3', GLTF_ARRAY_BUFFER),
+            'TEXCOORD_0': self.add_accessor(stream(mesh.vert_uv_list, GLTF_FLOAT, 2), GLTF_FLOAT, 'VEC2', GLTF_ARRAY_BUFFER),
+        }
+        indices = mesh.indice_list[:len(mesh.indice_list) - len(mesh.indice_list) % 3]
+        primitive = {
+            'attributes': attributes,
+            'indices': self.add_accessor(stream(indices, GLTF_UNSIGNED_SHORT, 1), GLTF_UNSIGNED_SHORT, 'SCALAR', GLTF_ELEMENT_ARRAY_BUFFER),
+            'material': material,
+        }
+        return self.add('meshes', {'name': mesh.name, 'primitives': [primitive]}), primitive
+
+    def add_skin(self, mesh, primitive, mesh_matrix, bones, node_ids, parent_bone):
+        joints, weights, component_type = skin_streams(mesh, len(bones), parent_bone)
+        primitive['attributes']['JOINTS_0'] = self.add_accessor(joints, component_type, 'VEC4', GLTF_ARRAY_BUFFER)
+        primitive['attributes']['WEIGHTS_0'] = self.add_accessor(weights, GLTF_FLOAT, 'VEC4', GLTF_ARRAY_BUFFER)
+
+        # the skinned node transform is ignored, so the mesh matrix is part of the inverse bind matrices
+        matrices = [mat4_mul(mesh_matrix, mat4_inverse(bone.matrix)) for bone in bones]
+        inverse_binds = self.add_accessor(stream(matrices, GLTF_FLOAT, 16), GLTF_FLOAT, 'MAT4')
+        return self.add('skins', {'name': mesh.name, 'joints': [node_ids[bone.index] for bone in bones], 'inverseBindMatrices': inverse_binds})
+
+    def add_sampler(self, animation, times, keys, accessor_type):
+        animation['samplers'].append({
+            'input': self.add_accessor(stream(times, GLTF_FLOAT, 1), GLTF_FLOAT, 'SCALAR', with_bounds=True),
+            'output': self.add_accessor(stream(keys, GLTF_FLOAT, GLTF_WIDTHS[accessor_type]), GLTF_FLOAT, accessor_type),
+            'interpolation': 'LINEAR',
+        })
+        return len(animation['samplers']) - 1
+
+    def add_action(self, action, node_ids):
+        animation = {'name': action.name, 'channels': [], 'samplers': []}
+        for track in action.tracks:
+            node = node_ids[track.bone.index]
+            if track.pos_times:
+                sampler = self.add_sampler(animation, track.pos_times, track.pos_keys, 'VEC3')
+                animation['channels'].append({'sampler': sampler, 'target': {'node': node, 'path': 'translation'}})
+            if track.rot_times:
+                sampler = self.add_sampler(animation, track.rot_times, continuous_quats(track.rot_keys), 'VEC4')
+                animation['channels'].append({'sampler': sampler, 'target': {'node': node, 'path': 'rotation'}})
+
+        if animation['channels']:
+            self.add('animations', animation)
+
+    def write(self, filepath):
+        if self.length > 0:
+            self.gltf['buffers'].append({'byteLength': self.length + -self.length % 4})
+        for key in [key for key, value in self.gltf.items() if value == []]:
+            del self.gltf[key]
+
+        content = json.dumps(self.gltf, separators=(',', ':')).encode('utf-8')
+        content += b' ' * (-len(content) % 4)
+        bin_length = self.length + -self.length % 4
+        total = 12 + 8 + len(content) + (8 + bin_length if self.length > 0 else 0)
+
+        with open(filepath, 'wb') as file:
+            file.write(struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, total))
+            file.write(struct.pack('<II', len(content), GLB_CHUNK_JSON))
+            file.write(content)
+            if self.length > 0:
+                file.write(struct.pack('<II', bin_length, GLB_CHUNK_BIN))
+                for pad, data in self.pieces:
+                    file.write(b'\x00' * pad)
+                    file.write(data)
+                file.write(b'\x00' * (bin_length - self.length))
+
+
+def write_model_glb(filepath, model, bones, actions=()):
+    """Write the skeleton, meshes and materials of `model` plus an animation per NativeAction"""
+    output_dir = os.path.dirname(filepath)
+    writer = GLTFWriter()
+    root, node_ids = writer.add_skeleton(model.name, bones)
+    by_name = {}
+    for bone in bones:
+        by_name.setdefault(bone.name, bone)
+
+    for mesh in model.meshes:
+        parent_bone = by_name.get(mesh.parent_bone)
+        texture = model.textures[mesh.texture_index] if mesh.texture_index < len(model.textures) else None
+        mesh_index, primitive = writer.add_mesh(mesh, writer.add_material(mesh, texture, output_dir))
+
+        if mesh.skin is not None and bones:
+            # skinned meshes stay in the scene root, the joints place them
+            mesh_matrix = parent_bone.matrix if parent_bone is not None else IDENTITY
+            skin = writer.add_skin(mesh, primitive, mesh_matrix, bones, node_ids, parent_bone)
+            writer.add_node({'name': mesh.name, 'mesh': mesh_index, 'skin': skin})
+        else:
+            # rigid meshes follow their parent bone
+            parent = node_ids[parent_bone.index] if parent_bone is not None else root
+            writer.add_node({'name': mesh.name, 'mesh': mesh_index}, parent)
+
+    for action in actions:
+        writer.add_action(action, node_ids)
+    writer.write(filepath)
+
+def export_native_glb(rmb_file, rab_files, output, all_in_one=False, mesh_only=False):
+    """Convert a model to binary glTF without Blender, returns the written file paths"""
+    return export_native(rmb_file, rab_files, output, write_model_glb, '.glb', all_in_one, mesh_only)
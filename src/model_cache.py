@@ -0,0 +1,411 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Pre-parsed RMB/RAB models in memory mapped columnar sidecar files
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+#
+# Sidecar layout: MODEL_CACHE_HEADER (magic, version, metadata length), the metadata
+# as JSON, then every column as raw little endian values at a 16 byte aligned offset.
+# The metadata holds the source file key (size, mtime, sha256), the non array fields
+# of the parsed model and a name -> [struct code, value count, width, offset] column table.
+# With numpy the columns are loaded as views into the mapping, so loading a model
+# only touches the pages that are read.
+
+
+from array import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from rmb_rab_parser import RMBModelData, RMBMeshData, RMBSkinData, RMBTextureData, RMBBoneData, RABActionData, RABBoneData
+from rmb_rab_parser import load_rmb as parse_rmb_file, load_rab as parse_rab_file, resolve_textures, ticks_to_frames, typed_array, Vectors
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+MODEL_CACHE_DIR = '.model_cache'
+MODEL_CACHE_MAGIC = b'RMBC'
+MODEL_CACHE_VERSION = 1
+MODEL_CACHE_HEADER = struct.Struct('<4sII')
+MODEL_CACHE_ALIGN = 16
+
+# column struct code -> little endian numpy dtype
+COLUMN_DTYPES = {
+	'B': 'u1',
+	'H': '<u2',
+	'i': '<i4',
+	'f': '<f4',
+	'd': '<f8',
+}
+
+# sidecar directory, None disables the cache and every load parses the source file
+_cache_dir = None
+
+
+def set_cache_dir(dirname):
+	global _cache_dir
+	_cache_dir = dirname
+
+def enabled():
+	return _cache_dir is not None
+
+def file_digest(filepath):
+	sha = hashlib.sha256()
+	f = open(filepath, 'rb')
+	try:
+		while True:
+			chunk = f.read(1 << 20)
+			if not chunk:
+				break
+			sha.update(chunk)
+	finally:
+		f.close()
+	return sha.hexdigest()
+
+def source_key(filepath):
+	st = os.stat(filepath)
+	return {'size': st.st_size, 'mtime': st.st_mtime}
+
+def sidecar_path(filepath):
+	"""<cache dir>/<file name>.<hash of the absolute path>.mc, so equal names in other folders do not collide"""
+	path = os.path.abspath(filepath)
+	if not isinstance(path, bytes):
+		path = path.encode('utf-8')
+	path_hash = hashlib.sha1(path).hexdigest()[:12]
+	return os.path.join(_cache_dir, '{0}.{1}.mc'.format(os.path.basename(filepath), path_hash))
+
+
+def column_bytes(values, code):
+	"""Raw little endian bytes of a numpy array or a (nested) sequence"""
+	if numpy is not None:
+		return numpy.ascontiguousarray(values, dtype=COLUMN_DTYPES[code]).tobytes()
+
+	flat = []
+	for value in values:
+		if isinstance(value, (tuple, list)):
+			flat.extend(value)
+		else:
+			flat.append(value)
+	data = array(code, flat)
+	if sys.byteorder != 'little':
+		data.byteswap()
+	if hasattr(data, 'tobytes'):
+		return data.tobytes()
+	return data.tostring()
+
+def concat(parts):
+	"""One column out of per mesh/bone blocks"""
+	if numpy is not None:
+		parts = [part for part in parts if len(part) > 0]
+		if len(parts) == 0:
+			return []
+		return numpy.concatenate([numpy.asarray(part) for part in parts])
+
+	result = []
+	for part in parts:
+		result.extend(part)
+	return result
+
+def write_sidecar(path, key, kind, meta, columns):
+	"""`columns` is a list of (name, code, width, values)"""
+	blobs = []
+	table = {}
+	offset = 0
+	for name, code, width, values in columns:
+		data = column_bytes(values, code)
+		table[name] = [code, len(data) // struct.calcsize(code), width, offset]
+		blobs.append(data)
+		offset += len(data) + (-len(data) % MODEL_CACHE_ALIGN)
+
+	# column offsets are stored relative to the data start, which follows the metadata
+	content = json.dumps({'source': key, 'kind': kind, 'model': meta, 'columns': table}).encode('utf-8')
+	data_start = MODEL_CACHE_HEADER.size + len(content)
+	data_start += -data_start % MODEL_CACHE_ALIGN
+
+	if not os.path.exists(os.path.dirname(path)):
+		try:
+			os.makedirs(os.path.dirname(path))
+		except OSError:
+			# created meanwhile by a parallel process
+			if not os.path.isdir(os.path.dirname(path)):
+				raise
+
+	# write next to the target and swap, parallel jobs and threads may build the same sidecar
+	tmp_path = '{0}.{1}.{2}.tmp'.format(path, os.getpid(), threading.current_thread().ident)
+	f = open(tmp_path, 'wb')
+	try:
+		f.write(MODEL_CACHE_HEADER.pack(MODEL_CACHE_MAGIC, MODEL_CACHE_VERSION, len(content)))
+		f.write(content)
+		f.write(b'\x00' * (data_start - MODEL_CACHE_HEADER.size - len(content)))
+		for data in blobs:
+			f.write(data)
+			f.write(b'\x00' * (-len(data) % MODEL_CACHE_ALIGN))
+	finally:
+		f.close()
+
+	try:
+		if hasattr(os, 'replace'):
+			os.replace(tmp_path, path)
+		else:
+			if os.path.exists(path):
+				os.remove(path)
+			os.rename(tmp_path, path)
+	except OSError:
+		# the sidecar is mapped by another process (Windows), it is rebuilt next time
+		os.remove(tmp_path)
+
+
+class Sidecar():
+	"""Memory mapped sidecar file, columns are numpy views or typed arrays"""
+	def __init__(self, path):
+		f = open(path, 'rb')
+		try:
+			self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		finally:
+			f.close()
+
+		magic, version, length = MODEL_CACHE_HEADER.unpack_from(self.buffer, 0)
+		if magic != MODEL_CACHE_MAGIC or version != MODEL_CACHE_VERSION:
+			self.buffer.close()
+			raise ValueError('Not a model cache file: {0}'.format(path))
+
+		data = json.loads(self.buffer[MODEL_CACHE_HEADER.size:MODEL_CACHE_HEADER.size + length].decode('utf-8'))
+		self.source = data['source']
+		self.kind = data['kind']
+		self.meta = data['model']
+		self.columns = data['columns']
+		self.data_start = MODEL_CACHE_HEADER.size + length
+		self.data_start += -self.data_start % MODEL_CACHE_ALIGN
+
+	def column(self, name, start=0, count=None):
+		"""Vectors start..start+count of a column, (count, width) numpy view or Vectors"""
+		code, total, width, offset = self.columns[name]
+		if count is None:
+			count = total // width - start
+		offset = self.data_start + offset + start * width * struct.calcsize(code)
+
+		if numpy is not None:
+			data = numpy.frombuffer(self.buffer, dtype=COLUMN_DTYPES[code], count=count * width, offset=offset)
+			return data if width == 1 else data.reshape(-1, width)
+
+		data = typed_array(code, self.buffer[offset:offset + count * width * struct.calcsize(code)])
+		if width == 1:
+			return data
+		return Vectors(data, width)
+
+	def close(self):
+		self.buffer.close()
+
+
+def open_sidecar(filepath, kind):
+	"""Sidecar of `filepath` if it was built from the current file content, otherwise None"""
+	path = sidecar_path(filepath)
+	if not os.path.exists(path):
+		return None
+
+	try:
+		sidecar = Sidecar(path)
+	except (IOError, OSError, ValueError):
+		return None
+
+	key = source_key(filepath)
+	if sidecar.kind == kind and sidecar.source['size'] == key['size']:
+		if sidecar.source['mtime'] == key['mtime'] or sidecar.source['sha256'] == file_digest(filepath):
+			return sidecar
+
+	sidecar.close()
+	return None
+
+
+def rmb_meta(model):
+	meshes = []
+	for mesh in model.meshes:
+		meshes.append({
+			'index': mesh.index,
+			'name': mesh.name,
+			'parent_bone': mesh.parent_bone,
+			'has_armature': mesh.has_armature,
+			'texture_index': mesh.texture_index,
+			'bone_map_count': mesh.bone_map_count,
+			'vertices_count': mesh.vertices_count,
+			'indices_count': mesh.indices_count,
+			'bone_map': [int(v) for v in mesh.skin.bone_map] if mesh.skin is not None else None,
+		})
+
+	bones = []
+	for bone in model.bones:
+		bones.append({'id': bone.id, 'parent_id': bone.parent_id, 'name': bone.name, 'parent_name': bone.parent_name})
+
+	return {
+		'name': model.name,
+		'item_flag': model.item_flag,
+		'data_offset': model.data_offset,
+		'textures': [texture.name for texture in model.textures],
+		'meshes': meshes,
+		'bones': bones,
+	}
+
+def write_rmb_sidecar(filepath, model, key):
+	skinned = [mesh for mesh in model.meshes if mesh.skin is not None]
+	matrices = []
+	for bone in model.bones:
+		matrices.append(list(bone.matrix1) + list(bone.matrix2) + list(bone.matrix3))
+
+	write_sidecar(sidecar_path(filepath), key, 'rmb', rmb_meta(model), [
+		('bone_matrices', 'f', 48, matrices),
+		('positions', 'f', 3, concat([mesh.vert_pos_list for mesh in model.meshes])),
+		('normals', 'f', 3, concat([mesh.vert_norm_list for mesh in model.meshes])),
+		('uvs', 'f', 2, concat([mesh.vert_uv_list for mesh in model.meshes])),
+		('skin_weights', 'f', 4, concat([mesh.skin.weight_list for mesh in skinned])),
+		('skin_indices', 'B', 4, concat([mesh.skin.indice_list for mesh in skinned])),
+		('indices', 'H', 1, concat([mesh.indice_list for mesh in model.meshes])),
+	])
+
+def read_rmb_sidecar(sidecar, filepath, texture_path=None):
+	meta = sidecar.meta
+	model = RMBModelData(meta['name'])
+	model.item_flag = meta['item_flag']
+	model.data_offset = meta['data_offset']
+	for name in meta['textures']:
+		model.textures.append(RMBTextureData(name))
+
+	matrices = sidecar.column('bone_matrices')
+	for i in range(len(meta['bones'])):
+		record = meta['bones'][i]
+		bone = RMBBoneData()
+		bone.id = record['id']
+		bone.parent_id = record['parent_id']
+		bone.name = record['name']
+		bone.parent_name = record['parent_name']
+		values = [float(v) for v in matrices[i]]
+		bone.matrix1, bone.matrix2, bone.matrix3 = values[0:16], values[16:32], values[32:48]
+		model.bones.append(bone)
+
+	vertex_start = 0
+	skin_start = 0
+	index_start = 0
+	for record in meta['meshes']:
+		mesh = RMBMeshData()
+		for field in ('index', 'name', 'parent_bone', 'has_armature', 'texture_index', 'bone_map_count', 'vertices_count', 'indices_count'):
+			setattr(mesh, field, record[field])
+
+		count = mesh.vertices_count
+		mesh.vert_pos_list = sidecar.column('positions', vertex_start, count)
+		mesh.vert_norm_list = sidecar.column('normals', vertex_start, count)
+		mesh.vert_uv_list = sidecar.column('uvs', vertex_start, count)
+		mesh.indice_list = sidecar.column('indices', index_start, mesh.indices_count)
+		vertex_start += count
+		index_start += mesh.indices_count
+
+		if record['bone_map'] is not None:
+			skin = RMBSkinData()
+			skin.bone_map = tuple(record['bone_map'])
+			skin.weight_list = sidecar.column('skin_weights', skin_start, count)
+			skin.indice_list = sidecar.column('skin_indices', skin_start, count)
+			skin_start += count
+			mesh.skin = skin
+
+		model.meshes.append(mesh)
+
+	resolve_textures(model, os.path.dirname(filepath), texture_path)
+	return model
+
+def write_rab_sidecar(filepath, action, key):
+	meta = {
+		'name': action.name,
+		'model_name': action.model_name,
+		'anim_name': action.anim_name,
+		'header': action.header,
+		'bones': [{'name': bone.name, 'rot_frame_count': bone.rot_frame_count, 'pos_frame_count': bone.pos_frame_count} for bone in action.bones],
+	}
+	write_sidecar(sidecar_path(filepath), key, 'rab', meta, [
+		('pos_frames', 'i', 1, concat([bone.pos_frames for bone in action.bones])),
+		('rot_frames', 'i', 1, concat([bone.rot_frames for bone in action.bones])),
+		('pos_keys', 'f', 3, concat([bone.pos_key_list for bone in action.bones])),
+		('rot_keys', 'f', 4, concat([bone.rot_key_list for bone in action.bones])),
+		# the accumulated rotations are the expensive part of a rab parse
+		('rot_accum', 'd', 4, concat([bone.rot_accum_list for bone in action.bones])),
+	])
+
+def read_rab_sidecar(sidecar):
+	meta = sidecar.meta
+	action = RABActionData(meta['name'])
+	action.model_name = meta['model_name']
+	action.anim_name = meta['anim_name']
+	action.header = meta['header']
+	action.bones_count = len(meta['bones'])
+
+	pos_start = 0
+	rot_start = 0
+	for record in meta['bones']:
+		bone = RABBoneData()
+		bone.name = record['name']
+		bone.pos_frame_count = record['pos_frame_count']
+		bone.rot_frame_count = record['rot_frame_count']
+
+		bone.pos_frames = sidecar.column('pos_frames', pos_start, bone.pos_frame_count)
+		bone.rot_frames = sidecar.column('rot_frames', rot_start, bone.rot_frame_count)
+		bone.pos_key_list = sidecar.column('pos_keys', pos_start, bone.pos_frame_count)
+		bone.rot_key_list = sidecar.column('rot_keys', rot_start, bone.rot_frame_count)
+		bone.rot_accum_list = sidecar.column('rot_accum', rot_start, bone.rot_frame_count)
+		bone.pos_frame_list = ticks_to_frames(bone.pos_frames)
+		bone.rot_frame_list = ticks_to_frames(bone.rot_frames)
+		pos_start += bone.pos_frame_count
+		rot_start += bone.rot_frame_count
+
+		action.bones.append(bone)
+
+	return action
+
+
+def load_rmb(filepath, texture_path=None):
+	"""Parsed .rmb model, from its sidecar when the cache is enabled (built on a miss)"""
+	if _cache_dir is None:
+		return parse_rmb_file(filepath, texture_path, use_mmap=numpy is not None)
+
+	sidecar = open_sidecar(filepath, 'rmb')
+	if sidecar is not None:
+		return read_rmb_sidecar(sidecar, filepath, texture_path)
+
+	key = source_key(filepath)
+	key['sha256'] = file_digest(filepath)
+	model = parse_rmb_file(filepath, texture_path, use_mmap=numpy is not None)
+	write_rmb_sidecar(filepath, model, key)
+	return model
+
+def load_rab(filepath):
+	"""Parsed .rab action, from its sidecar when the cache is enabled (built on a miss)"""
+	if _cache_dir is None:
+		return parse_rab_file(filepath, use_mmap=numpy is not None)
+
+	sidecar = open_sidecar(filepath, 'rab')
+	if sidecar is not None:
+		return read_rab_sidecar(sidecar)
+
+	key = source_key(filepath)
+	key['sha256'] = file_digest(filepath)
+	action = parse_rab_file(filepath, use_mmap=numpy is not None)
+	write_rab_sidecar(filepath, action, key)
+	return action
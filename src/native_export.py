@@ -0,0 +1,742 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Write parsed RMB/RAB data straight to binary FBX, without Blender
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from itertools import chain, repeat
+from math import asin, atan2, degrees, sqrt
+from operator import sub
+import os
+import struct
+from rmb_rab_parser import flat_array, split_triangles, RAB_TICKS_PER_FRAME
+import model_cache
+from fbx_binary import FBXElem, write_fbx, FBX_VERSION, FBX_FILE_ID, FBX_TIME_ID
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# FBX time unit (KTime) ticks per second
+FBX_KTIME_SECOND = 46186158000
+# GlobalSettings TimeMode: eFrames30 and eCustom (CustomFrameRate)
+FBX_TIME_MODE_30 = 6
+FBX_TIME_MODE_CUSTOM = 14
+# rab header x4 is the frame rate
+RAB_FPS = 30
+
+# AnimationCurve key attributes: linear interpolation, default tangent data
+FBX_KEY_VERSION = 4009
+FBX_KEY_FLAGS_LINEAR = 0x4
+FBX_KEY_DATA = (0.0, 0.0, struct.unpack('<f', struct.pack('<i', 218434821))[0], 0.0)
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+# Matrices are flat row major 4x4 tuples in the Blender 2.49 row vector convention
+# (v' = v * M, translation in the last row), which is also the FBX matrix layout.
+
+def mat4_mul(a, b):
+    return tuple([sum([a[r*4 + k] * b[k*4 + c] for k in range(4)]) for r in range(4) for c in range(4)])
+
+def mat4_inverse(m):
+    """Inverse of an affine row vector matrix"""
+    a, b, c = m[0], m[1], m[2]
+    d, e, f = m[4], m[5], m[6]
+    g, h, i = m[8], m[9], m[10]
+    det = a*(e*i - f*h) - b*(d*i - f*g) + c*(d*h - e*g)
+    if abs(det) < 1e-12:
+        return IDENTITY
+
+    inv = [
+        (e*i - f*h) / det, (c*h - b*i) / det, (b*f - c*e) / det,
+        (f*g - d*i) / det, (a*i - c*g) / det, (c*d - a*f) / det,
+        (d*h - e*g) / det, (b*g - a*h) / det, (a*e - b*d) / det,
+    ]
+    tx, ty, tz = m[12], m[13], m[14]
+    return (
+        inv[0], inv[1], inv[2], 0.0,
+        inv[3], inv[4], inv[5], 0.0,
+        inv[6], inv[7], inv[8], 0.0,
+        -(tx*inv[0] + ty*inv[3] + tz*inv[6]), -(tx*inv[1] + ty*inv[4] + tz*inv[7]), -(tx*inv[2] + ty*inv[5] + tz*inv[8]), 1.0,
+    )
+
+def rotation_to_euler(r):
+    """XYZ euler angles in degrees of a column vector rotation matrix r (R = Rz * Ry * Rx)"""
+    sy = -r[2][0]
+    if abs(sy) < 0.999999:
+        x = atan2(r[2][1], r[2][2])
+        y = asin(sy)
+        z = atan2(r[1][0], r[0][0])
+    else:
+        # gimbal lock, the x and z rotations share an axis
+        x = atan2(-r[1][2], r[1][1])
+        y = asin(max(-1.0, min(1.0, sy)))
+        z = 0.0
+    return (degrees(x), degrees(y), degrees(z))
+
+def rotation_to_quat(r):
+    """(x, y, z, w) quaternion of a column vector rotation matrix r"""
+    trace = r[0][0] + r[1][1] + r[2][2]
+    if trace > 0:
+        s = 2.0 * sqrt(trace + 1.0)
+        q = ((r[2][1] - r[1][2]) / s, (r[0][2] - r[2][0]) / s, (r[1][0] - r[0][1]) / s, 0.25 * s)
+    elif r[0][0] > r[1][1] and r[0][0] > r[2][2]:
+        s = 2.0 * sqrt(max(1.0 + r[0][0] - r[1][1] - r[2][2], 1e-12))
+        q = (0.25 * s, (r[0][1] + r[1][0]) / s, (r[0][2] + r[2][0]) / s, (r[2][1] - r[1][2]) / s)
+    elif r[1][1] > r[2][2]:
+        s = 2.0 * sqrt(max(1.0 + r[1][1] - r[0][0] - r[2][2], 1e-12))
+        q = ((r[0][1] + r[1][0]) / s, 0.25 * s, (r[1][2] + r[2][1]) / s, (r[0][2] - r[2][0]) / s)
+    else:
+        s = 2.0 * sqrt(max(1.0 + r[2][2] - r[0][0] - r[1][1], 1e-12))
+        q = ((r[0][2] + r[2][0]) / s, (r[1][2] + r[2][1]) / s, 0.25 * s, (r[1][0] - r[0][1]) / s)
+
+    n = sqrt(sum([v*v for v in q])) or 1.0
+    return tuple([v / n for v in q])
+
+def split_matrix(m):
+    """Row vector matrix -> (translation, column vector rotation matrix, scale)"""
+    rows = [m[0:3], m[4:7], m[8:11]]
+    scale = [sqrt(sum([v*v for v in row])) or 1.0 for row in rows]
+    # the rows are the images of the basis vectors, i.e. the columns of the rotation
+    rotation = [[rows[j][i] / scale[j] for j in range(3)] for i in range(3)]
+    return tuple(m[12:15]), rotation, tuple(scale)
+
+def decompose(m):
+    """Row vector matrix -> (translation, euler rotation in degrees, scale)"""
+    translation, rotation, scale = split_matrix(m)
+    return translation, rotation_to_euler(rotation), scale
+
+def quat_to_euler(q):
+    """XYZ euler angles in degrees of an (x, y, z, w) quaternion"""
+    x, y, z, w = q
+    n = sqrt(x*x + y*y + z*z + w*w) or 1.0
+    x, y, z, w = x/n, y/n, z/n, w/n
+    rotation = [
+        [1 - 2*(y*y + z*z), 2*(x*y - z*w), 2*(x*z + y*w)],
+        [2*(x*y + z*w), 1 - 2*(x*x + z*z), 2*(y*z - x*w)],
+        [2*(x*z - y*w), 2*(y*z + x*w), 1 - 2*(x*x + y*y)],
+    ]
+    return rotation_to_euler(rotation)
+
+def unwrap_angles(values):
+    """Shift every angle by whole turns to be the closest to the previous one"""
+    result = []
+    for value in values:
+        if result:
+            value += 360.0 * round((result[-1] - value) / 360.0)
+        result.append(value)
+    return result
+
+
+class NativeBone():
+    """Skeleton bone with its rest matrices"""
+    def __init__(self, index, name, parent, matrix, local_matrix):
+        self.index = index
+        self.name = name
+        self.parent = parent                # NativeBone or None
+        self.matrix = matrix                # global rest matrix
+        self.local_matrix = local_matrix    # rest matrix relative to the parent bone
+
+class NativeTrack():
+    """Keys of one bone in one action, times in seconds"""
+    def __init__(self, bone):
+        self.bone = bone
+        self.pos_times = []
+        self.pos_keys = []                  # local translations
+        self.rot_times = []
+        self.rot_keys = []                  # local (x, y, z, w) rotations
+
+class NativeAction():
+    def __init__(self, name, fps):
+        self.name = name
+        self.fps = fps
+        self.tracks = []
+
+    def duration(self):
+        times = [t for track in self.tracks for t in track.pos_times + track.rot_times]
+        return max(times) if times else 0.0
+
+
+def build_skeleton(model):
+    """NativeBone per rmb bone, the rest pose is the inverse of the inverted bind matrix (matrix3)"""
+    by_name = {}
+    for bone in model.bones:
+        by_name.setdefault(bone.name, bone)
+
+    bones = []
+    created = {}
+
+    def create(bone):
+        if bone.name in created:
+            return created[bone.name]
+
+        parent = None
+        parent_data = by_name.get(bone.parent_name)
+        if bone.parent_id != -1 and parent_data is not None and parent_data is not bone:
+            created[bone.name] = None   # guards against parent cycles
+            parent = create(parent_data)
+
+        matrix = mat4_inverse(bone.matrix3)
+        local_matrix = mat4_mul(matrix, mat4_inverse(parent.matrix)) if parent is not None else matrix
+        native = NativeBone(len(bones), bone.name, parent, matrix, local_matrix)
+        bones.append(native)
+        created[bone.name] = native
+        return native
+
+    for bone in model.bones:
+        create(bone)
+    return bones
+
+def mesh_triangles(mesh):
+    """Polygon vertex indices of a mesh, the last index of every triangle is stored as ~index"""
+    triangles, _ = split_triangles(mesh.indice_list, [(0, len(mesh.indice_list))])
+    if numpy is not None:
+        triangles = numpy.array(triangles, dtype=numpy.int32).reshape(-1, 3)
+        triangles[:, 2] = ~triangles[:, 2]
+        return triangles
+    return [(a, b, ~c) for a, b, c in triangles]
+
+def mesh_uvs(mesh):
+    """Vertex uvs with v flipped like the Blender importer does"""
+    if numpy is not None:
+        uvs = numpy.array(mesh.vert_uv_list, dtype=numpy.float64).reshape(-1, 2)
+        uvs[:, 1] = 1.0 - uvs[:, 1]
+        return uvs
+
+    flat = flat_array(mesh.vert_uv_list)
+    if flat is not None:
+        uvs = array('d', flat)
+        uvs[1::2] = array('d', map(sub, repeat(1.0), uvs[1::2]))
+        return uvs
+    return [(u, 1.0 - v) for u, v in mesh.vert_uv_list]
+
+def skin_clusters(mesh, bones, parent_bone):
+    """{bone index: (vertex indices, weights)} of a mesh.
+
+    Rigged meshes map their skin indices through the bone map, rigid meshes are bound
+    to the parent bone with weight 1. Zero weights are dropped and a bone listed twice
+    for a vertex keeps its last weight."""
+    if mesh.skin is None:
+        if parent_bone is None:
+            return {}
+        return {parent_bone.index: (list(range(mesh.vertices_count)), [1.0] * mesh.vertices_count)}
+
+    bone_map = mesh.skin.bone_map
+    bone_count = len(bones)
+    if numpy is not None:
+        weights = numpy.asarray(mesh.skin.weight_list, dtype=numpy.float64).reshape(-1, 4)
+        indices = numpy.asarray(mesh.skin.indice_list, dtype=numpy.int64).reshape(-1, 4)
+        if len(bone_map) > 0:
+            lookup = numpy.asarray(bone_map, dtype=numpy.int64)
+            valid = indices < len(lookup)
+            indices = numpy.where(valid, lookup[numpy.minimum(indices, len(lookup) - 1)], -1)
+        vertices = numpy.repeat(numpy.arange(len(weights)), 4)
+        indices = indices.ravel()
+        weights = weights.ravel()
+        keep = (weights != 0) & (indices >= 0) & (indices < bone_count)
+        vertices, indices, weights = vertices[keep], indices[keep], weights[keep]
+
+        # the first occurrence in reversed order is the last one per (vertex, bone)
+        _, last = numpy.unique((vertices * bone_count + indices)[::-1], return_index=True)
+        last = len(vertices) - 1 - last
+        order = last[numpy.lexsort((vertices[last], indices[last]))]
+
+        clusters = {}
+        bone_ids, starts = numpy.unique(indices[order], return_index=True)
+        ends = list(starts[1:]) + [len(order)]
+        for bone_id, start, end in zip(bone_ids, starts, ends):
+            clusters[int(bone_id)] = (vertices[order[start:end]], weights[order[start:end]])
+        return clusters
+
+    # one pass over the flat weight and index arrays, the skin indices go through a lookup table
+    weights = flat_array(mesh.skin.weight_list)
+    if weights is None:
+        weights = list(chain.from_iterable(mesh.skin.weight_list))
+    indices = flat_array(mesh.skin.indice_list)
+    if indices is None:
+        indices = list(chain.from_iterable(mesh.skin.indice_list))
+    size = max(indices) + 1 if len(indices) > 0 else 0
+    lookup = [bone_map[i] if i < len(bone_map) else -1 for i in range(size)] if len(bone_map) > 0 else list(range(size))
+
+    groups = {}
+    for i, (weight, index) in enumerate(zip(weights, map(lookup.__getitem__, indices))):
+        if weight == 0 or index < 0 or index >= bone_count:
+            continue
+        groups.setdefault(index, {})[i // 4] = weight
+
+    clusters = {}
+    for bone_id in sorted(groups):
+        vertices = sorted(groups[bone_id])
+        clusters[bone_id] = (vertices, [groups[bone_id][v] for v in vertices])
+    return clusters
+
+def last_keys(times, keys):
+    """Sort keys by time, a later key of the same time wins"""
+    merged = {}
+    for time, key in zip(times, keys):
+        merged[time] = key
+    ordered = sorted(merged)
+    return ordered, [merged[time] for time in ordered]
+
+def build_action(action, bones):
+    """NativeAction of a parsed rab action for the bones of a skeleton.
+
+    Position keys are local translations relative to the parent bone. The Blender importer
+    keys the inverted matrix of the accumulated rotation, so the local rotation is its conjugate."""
+    fps = action.header.get('x4') or RAB_FPS
+    ticks_per_frame = action.header.get('ticks_per_frame') or RAB_TICKS_PER_FRAME
+    ticks_per_second = float(fps * ticks_per_frame)
+
+    by_name = dict([(bone.name, bone) for bone in bones])
+    native = NativeAction(action.anim_name or action.name, fps)
+    for bone_data in action.bones:
+        bone = by_name.get(bone_data.name)
+        if bone is None:
+            continue
+
+        track = NativeTrack(bone)
+        pos_times = [int(t) / ticks_per_second for t in bone_data.pos_frames]
+        track.pos_times, track.pos_keys = last_keys(pos_times, [tuple([float(v) for v in key]) for key in bone_data.pos_key_list])
+        rot_times = [int(t) / ticks_per_second for t in bone_data.rot_frames]
+        rot_keys = [(-float(q[0]), -float(q[1]), -float(q[2]), float(q[3])) for q in bone_data.rot_accum_list]
+        track.rot_times, track.rot_keys = last_keys(rot_times, rot_keys)
+        native.tracks.append(track)
+
+    return native
+
+
+def properties70(elem, props):
+    """Properties70 child of `elem` from (name, type, label, flags, *values) tuples"""
+    node = elem.add('Properties70')
+    for name, type_name, label, flags, *values in props:
+        p = node.add('P', name, type_name, label, flags)
+        for value in values:
+            if type_name == 'KTime':
+                p.add_int64(value)
+            elif isinstance(value, str):
+                p.add_string(value)
+            elif isinstance(value, (bool, int)) and type_name in ('int', 'Integer', 'enum', 'bool'):
+                p.add_int32(int(value))
+            else:
+                p.add_float64(float(value))
+    return node
+
+def fbx_name(name, fbx_class):
+    """Object names are stored as name\\x00\\x01Class"""
+    return name.encode('utf-8') + b'\x00\x01' + fbx_class.encode('ascii')
+
+def fbx_time(seconds):
+    return int(round(seconds * FBX_KTIME_SECOND))
+
+def lcl_properties(matrix):
+    translation, rotation, scale = decompose(matrix)
+    return [
+        ('Lcl Translation', 'Lcl Translation', '', 'A') + translation,
+        ('Lcl Rotation', 'Lcl Rotation', '', 'A') + rotation,
+        ('Lcl Scaling', 'Lcl Scaling', '', 'A') + scale,
+    ]
+
+
+class FBXSceneWriter():
+    """Builds the Objects/Connections of one FBX file and the Definitions counting them"""
+    def __init__(self, fps=RAB_FPS):
+        self.fps = fps
+        self.next_id = 1000000
+        self.objects = FBXElem('Objects')
+        self.connections = FBXElem('Connections')
+        self.counts = {}
+        self.stacks = []
+
+    def add_object(self, kind, name, fbx_class, subtype=''):
+        """New object node, returns (id, node)"""
+        self.next_id += 1
+        elem = self.objects.add(kind)
+        elem.add_int64(self.next_id)
+        elem.add_string(fbx_name(name, fbx_class))
+        elem.add_string(subtype)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        return self.next_id, elem
+
+    def connect(self, child, parent, prop=None):
+        if prop is None:
+            c = self.connections.add('C', 'OO')
+        else:
+            c = self.connections.add('C', 'OP')
+        c.add_int64(child)
+        c.add_int64(parent)
+        if prop is not None:
+            c.add_string(prop)
+
+    def add_model(self, name, model_type, matrix, parent=0):
+        model_id, elem = self.add_object('Model', name, 'Model', model_type)
+        elem.add('Version', 232)
+        props = lcl_properties(matrix) + [('InheritType', 'enum', '', '', 1), ('DefaultAttributeIndex', 'int', 'Integer', '', 0)]
+        properties70(elem, props)
+        elem.add('Shading', True)
+        elem.add('Culling', 'CullingOff')
+        self.connect(model_id, parent)
+        return model_id
+
+    def add_skeleton(self, bones):
+        """Armature null with a LimbNode model per bone -> {bone index: model id}"""
+        attr_id, attr = self.add_object('NodeAttribute', 'Armature', 'NodeAttribute', 'Null')
+        attr.add('TypeFlags', 'Null')
+        armature_id = self.add_model('Armature', 'Null', IDENTITY)
+        self.connect(attr_id, armature_id)
+
+        model_ids = {}
+        for bone in bones:
+            attr_id, attr = self.add_object('NodeAttribute', bone.name, 'NodeAttribute', 'LimbNode')
+            properties70(attr, [('Size', 'double', 'Number', '', 1.0)])
+            attr.add('TypeFlags', 'Skeleton')
+
+            parent = model_ids[bone.parent.index] if bone.parent is not None else armature_id
+            model_ids[bone.index] = self.add_model(bone.name, 'LimbNode', bone.local_matrix, parent)
+            self.connect(attr_id, model_ids[bone.index])
+        return model_ids
+
+    def add_geometry(self, mesh):
+        geometry_id, elem = self.add_object('Geometry', mesh.name, 'Geometry', 'Mesh')
+        properties70(elem, [])
+        elem.add('GeometryVersion', 124)
+        vertices = elem.add('Vertices')
+        vertices.add_array('d', mesh.vert_pos_list)
+        indices = elem.add('PolygonVertexIndex')
+        indices.add_array('i', mesh_triangles(mesh))
+
+        normals = elem.add('LayerElementNormal', 0)
+        normals.add('Version', 101)
+        normals.add('Name', '')
+        normals.add('MappingInformationType', 'ByVertice')
+        normals.add('ReferenceInformationType', 'Direct')
+        normals.add('Normals').add_array('d', mesh.vert_norm_list)
+
+        uvs = elem.add('LayerElementUV', 0)
+        uvs.add('Version', 101)
+        uvs.add('Name', 'UVMap')
+        uvs.add('MappingInformationType', 'ByVertice')
+        uvs.add('ReferenceInformationType', 'Direct')
+        uvs.add('UV').add_array('d', mesh_uvs(mesh))
+
+        materials = elem.add('LayerElementMaterial', 0)
+        materials.add('Version', 101)
+        materials.add('Name', '')
+        materials.add('MappingInformationType', 'AllSame')
+        materials.add('ReferenceInformationType', 'IndexToDirect')
+        materials.add('Materials').add_array('i', [0])
+
+        layer = elem.add('Layer', 0)
+        layer.add('Version', 100)
+        for layer_type in ('LayerElementNormal', 'LayerElementUV', 'LayerElementMaterial'):
+            layer_elem = layer.add('LayerElement')
+            layer_elem.add('Type', layer_type)
+            layer_elem.add('TypedIndex', 0)
+        return geometry_id
+
+    def add_texture(self, name, filepath, output_dir):
+        try:
+            relative = os.path.relpath(filepath, output_dir)
+        except ValueError:
+            # different drive on Windows
+            relative = filepath
+
+        video_id, video = self.add_object('Video', name, 'Video', 'Clip')
+        video.add('Type', 'Clip')
+        properties70(video, [('Path', 'KString', 'XRefUrl', '', filepath)])
+        video.add('UseMipMap', 0)
+        video.add('Filename', filepath)
+        video.add('RelativeFilename', relative)
+
+        texture_id, texture = self.add_object('Texture', name, 'Texture')
+        texture.add('Type', 'TextureVideoClip')
+        texture.add('Version', 202)
+        texture.add('TextureName', fbx_name(name, 'Texture'))
+        properties70(texture, [('UseMaterial', 'bool', '', '', 1)])
+        texture.add('Media', fbx_name(name, 'Video'))
+        texture.add('FileName', filepath)
+        texture.add('RelativeFilename', relative)
+        texture.add('ModelUVTranslation', 0.0, 0.0)
+        texture.add('ModelUVScaling', 1.0, 1.0)
+        texture.add('Texture_Alpha_Source', 'None')
+        texture.add('Cropping', 0, 0, 0, 0)
+
+        self.connect(video_id, texture_id)
+        return texture_id
+
+    def add_material(self, mesh, texture, output_dir):
+        """Material named like the Blender 3.6 export, diffuse also drives the emission"""
+        name = f'{mesh.name}_mat'
+        material_id, elem = self.add_object('Material', name, 'Material')
+        elem.add('Version', 102)
+        elem.add('ShadingModel', 'phong')
+        elem.add('MultiLayer', 0)
+        properties70(elem, [
+            ('ShadingModel', 'KString', '', '', 'Phong'),
+            ('DiffuseColor', 'Color', '', 'A', 0.8, 0.8, 0.8),
+            ('DiffuseFactor', 'Number', '', 'A', 1.0),
+            ('SpecularColor', 'Color', '', 'A', 1.0, 1.0, 1.0),
+            ('SpecularFactor', 'Number', '', 'A', 0.5),
+            ('EmissiveColor', 'Color', '', 'A', 0.0, 0.0, 0.0),
+            ('EmissiveFactor', 'Number', '', 'A', 1.0),
+        ])
+
+        if texture is not None:
+            if texture.diffuse is not None and os.path.exists(texture.diffuse):
+                texture_id = self.add_texture(os.path.basename(texture.diffuse), texture.diffuse, output_dir)
+                self.connect(texture_id, material_id, 'DiffuseColor')
+                self.connect(texture_id, material_id, 'EmissiveColor')
+            if texture.specular is not None:
+                texture_id = self.add_texture(os.path.basename(texture.specular), texture.specular, output_dir)
+                self.connect(texture_id, material_id, 'SpecularFactor')
+            if texture.normal is not None:
+                texture_id = self.add_texture(os.path.basename(texture.normal), texture.normal, output_dir)
+                self.connect(texture_id, material_id, 'NormalMap')
+        return material_id
+
+    def add_skin(self, mesh, geometry_id, mesh_matrix, bones, bone_ids, clusters):
+        skin_id, skin = self.add_object('Deformer', mesh.name, 'Deformer', 'Skin')
+        skin.add('Version', 101)
+        skin.add('Link_DeformAcuracy', 50.0)
+        self.connect(skin_id, geometry_id)
+
+        for bone_index, (vertices, weights) in clusters.items():
+            bone = bones[bone_index]
+            cluster_id, cluster = self.add_object('Deformer', bone.name, 'SubDeformer', 'Cluster')
+            cluster.add('Version', 100)
+            cluster.add('UserData', '', '')
+            cluster.add('Indexes').add_array('i', vertices)
+            cluster.add('Weights').add_array('d', weights)
+            cluster.add('Transform').add_array('d', mesh_matrix)
+            cluster.add('TransformLink').add_array('d', bone.matrix)
+            self.connect(cluster_id, skin_id)
+            self.connect(bone_ids[bone_index], cluster_id)
+
+    def add_bind_pose(self, name, nodes):
+        pose_id, pose = self.add_object('Pose', name, 'Pose', 'BindPose')
+        pose.add('Type', 'BindPose')
+        pose.add('Version', 100)
+        pose.add('NbPoseNodes', len(nodes))
+        for node_id, matrix in nodes:
+            node = pose.add('PoseNode')
+            node.add('Node').add_int64(node_id)
+            node.add('Matrix').add_array('d', matrix)
+        return pose_id
+
+    def add_curve(self, times, values):
+        curve_id, curve = self.add_object('AnimationCurve', '', 'AnimCurve')
+        curve.add('Default', float(values[0]) if values else 0.0)
+        curve.add('KeyVer', FBX_KEY_VERSION)
+        curve.add('KeyTime').add_array('l', [fbx_time(t) for t in times])
+        curve.add('KeyValueFloat').add_array('f', values)
+        curve.add('KeyAttrFlags').add_array('i', [FBX_KEY_FLAGS_LINEAR])
+        curve.add('KeyAttrDataFloat').add_array('f', FBX_KEY_DATA)
+        curve.add('KeyAttrRefCount').add_array('i', [len(times)])
+        return curve_id
+
+    def add_curve_node(self, layer_id, model_id, prop, name, times, channels):
+        node_id, node = self.add_object('AnimationCurveNode', name, 'AnimCurveNode')
+        properties70(node, [(f'd|{axis}', 'Number', '', 'A', float(values[0])) for axis, values in zip('XYZ', channels)])
+        self.connect(node_id, layer_id)
+        self.connect(node_id, model_id, prop)
+        for axis, values in zip('XYZ', channels):
+            self.connect(self.add_curve(times, values), node_id, f'd|{axis}')
+
+    def add_action(self, action, bone_ids):
+        stop = fbx_time(action.duration())
+        stack_id, stack = self.add_object('AnimationStack', action.name, 'AnimStack')
+        properties70(stack, [
+            ('LocalStart', 'KTime', 'Time', '', 0),
+            ('LocalStop', 'KTime', 'Time', '', stop),
+            ('ReferenceStart', 'KTime', 'Time', '', 0),
+            ('ReferenceStop', 'KTime', 'Time', '', stop),
+        ])
+        layer_id, _ = self.add_object('AnimationLayer', 'BaseLayer', 'AnimLayer')
+        self.connect(layer_id, stack_id)
+        self.stacks.append((action.name, stop))
+
+        for track in action.tracks:
+            model_id = bone_ids[track.bone.index]
+            if track.pos_times:
+                channels = list(zip(*track.pos_keys))
+                self.add_curve_node(layer_id, model_id, 'Lcl Translation', 'T', track.pos_times, channels)
+            if track.rot_times:
+                channels = [unwrap_angles(values) for values in zip(*[quat_to_euler(q) for q in track.rot_keys])]
+                self.add_curve_node(layer_id, model_id, 'Lcl Rotation', 'R', track.rot_times, channels)
+
+    def header_elems(self, creator):
+        header = FBXElem('FBXHeaderExtension')
+        header.add('FBXHeaderVersion', 1003)
+        header.add('FBXVersion', FBX_VERSION)
+        header.add('EncryptionType', 0)
+        stamp = header.add('CreationTimeStamp')
+        for key, value in (('Version', 1000), ('Year', 1970), ('Month', 1), ('Day', 1), ('Hour', 10), ('Minute', 0), ('Second', 0), ('Millisecond', 0)):
+            stamp.add(key, value)
+        header.add('Creator', creator)
+
+        file_id = FBXElem('FileId')
+        file_id.add_bytes(FBX_FILE_ID)
+        creation_time = FBXElem('CreationTime')
+        creation_time.add_string(FBX_TIME_ID)
+        creator_elem = FBXElem('Creator')
+        creator_elem.add_string(creator)
+
+        settings = FBXElem('GlobalSettings')
+        settings.add('Version', 1000)
+        time_mode = FBX_TIME_MODE_30 if self.fps == 30 else FBX_TIME_MODE_CUSTOM
+        stop = max([stop for _, stop in self.stacks] + [0])
+        # rmb/rab data is Y up in centimeters, which is the FBX default
+        properties70(settings, [
+            ('UpAxis', 'int', 'Integer', '', 1),
+            ('UpAxisSign', 'int', 'Integer', '', 1),
+            ('FrontAxis', 'int', 'Integer', '', 2),
+            ('FrontAxisSign', 'int', 'Integer', '', 1),
+            ('CoordAxis', 'int', 'Integer', '', 0),
+            ('CoordAxisSign', 'int', 'Integer', '', 1),
+            ('OriginalUpAxis', 'int', 'Integer', '', -1),
+            ('OriginalUpAxisSign', 'int', 'Integer', '', 1),
+            ('UnitScaleFactor', 'double', 'Number', '', 1.0),
+            ('OriginalUnitScaleFactor', 'double', 'Number', '', 1.0),
+            ('AmbientColor', 'ColorRGB', 'Color', '', 0.0, 0.0, 0.0),
+            ('DefaultCamera', 'KString', '', '', 'Producer Perspective'),
+            ('TimeMode', 'enum', '', '', time_mode),
+            ('TimeProtocol', 'enum', '', '', 2),
+            ('SnapOnFrameMode', 'enum', '', '', 0),
+            ('TimeSpanStart', 'KTime', 'Time', '', 0),
+            ('TimeSpanStop', 'KTime', 'Time', '', stop),
+            ('CustomFrameRate', 'double', 'Number', '', float(self.fps)),
+        ])
+        self.counts['GlobalSettings'] = 1
+        return [header, file_id, creation_time, creator_elem, settings]
+
+    def document_elems(self):
+        documents = FBXElem('Documents')
+        documents.add('Count', 1)
+        self.next_id += 1
+        document = documents.add('Document')
+        document.add_int64(self.next_id)
+        document.add_string('')
+        document.add_string('Scene')
+        active = self.stacks[0][0] if self.stacks else ''
+        properties70(document, [
+            ('SourceObject', 'object', '', ''),
+            ('ActiveAnimStackName', 'KString', '', '', active),
+        ])
+        document.add('RootNode').add_int64(0)
+
+        references = FBXElem('References')
+
+        definitions = FBXElem('Definitions')
+        definitions.add('Version', 100)
+        definitions.add('Count', sum(self.counts.values()))
+        for kind in sorted(self.counts):
+            object_type = definitions.add('ObjectType', kind)
+            object_type.add('Count', self.counts[kind])
+        return [documents, references, definitions]
+
+    def takes_elem(self):
+        takes = FBXElem('Takes')
+        takes.add('Current', self.stacks[0][0] if self.stacks else '')
+        for name, stop in self.stacks:
+            take = takes.add('Take', name)
+            take.add('FileName', f'{name}.tak')
+            for key in ('LocalTime', 'ReferenceTime'):
+                span = take.add(key)
+                span.add_int64(0)
+                span.add_int64(stop)
+        return takes
+
+    def write(self, filepath, creator='rmb_rab_converter'):
+        elems = self.header_elems(creator) + self.document_elems() + [self.objects, self.connections, self.takes_elem()]
+        write_fbx(filepath, elems)
+
+
+def write_model_fbx(filepath, model, bones, actions=()):
+    """Write the skeleton, meshes and materials of `model` plus an animation stack per NativeAction"""
+    output_dir = os.path.dirname(filepath)
+    writer = FBXSceneWriter(actions[0].fps if actions else RAB_FPS)
+    bone_ids = writer.add_skeleton(bones)
+    by_name = {}
+    for bone in bones:
+        by_name.setdefault(bone.name, bone)
+
+    pose_nodes = [(bone_ids[bone.index], bone.matrix) for bone in bones]
+    for mesh in model.meshes:
+        parent_bone = by_name.get(mesh.parent_bone)
+        # meshes are bound to their parent bone, the vertices stay in mesh space
+        mesh_matrix = parent_bone.matrix if parent_bone is not None else IDENTITY
+
+        geometry_id = writer.add_geometry(mesh)
+        model_id = writer.add_model(mesh.name, 'Mesh', mesh_matrix)
+        writer.connect(geometry_id, model_id)
+
+        texture = model.textures[mesh.texture_index] if mesh.texture_index < len(model.textures) else None
+        writer.connect(writer.add_material(mesh, texture, output_dir), model_id)
+
+        clusters = skin_clusters(mesh, bones, parent_bone)
+        if clusters:
+            writer.add_skin(mesh, geometry_id, mesh_matrix, bones, bone_ids, clusters)
+        pose_nodes.append((model_id, mesh_matrix))
+
+    writer.add_bind_pose(model.name, pose_nodes)
+    for action in actions:
+        writer.add_action(action, bone_ids)
+    writer.write(filepath)
+
+def export_native(rmb_file, rab_files, output, write_model, ext, all_in_one=False, mesh_only=False):
+    """Convert a model without Blender with `write_model(filepath, model, bones, actions)`, returns the written file paths.
+
+    Writes <output>/<rmb>/<rmb><ext> with the mesh and skeleton, then <rab><ext> per
+    action or <rmb>_all<ext> with every action, the same files as the Blender backend."""
+    # with numpy the vertex, skin and index streams are views into the mapped file or sidecar
+    model = model_cache.load_rmb(rmb_file)
+    bones = build_skeleton(model)
+
+    output_dir = os.path.join(output, model.name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    mesh_path = os.path.join(output_dir, f"{model.name}{ext}")
+    write_model(mesh_path, model, bones, [])
+    written = [mesh_path]
+    if mesh_only or not rab_files:
+        return written
+
+    actions = []
+    for rab_file in rab_files:
+        action = build_action(model_cache.load_rab(rab_file), bones)
+        if all_in_one:
+            actions.append(action)
+            continue
+
+        rab_name = os.path.splitext(os.path.basename(rab_file))[0]
+        filepath = os.path.join(output_dir, f"{rab_name}{ext}")
+        write_model(filepath, model, bones, [action])
+        written.append(filepath)
+
+    if all_in_one:
+        filepath = os.path.join(output_dir, f"{model.name}_all{ext}")
+        write_model(filepath, model, bones, actions)
+        written.append(filepath)
+
+    return written
+
+def export_native_fbx(rmb_file, rab_files, output, all_in_one=False, mesh_only=False):
+    """Convert a model to binary FBX without Blender, returns the written file paths"""
+    return export_native(rmb_file, rab_files, output, write_model_fbx, '.fbx', all_in_one, mesh_only)
@@ -0,0 +1,66 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Structured progress/error events printed by the Blender scripts for the converter
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+#
+# One event per stdout line: EVENT_PREFIX followed by a JSON object with an "event" key.
+#   stage  {"stage", "file"}    a stage of the script started (import, materials, export, save)
+#   saved  {"file"}             an output file was written
+#   error  {"message", "file"}  a stage failed, the output of that stage is missing
+
+
+import json
+import sys
+
+
+EVENT_PREFIX = 'CONVERTER_EVENT '
+
+EVENT_STAGE = 'stage'
+EVENT_SAVED = 'saved'
+EVENT_ERROR = 'error'
+
+
+def emit(event, **fields):
+	"""Print one event line and flush, so the converter sees it while the script is running"""
+	fields['event'] = event
+	sys.stdout.write(EVENT_PREFIX + json.dumps(fields) + '\n')
+	sys.stdout.flush()
+
+def stage(name, filepath=None):
+	emit(EVENT_STAGE, stage=name, file=filepath)
+
+def saved(filepath):
+	emit(EVENT_SAVED, file=filepath)
+
+def error(message, filepath=None):
+	emit(EVENT_ERROR, message=message, file=filepath)
+
+def parse(line):
+	"""Event dict of an event line, None for any other output"""
+	if not line.startswith(EVENT_PREFIX):
+		return None
+
+	try:
+		event = json.loads(line[len(EVENT_PREFIX):])
+	except ValueError:
+		return None
+	if not isinstance(event, dict) or 'event' not in event:
+		return None
+	return event
@@ -0,0 +1,160 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Fixed size record layouts of the RMB (mesh) and RAB (animation) formats
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+
+
+import re
+import struct
+
+
+def cstring(data):
+	"""Decode a NUL terminated byte string, bytes outside of ASCII are dropped"""
+	end = data.find(b'\x00')
+	if end != -1:
+		data = data[:end]
+	return data.decode('ascii', 'ignore')
+
+
+class Layout():
+	"""Little endian fixed size record compiled once into a struct.Struct.
+
+	`fields` is a list of (name, format) pairs, name None marks padding/unknown bytes
+	(use the 'x' format for those so no value is produced). Fields with a repeat
+	count ('16f') are returned as tuples, 's' fields as decoded C strings."""
+	def __init__(self, name, fields):
+		self.name = name
+		self.fields = []
+
+		fmt = '<'
+		index = 0
+		for field_name, field_fmt in fields:
+			fmt += field_fmt
+			count, code = re.match(r'^(\d*)([a-zA-Z?])$', field_fmt).groups()
+			count = int(count) if count else 1
+			if code == 'x':
+				continue
+
+			width = 1 if code == 's' else count
+			self.fields.append((field_name, index, width, code == 's', count > 1 and code != 's'))
+			index += width
+
+		self.struct = struct.Struct(fmt)
+		self.size = self.struct.size
+
+	def decode(self, values):
+		record = {}
+		for name, index, width, is_string, is_tuple in self.fields:
+			if is_string:
+				record[name] = cstring(values[index])
+			elif is_tuple:
+				record[name] = values[index:index + width]
+			else:
+				record[name] = values[index]
+		return record
+
+	def pack(self, record):
+		"""Encode a record dict, the inverse of decode (strings are NUL padded, missing fields are 0)"""
+		values = []
+		for name, index, width, is_string, is_tuple in self.fields:
+			value = record.get(name)
+			if is_string:
+				value = value or b''
+				values.append(value if isinstance(value, bytes) else value.encode('ascii'))
+			elif is_tuple:
+				values.extend(value if value is not None else [0] * width)
+			else:
+				values.append(value or 0)
+		return self.struct.pack(*values)
+
+	def unpack_from(self, buffer, offset=0):
+		return self.decode(self.struct.unpack_from(buffer, offset))
+
+	def unpack_array(self, buffer, offset, count):
+		"""Decode `count` consecutive records starting at `offset`"""
+		if count <= 0:
+			return []
+
+		if hasattr(self.struct, 'iter_unpack'):
+			data = memoryview(buffer)[offset:offset + self.size * count]
+			return [self.decode(values) for values in self.struct.iter_unpack(data)]
+
+		records = []
+		for i in range(count):
+			records.append(self.unpack_from(buffer, offset + i * self.size))
+		return records
+
+
+# RMB mesh file: header, textures, mesh descriptors, bones, then the vertex payload of every mesh
+RMB_HEADER = Layout('rmb_header', [            # 36 bytes
+	('item_flag', 'i'),
+	(None, '16x'),                              # unknown
+	('texture_count', 'i'),
+	('mesh_count', 'i'),
+	('bone_count', 'i'),
+	('data_offset', 'i'),
+])
+
+RMB_TEXTURE = Layout('rmb_texture', [          # 260 bytes
+	('name', '260s'),
+])
+
+RMB_MESH = Layout('rmb_mesh', [                # 2156 bytes
+	('index', 'i'),
+	(None, '4x'),                               # unknown
+	('name', '64s'),
+	('parent_bone', '64s'),
+	('has_armature', 'i'),
+	('texture_index', 'i'),
+	('bone_map_count', 'i'),
+	('vertices_count', 'i'),
+	('indices_count', 'i'),
+	(None, '2000x'),                            # unknown
+])
+
+RMB_BONE = Layout('rmb_bone', [                # 412 bytes
+	('id', 'i'),
+	('parent_id', 'i'),
+	(None, '84x'),                              # unknown
+	('name', '64s'),
+	('parent_name', '64s'),
+	('matrix1', '16f'),
+	('matrix2', '16f'),
+	('matrix3', '16f'),                         # inverted bind matrix
+])
+
+# RAB animation file: header, bone table, then the key tables of every bone
+RAB_HEADER = Layout('rab_header', [            # 36 bytes
+	('x1', 'i'),                                # always 2
+	('x2', 'i'),                                # always 0
+	('x3', 'i'),                                # varies from 0 to ~1920
+	('x4', 'i'),                                # always 30 (6 for m10053)
+	('ticks_per_frame', 'i'),                   # always 160 (800 for m10053)
+	('x6', 'i'),                                # always 0
+	('x7', 'i'),                                # always 0
+	('bones_count', 'i'),
+	('x9', 'i'),                                # unknown
+])
+
+RAB_BONE = Layout('rab_bone', [                # 72 bytes
+	('name', '64s'),
+	('rot_frame_count', 'i'),
+	('pos_frame_count', 'i'),
+])
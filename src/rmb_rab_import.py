@@ -28,105 +28,17 @@ Tooltip: 'Import .rmb/.rab/.txt files'
 
 
 import random
-import struct
 import os
+from array import array
 import Blender
 import bpy
 # from Blender import Scene, Mesh, Window, sys
 from Blender.Mathutils import Matrix, Vector, TranslationMatrix, Quaternion
+from rmb_rab_parser import BinaryReader, Vectors, parse_rmb, parse_rab, split_triangles
+import model_cache
+import stage_timer
 
 
-class BinaryReader():
-	def __init__(self, file):
-		self.inputFile = file
-		self.endian = '<'
-		self.mode = self.inputFile.mode if hasattr(self.inputFile, 'mode') else None
-
-	def dirname(self):
-		return os.path.dirname(self.inputFile.name)
-
-	def tell(self):
-		val = self.inputFile.tell()
-		return val
-
-	def size(self):
-		back = self.inputFile.tell()
-		self.inputFile.seek(0, 2)
-		tell = self.inputFile.tell()
-		self.inputFile.seek(back)
-		return tell
-			
-	def tell(self):
-		val = self.inputFile.tell()
-		return val
-
-	def read_uint8(self):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(1)
-		data = struct.unpack(self.endian+'B', data)[0]
-		return data
-
-	def read_uint16(self):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(2)
-		data = struct.unpack(self.endian+'H', data)[0]
-		return data
-
-	def read_int32(self):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(4)
-		data = struct.unpack(self.endian+'i', data)[0]
-		return data
-
-	def read_float32(self):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(4)
-		data = struct.unpack(self.endian+'f', data)[0]
-		return data
-
-	def read_string(self, limit=1000):
-		if self.mode != 'rb':
-			return None
-		
-		completed = False
-		data = ''
-		for i in range(limit):
-			char = struct.unpack('c', self.inputFile.read(1))[0]
-			if char == b'\x00' or completed == True:
-				completed = True
-				continue # not break to set cursor to right position
-
-			try:
-				data += char.decode('utf-8')
-			except UnicodeDecodeError:
-				pass
-
-		return data
-
-	def read_matrix4x4(self):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(16*4)
-		data = struct.unpack(self.endian+16*'f', data)
-
-		return list(data)
-
-	def read_unknown(self, count):
-		if self.mode != 'rb':
-			return None
-		
-		data = self.inputFile.read(count)
-		return data
-
 class Utils():
 	@staticmethod
 	def Matrix4x4(data):
@@ -150,6 +62,12 @@ class Utils():
 	def VectorMatrix(vector):
 		return TranslationMatrix(Vector(vector))
 	
+	@staticmethod
+	def RedrawAll():
+		# there is no window to redraw in background (-b) runs
+		if Blender.mode != 'background':
+			Blender.Window.RedrawAll()
+
 	@staticmethod
 	def QuatMatrix(quat):
 		return Quaternion(quat[3], quat[0], quat[1], quat[2]).toMatrix()	
@@ -161,7 +79,13 @@ class DDSTexture():
 		self.specular = specular
 		self.normal = normal
 
-class RMBMesh():
+class RMBMesh(object):
+	# vertex data are the typed arrays/Vectors of the parser, no per vertex objects
+	__slots__ = ('name', 'parent_bone', 'mesh', 'object', 'has_armature', 'texture_index', 'bone_map_count',
+		'vertices_count', 'indices_count', 'indice_list', 'vert_pos_list', 'vert_norm_list', 'vert_uv_list',
+		'face_uv_list', 'skin_list', 'skin_weight_list', 'skin_indice_list', 'skin_id_list', 'bone_name_list',
+		'BINDSKELETON', 'material_list', 'material_id_list', 'face_list', 'matrix', 'triangle_list')
+
 	def __init__(self):
 		self.name = None
 		self.parent_bone = None
@@ -180,7 +104,7 @@ class RMBMesh():
 		self.skin_list = []
 		self.skin_weight_list = []
 		self.skin_indice_list = []
-		self.skin_id_list = []
+		self.skin_id_list = array('H')
 		self.bone_name_list = []
 		self.BINDSKELETON = None
 		self.material_list = []
@@ -189,46 +113,44 @@ class RMBMesh():
 		self.matrix = None
 		self.triangle_list = []
 
-	def indices_to_triangles(self, indices_list, material_id):
-		for m in range(0, len(indices_list), 3):
-			self.triangle_list.append(indices_list[m:m+3])
-			self.material_id_list.append(material_id)
+	def indices_to_triangles(self, indices_list, ranges):
+		triangles, material_ids = split_triangles(indices_list, ranges)
+		if len(self.triangle_list) == 0:
+			self.triangle_list = triangles
+			self.material_id_list = material_ids
+		else:
+			self.triangle_list = list(self.triangle_list) + list(triangles)
+			self.material_id_list = list(self.material_id_list) + list(material_ids)
 
 	def add_faces(self):
 		if len(self.material_list) == 0:
 			if len(self.face_list) != 0:
 				self.triangle_list = self.face_list
 			if len(self.indice_list) != 0:
-				self.indices_to_triangles(self.indice_list, 0)
+				self.indices_to_triangles(self.indice_list, [(0, len(self.indice_list))])
 		else:
+			for material in self.material_list:
+				if material.id_start == None:
+					material.id_start = 0
+
 			if len(self.face_list) > 0:
 				if len(self.material_id_list) == 0:
 					for material_id in range(len(self.material_list)):
-						material = self.material_list[material_id] 
-						if material.id_start is not None and material.id_count is not None:
-							for face_id in range(material.id_count):
-								self.triangle_list.append(self.face_list[material.id_start+face_id])
-								self.material_id_list.append(material_id)
-						else:
-							if material.id_start == None:
-								material.id_start = 0
-							if material.id_count == None:
-								material.id_count = len(self.face_list)
-							for face_id in range(material.id_count):
-								self.triangle_list.append(self.face_list[material.id_start+face_id])
-								self.material_id_list.append(material_id)		
-				else:			
+						material = self.material_list[material_id]
+						if material.id_count == None:
+							material.id_count = len(self.face_list)
+						self.triangle_list.extend(self.face_list[material.id_start:material.id_start+material.id_count])
+						self.material_id_list.extend([material_id] * material.id_count)
+				else:
 					self.triangle_list = self.face_list
-						
-			if len(self.indice_list)>0:
-				for material_id in range(len(self.material_list)):
-					material = self.material_list[material_id] 
-					if material.id_start == None:
-						material.id_start = 0
+
+			if len(self.indice_list) > 0:
+				ranges = []
+				for material in self.material_list:
 					if material.id_count == None:
 						material.id_count = len(self.indice_list)
-					indice_list = self.indice_list[material.id_start:material.id_start+material.id_count]
-					self.indices_to_triangles(indice_list, material_id)
+					ranges.append((material.id_start, material.id_count))
+				self.indices_to_triangles(self.indice_list, ranges)
 
 	def add_skin_id_list(self):
 		if len(self.skin_id_list) == 0:
@@ -238,12 +160,12 @@ class RMBMesh():
 					skin.id_start = 0
 				if skin.id_count == None:
 					skin.id_count = len(self.skin_indice_list)
-				for vert_id in range(skin.id_count):
-					self.skin_id_list.append(skin_id)
+				self.skin_id_list.extend(array('H', [skin_id]) * skin.id_count)
 
 	def add_mesh(self):
 		self.mesh = bpy.data.meshes.new(self.name)
-		self.mesh.verts.extend(self.vert_pos_list)
+		# Blender takes a list of coordinate tuples, built only for this call
+		self.mesh.verts.extend(list(self.vert_pos_list))
 		if len(self.vert_norm_list) > 0:
 			for i,vert in enumerate(self.mesh.verts):
 				vert.no = Vector(self.vert_norm_list[i])
@@ -289,34 +211,61 @@ class RMBMesh():
 		else:
 			print('WARNING: No faces to add UV')
 
+	def get_group_name(self, skin_id, gr_id):
+		bone_map = self.skin_list[skin_id].bone_map
+		if len(self.bone_name_list) == 0:
+			if len(bone_map) > 0:
+				return str(bone_map[gr_id])
+			return str(gr_id)
+
+		if len(bone_map) > 0:
+			return self.bone_name_list[bone_map[gr_id]]
+		return self.bone_name_list[gr_id]
+
 	def add_skin(self, blendMesh, mesh):
+		# vertices are bucketed by (group, weight) so every bucket is a single Blender call
+		group_names = {}
+		buckets = {}
+		bucket_keys = []
+
 		for vert_id in range(len(mesh.skin_id_list)):
 			indices = mesh.skin_indice_list[vert_id]
 			weights = mesh.skin_weight_list[vert_id]
 			skin_id = mesh.skin_id_list[vert_id]
-			
+
+			# a later influence of the same group replaces the earlier one
+			vert_groups = {}
+			vert_group_order = []
 			for n in range(len(indices)):
 				w  = weights[n]
 				if type(w) == int:
 					w = w / 255.0
 
 				if w != 0:
-					gr_id = indices[n]
-					if len(self.bone_name_list) == 0:
-						if len(self.skin_list[skin_id].bone_map) > 0:
-							gr_name = str(self.skin_list[skin_id].bone_map[gr_id])
-						else:	
-							gr_name = str(gr_id)
-					else:	
-						if len(self.skin_list[skin_id].bone_map) > 0:
-							gr_name_id = self.skin_list[skin_id].bone_map[gr_id]
-							gr_name = self.bone_name_list[gr_name_id]
-						else:	
-							gr_name = self.bone_name_list[gr_id]
-
-					if gr_name not in blendMesh.getVertGroupNames():
-						blendMesh.addVertGroup(gr_name)
-					blendMesh.assignVertsToGroup(gr_name, [vert_id], w, 1)
+					key = (skin_id, indices[n])
+					gr_name = group_names.get(key)
+					if gr_name is None:
+						gr_name = self.get_group_name(skin_id, indices[n])
+						group_names[key] = gr_name
+
+					if gr_name not in vert_groups:
+						vert_group_order.append(gr_name)
+					vert_groups[gr_name] = w
+
+			for gr_name in vert_group_order:
+				key = (gr_name, vert_groups[gr_name])
+				if key not in buckets:
+					buckets[key] = []
+					bucket_keys.append(key)
+				buckets[key].append(vert_id)
+
+		groups = set(blendMesh.getVertGroupNames())
+		for key in bucket_keys:
+			gr_name, w = key
+			if gr_name not in groups:
+				blendMesh.addVertGroup(gr_name)
+				groups.add(gr_name)
+			blendMesh.assignVertsToGroup(gr_name, buckets[key], w, 1)
 
 		blendMesh.update()
 
@@ -351,7 +300,7 @@ class RMBMesh():
 				vert.co = vector
 				
 			blendMesh.update()
-			Blender.Window.RedrawAll()
+			Utils.RedrawAll()
 
 	def add_material(self, material, mesh, material_id):
 		if material.name is None:
@@ -423,35 +372,38 @@ class RMBMesh():
 		mesh.update()
 
 	def draw(self):
-		self.add_faces()
-		self.add_skin_id_list()
+		with stage_timer.stage('mesh'):
+			self.add_faces()
+			self.add_skin_id_list()
 
-		self.add_mesh()
+			self.add_mesh()
 
-		if len(self.triangle_list) > 0:	
-			if len(self.vert_uv_list) > 0:
-				self.add_vertex_uv(self.mesh,self)
+			if len(self.triangle_list) > 0:	
+				if len(self.vert_uv_list) > 0:
+					self.add_vertex_uv(self.mesh,self)
 		
-		self.add_face_uv(self.mesh, self)
-		for material_id in range(len(self.material_list)):
-			material = self.material_list[material_id]
-			self.add_material(material, self.mesh, material_id)
+			self.add_face_uv(self.mesh, self)
+			for material_id in range(len(self.material_list)):
+				material = self.material_list[material_id]
+				self.add_material(material, self.mesh, material_id)
 			
-		if self.BINDSKELETON is not None:
-			scene = bpy.data.scenes.active
-			for object in scene.objects:
-				if object.name == self.BINDSKELETON:
-					skeleton_matrix = self.object.getMatrix() * object.mat
-					#self.object.setMatrix(skeletonMatrix)
-					object.makeParentDeform([self.object], 1, 0)
-
-		self.add_skin(self.mesh, self)
+			if self.BINDSKELETON is not None:
+				scene = bpy.data.scenes.active
+				for object in scene.objects:
+					if object.name == self.BINDSKELETON:
+						skeleton_matrix = self.object.getMatrix() * object.mat
+						#self.object.setMatrix(skeletonMatrix)
+						object.makeParentDeform([self.object], 1, 0)
+
+		with stage_timer.stage('skin'):
+			self.add_skin(self.mesh, self)
 		
-		if self.matrix is not None:
-			self.object.setMatrix(self.matrix * self.object.matrixWorld)
-			
-		self.add_bind_pose(self.mesh, self)
-		Blender.Window.RedrawAll()
+		with stage_timer.stage('bind_pose'):
+			if self.matrix is not None:
+				self.object.setMatrix(self.matrix * self.object.matrixWorld)
+				
+			self.add_bind_pose(self.mesh, self)
+			Utils.RedrawAll()
 
 class RMBSkeleton:
 	def __init__(self):
@@ -571,7 +523,7 @@ class RMBSkeleton:
 				print('WARNINIG: rotMatrix or posMatrix or matrix is None')
 							
 		self.armature.update()
-		Blender.Window.RedrawAll()
+		Utils.RedrawAll()
 
 	def draw(self): 
 		self.check()
@@ -581,7 +533,9 @@ class RMBSkeleton:
 			self.create_bone_connection()
 			self.create_bone_position()	
 
-class RMBBone:
+class RMBBone(object):
+	__slots__ = ('id', 'name', 'parent_id', 'parent_name', 'quat', 'pos', 'matrix', 'pos_matrix', 'rot_matrix', 'scale_matrix', 'children', 'edit')
+
 	def __init__(self):
 		self.id = None
 		self.name = None
@@ -596,7 +550,9 @@ class RMBBone:
 		self.children = []
 		self.edit = None
 
-class RMBSkin:
+class RMBSkin(object):
+	__slots__ = ('bone_map', 'id_start', 'id_count', 'skeleton', 'skeleton_file')
+
 	def __init__(self):
 		self.bone_map = []
 		self.id_start = None
@@ -604,7 +560,17 @@ class RMBSkin:
 		self.skeleton = None
 		self.skeleton_file = None
 
-class RMBMaterial():
+class RMBMaterial(object):
+	__slots__ = ('name', 'diffuse', 'specular', 'normal', 'id_start', 'id_count', 'rgba')
+
+	# texture slots and normal map settings, the same for every material
+	DIFFUSESLOT = 0
+	NORMALSLOT = 1
+	SPECULARSLOT = 2
+	NORMALSTRONG = 0.5
+	NORMALDIRECTION = 1
+	NORMALSIZE = (1,1,1)
+
 	def __init__(self):
 		self.name = None
 		self.diffuse = None
@@ -616,14 +582,10 @@ class RMBMaterial():
 		g = random.randint(0, 255)
 		b = random.randint(0, 255)
 		self.rgba = [r / 255.0, g / 255.0, b / 255.0, 1.0]
-		self.DIFFUSESLOT = 0
-		self.NORMALSLOT = 1
-		self.SPECULARSLOT = 2
-		self.NORMALSTRONG = 0.5
-		self.NORMALDIRECTION = 1
-		self.NORMALSIZE = (1,1,1)
-
-class RABAction:
+
+class RABAction(object):
+	__slots__ = ('frame_count', 'name', 'skeleton', 'bone_list', 'ARMATURESPACE', 'BONESPACE', 'FRAMESORT', 'BONESORT', 'BATCHKEYS')
+
 	def __init__(self):
 		self.frame_count = None
 		self.name = 'action'
@@ -633,6 +595,7 @@ class RABAction:
 		self.BONESPACE = False
 		self.FRAMESORT = False
 		self.BONESORT = False
+		self.BATCHKEYS = True
 
 	def set_context(self):
 		scn = Blender.Scene.GetCurrent()
@@ -655,61 +618,127 @@ class RABAction:
 			pose = skeleton.getPose()
 			action = Blender.Armature.NLA.NewAction(self.name)
 			action.setActive(skeleton)
+
+			if self.BATCHKEYS:
+				time_list = self.insert_keys_batched(skeleton, pose)
+			else:
+				time_list = self.insert_keys(skeleton, pose)
+
+			if len(time_list) > 0:	
+				self.frame_count = max(time_list)
+
+	def insert_keys(self, skeleton, pose):
+		time_list=[]
+		
+		for m in range(len(self.bone_list)):
+			actionbone = self.bone_list[m]
+			name = actionbone.name
+			pbone = pose.bones[name]
+			Utils.RedrawAll()
 			
-			time_list=[]
-			
-			for m in range(len(self.bone_list)):
-				actionbone = self.bone_list[m]
-				name = actionbone.name
-				pbone = pose.bones[name]
-				Blender.Window.RedrawAll()
+			if pbone is not None:
+				pbone.insertKey(skeleton, 0, [Blender.Object.Pose.ROT, Blender.Object.Pose.LOC], True)
+				pose.update()
 				
-				if pbone is not None:
-					pbone.insertKey(skeleton, 0, [Blender.Object.Pose.ROT, Blender.Object.Pose.LOC], True)
-					pose.update()
+				# position keys
+				for n in range(len(actionbone.pos_frame_list)):
+					frame = actionbone.pos_frame_list[n]
+					time_list.append(frame)
+					bonematrix = actionbone.pos_matrix(n)
 					
-					# position keys
-					for n in range(len(actionbone.pos_frame_list)):
-						frame = actionbone.pos_frame_list[n]
-						time_list.append(frame)
-						poskey = actionbone.pos_key_list[n]
-						bonematrix = poskey
-						
-						if pbone.parent:		
-							pbone.poseMatrix = bonematrix * pbone.parent.poseMatrix
-						else:
-							pbone.poseMatrix = bonematrix
-						
-						pbone.insertKey(skeleton, 1+frame, [Blender.Object.Pose.LOC], True)
-						pose.update()	
-							
-					# rotation keys
-					for n in range(len(actionbone.rot_frame_list)):
-						frame = actionbone.rot_frame_list[n]
-						time_list.append(frame)
-						rotkey = actionbone.rot_key_list[n]
-						bonematrix = rotkey
-
-						if pbone.parent:		
-							pbone.poseMatrix = bonematrix * pbone.parent.poseMatrix
-						else:
-							pbone.poseMatrix = bonematrix
-
-						pbone.insertKey(skeleton, 1+frame, [Blender.Object.Pose.ROT], True)
-						pose.update()
+					if pbone.parent:		
+						pbone.poseMatrix = bonematrix * pbone.parent.poseMatrix
+					else:
+						pbone.poseMatrix = bonematrix
+					
+					pbone.insertKey(skeleton, 1+frame, [Blender.Object.Pose.LOC], True)
+					pose.update()	
 						
-			if len(time_list) > 0:	
-				self.frame_count = max(time_list)
+				# rotation keys
+				for n in range(len(actionbone.rot_frame_list)):
+					frame = actionbone.rot_frame_list[n]
+					time_list.append(frame)
+					bonematrix = actionbone.rot_matrix(n)
+
+					if pbone.parent:		
+						pbone.poseMatrix = bonematrix * pbone.parent.poseMatrix
+					else:
+						pbone.poseMatrix = bonematrix
+
+					pbone.insertKey(skeleton, 1+frame, [Blender.Object.Pose.ROT], True)
+					pose.update()
+
+		return time_list
+
+	def insert_keys_batched(self, skeleton, pose):
+		# merge the position and rotation timelines of every bone and key frame by frame,
+		# so the pose is evaluated once per frame instead of once per key
+		ROT = Blender.Object.Pose.ROT
+		LOC = Blender.Object.Pose.LOC
+
+		time_list = []
+		timeline = {}
+		for actionbone in self.bone_list:
+			pbone = pose.bones[actionbone.name]
+			if pbone is None:
+				continue
+
+			pbone.insertKey(skeleton, 0, [ROT, LOC], True)
+
+			# frame -> [position key index, rotation key index], a later key of the same frame wins,
+			# the key matrices are built when their frame is keyed
+			bone_keys = {}
+			for n in range(len(actionbone.pos_frame_list)):
+				frame = actionbone.pos_frame_list[n]
+				time_list.append(frame)
+				bone_keys.setdefault(frame, [None, None])[0] = n
+
+			for n in range(len(actionbone.rot_frame_list)):
+				frame = actionbone.rot_frame_list[n]
+				time_list.append(frame)
+				bone_keys.setdefault(frame, [None, None])[1] = n
+
+			for frame, keys in bone_keys.items():
+				timeline.setdefault(frame, []).append((pbone, actionbone, keys[0], keys[1]))
+
+		pose.update()
+
+		for frame in sorted(timeline.keys()):
+			for pbone, actionbone, pos_id, rot_id in timeline[frame]:
+				if pos_id is not None and rot_id is not None:
+					# rotation and translation keys share the frame
+					bonematrix = actionbone.rot_matrix(rot_id) * actionbone.pos_matrix(pos_id)
+					key_types = [ROT, LOC]
+				elif pos_id is not None:
+					bonematrix = actionbone.pos_matrix(pos_id)
+					key_types = [LOC]
+				else:
+					bonematrix = actionbone.rot_matrix(rot_id)
+					key_types = [ROT]
+
+				if pbone.parent:
+					pbone.poseMatrix = bonematrix * pbone.parent.poseMatrix
+				else:
+					pbone.poseMatrix = bonematrix
+
+				pbone.insertKey(skeleton, 1+frame, key_types, True)
+
+			pose.update()
+
+		return time_list
+
+class RABActionBone(object):
+	__slots__ = ('name', 'pos_frame_count', 'pos_frames', 'pos_frame_list', 'pos_key_list',
+		'rot_frame_count', 'rot_frames', 'rot_frame_list', 'rot_key_list', 'matrix_frame_list', 'matrix_key_list')
 
-class RABActionBone:
 	def	__init__(self):
 		self.name = None
-		# position keys
+		# position keys, (x, y, z) per key
 		self.pos_frame_count = 0
 		self.pos_frames = []
 		self.pos_frame_list = []
 		self.pos_key_list = []
-		# rotation keys
+		# rotation keys, accumulated (x, y, z, w) quaternion per key
 		self.rot_frame_count = 0
 		self.rot_frames = []
 		self.rot_frame_list = []
@@ -718,6 +747,12 @@ class RABActionBone:
 		self.matrix_frame_list = []
 		self.matrix_key_list = []
 
+	def pos_matrix(self, n):
+		return Utils.VectorMatrix(self.pos_key_list[n])
+
+	def rot_matrix(self, n):
+		return Utils.QuatMatrix(self.rot_key_list[n]).resize4x4().invert()
+
 
 class ImportRMB():
 	def __init__(self, filepath):
@@ -725,229 +760,69 @@ class ImportRMB():
 		self.filename = os.path.basename(filepath)
 		self.filename, self.ext = os.path.splitext(self.filename)
 
-	def get_specific_texture(self, base_name, tex_type):
-		filename = base_name.split('.')[0]
-		ext = base_name.split('.')[-1]
-		filename = filename + tex_type + '.' + ext
-
-		if os.path.exists(filename):
-			return filename
-		else:
-			print('\tTexture not found: {0}'.format(filename), 'WARNING')
-			return None
-
-	def parse(self, reader):
-		# header - 36 bytes
-		item_flag = reader.read_int32()         # 4 bytes item flag
-		reader.read_unknown(count=16)           # unknown 16 bytes offset             
-		texture_count = reader.read_int32()     # texture count
-		mesh_count = reader.read_int32()        # mesh count
-		bone_count = reader.read_int32()        # bone count
-		data_offset = reader.read_int32()       # data offset
-
-		# print("item_flag: ", item_flag)
-		# print("texture_count: ", texture_count)
-		# print("mesh_count: ", mesh_count)
-		# print("bone_count: ", bone_count)
-
-		# texture path
-		# prefs = bpy.context.preferences.addons[__package__].preferences
-		# texture_path = prefs.tex_filepath
-		texture_path = None # "E:\\map_zone\\models\\texture"
-	
-		if texture_path is not None and os.path.exists(texture_path):
-			texDir = texture_path
-		else:
-			# find texture path in the same directory as the model
-			texDir = os.path.join(reader.dirname(), 'texture')
-			if os.path.exists(texDir) == False:
-				# find texture path in the parent directory
-				texDir = reader.dirname().split('model')[0]+'texture'
-				if os.path.exists(texDir) == False:
-					texDir = reader.dirname()
-
-		textures = []
-		# print('Textures: {0}'.format(texture_count))
-		for a in range(texture_count):
-			texture = DDSTexture() 
-			texname = reader.read_string(limit=260)          # 260 bytes texture name
-
-			texpath = os.path.join(texDir, texname)
-			texture.diffuse = texpath
-			
-			# print('\tTexture: {0} {1}'.format(a, texname))
-			# print('\t\tDiffuse: {0}'.format(texpath))
-
-			# get specular texture
-			specular = self.get_specific_texture(os.path.join(texDir, texname), '_sp')
-			if specular is not None:
-				texture.specular = specular
-				# print('\t\tSpecular: {0}'.format(specular))
-
-			# get normal texture
-			normal = self.get_specific_texture(os.path.join(texDir, texname), '_n')
-			if normal is not None:
-				texture.normal = normal
-				# print('\t\tNormal: {0}'.format(normal))
-
-			textures.append(texture)
-
-		meshes = []	
-		for a in range(mesh_count):
-			mesh = RMBMesh()	
-			
-			index = reader.read_int32()                     # 4 bytes index
-			m_unknown = reader.read_unknown(count=4)        # unknown 4 bytes offset
-			
-			mesh.name = reader.read_string(limit=64)        # 64 bytes mesh name
-			mesh.parent_bone = reader.read_string(limit=64)  # 64 bytes parent bone name
-
-			# print('\tMesh: {0}'.format(index))
-			# print('\t\tName: {0}'.format(mesh.name))
-			# print('\t\tParent bone: {0}'.format(mesh.parent_bone))
-
-			mesh.has_armature = reader.read_int32() != 0     # rigged 4 bytes
-			mesh.texture_index = reader.read_int32()         # texture index 4 bytes
-			mesh.bone_map_count = reader.read_int32()         # boneMapCount 4 bytes
-			mesh.vertices_count = reader.read_int32()        # vertexCount 4 bytes
-			mesh.indices_count = reader.read_int32()         # indicesCount 4 bytes
-
-			# print('\t\tHasArmature: {0}'.format(mesh.has_armature))
-			# print('\t\tTextureIndex: {0}'.format(mesh.texture_index))
-			# print('\t\tBoneMapCount: {0}'.format(mesh.bone_map_count))
-			# print('\t\tVertexCount: {0}'.format(mesh.vertices_count))
-			# print('\t\tIndicesCount: {0}'.format(mesh.indices_count))
-
-			# unknown data
-			reader.read_unknown(count=2000)                 # unknown 2000 bytes
-			meshes.append(mesh)
+	def parse(self, reader=None):
+		# without a reader the model comes from the pre-parsed model cache
+		with stage_timer.stage('parse_rmb', self.filepath):
+			model = parse_rmb(reader, self.filename) if reader is not None else model_cache.load_rmb(self.filepath)
 
 		# has armature
 		skeleton = RMBSkeleton()
 		skeleton.name = self.filename
 
-		# 412 bytes for each bone
-		# print('\nBones: {0}'.format(bone_count))
-		for a in range(bone_count):
-			bone = RMBBone()
-			bone.id = reader.read_int32()                               # 4 bytes ID
-			bone.parent_id = reader.read_int32()                         # 4 bytes parent ID
-
-			# print('\tBone: {0}'.format(a))
-			# print('\t\tID: {0}'.format(bone.id))
-			# print('\t\tParent ID: {0}'.format(bone.parent_id))
-
-			unk = reader.read_unknown(count=84)
-
-			bone.name = reader.read_string(limit=64)                    # 64 bytes bone name
-			# print('\t\tName: {0}'.format(bone.name))
-			
-			bone.parent_name = reader.read_string(limit=64)              # 64 bytes parent name
-			# print('\t\tParent: {0}'.format(bone.parent_name))
-			
-			m1 = Utils.Matrix4x4(reader.read_matrix4x4())                     # 16*4=64 bytes matrix
-			# print(f'    Matrix1: {m1}')
-			m2 = Utils.Matrix4x4(reader.read_matrix4x4())                     # 16*4=64 bytes matrix
-			# print(f'    Matrix2: {m2}')
-			m3 = Utils.Matrix4x4(reader.read_matrix4x4())
-			# print(f'    Matrix3: {m3}')
-			bone.matrix = m3.invert()                   				# 16*4=64 bytes matrix
-			skeleton.bone_list.append(bone)
-
-		skeleton.draw()
-
-		# print('\nMeshes: {0}'.format(mesh_count))
-		for mesh in meshes:
-			if not isinstance(mesh, RMBMesh):
-				continue
-
-			# 1 * boenMapCount - bone mapping
-			# print('Mesh: {0}, BoneMapCount: {1}, hasArmature: {2}'.format(mesh.name, mesh.bone_map_count, mesh.has_armature))
-			bone_map_list = []
-			for b in range(mesh.bone_map_count):
-				bone_map_list.append(reader.read_uint8())        # 1 bytes bone map
-			bone_map = tuple(bone_map_list)
-															
-			# vertices
-			for b in range(mesh.vertices_count):               # 12 bytes for each vertex position
-				x = reader.read_float32()                      # 4 bytes x
-				y = reader.read_float32()                      # 4 bytes y
-				z = reader.read_float32()                      # 4 bytes z
-				mesh.vert_pos_list.append((x, y, z))
-
-			# vertices normals
-			for b in range(mesh.vertices_count):                # 12 bytes for each vertex normal
-				x = reader.read_float32()                      # 4 bytes x
-				y = reader.read_float32()                      # 4 bytes y
-				z = reader.read_float32()                      # 4 bytes z
-				mesh.vert_norm_list.append((x, y, z))
-
-			# uv coordinates
-			for b in range(mesh.vertices_count):                # 8 bytes for each vertex uv
-				x = reader.read_float32()                      # 4 bytes x
-				y = reader.read_float32()                      # 4 bytes y
-				mesh.vert_uv_list.append((x, y))
-			
-			# unknown data                                     # vertexCount * 12
-			reader.read_unknown(count=mesh.vertices_count*12)   # ???
-				
-			# unknown data                                     # 26476
-			reader.read_unknown(count=mesh.vertices_count*12)   # ???
-
+		with stage_timer.stage('skeleton', self.filepath):
+			for bone_data in model.bones:
+				bone = RMBBone()
+				bone.id = bone_data.id
+				bone.parent_id = bone_data.parent_id
+				bone.name = bone_data.name
+				bone.parent_name = bone_data.parent_name
+				bone.matrix = Utils.Matrix4x4(bone_data.matrix3).invert()
+				skeleton.bone_list.append(bone)
+
+			skeleton.draw()
+
+		for mesh_data in model.meshes:
+			mesh = RMBMesh()
+			mesh.name = mesh_data.name
+			mesh.parent_bone = mesh_data.parent_bone
+			mesh.has_armature = mesh_data.has_armature
+			mesh.texture_index = mesh_data.texture_index
+			mesh.bone_map_count = mesh_data.bone_map_count
+			mesh.vertices_count = mesh_data.vertices_count
+			mesh.indices_count = mesh_data.indices_count
+			mesh.vert_pos_list = mesh_data.vert_pos_list
+			mesh.vert_norm_list = mesh_data.vert_norm_list
+			mesh.vert_uv_list = mesh_data.vert_uv_list
+			mesh.indice_list = mesh_data.indice_list
 
 			# skin setup
-			if mesh.has_armature:                               
-				for b in range(mesh.vertices_count):            # 16 bytes for each vertex skin weight
-					x = reader.read_float32()                  # 4 bytes skin weight
-					y = reader.read_float32()                  # 4 bytes skin weight
-					z = reader.read_float32()                  # 4 bytes skin weight
-					w = reader.read_float32()                  # 4 bytes skin weight
-					mesh.skin_weight_list.append((x, y, z, w))
-					
-				for b in range(mesh.vertices_count):            # 4 bytes for each vertex skin indice
-					x = reader.read_uint8()                    # 1 byte skin indice
-					y = reader.read_uint8()                    # 1 byte skin indice
-					z = reader.read_uint8()                    # 1 byte skin indice
-					w = reader.read_uint8()                    # 1 byte skin indice
-					mesh.skin_indice_list.append((x, y, z, w))
-
-				skin = RMBSkin()
-				skin.bone_map = bone_map
-
-				mesh.skin_list.append(skin)
+			skin = RMBSkin()
+			if mesh_data.skin is not None:
+				mesh.skin_weight_list = mesh_data.skin.weight_list
+				mesh.skin_indice_list = mesh_data.skin.indice_list
+				skin.bone_map = mesh_data.skin.bone_map
 				mesh.bone_name_list = skeleton.bone_name_list
 			else:
-				for b in range(mesh.vertices_count):
-					mesh.skin_weight_list.append([1.0])
-					
-				for b in range(mesh.vertices_count):
-					mesh.skin_indice_list.append([0])
-					
-				skin = RMBSkin()
+				# rigid mesh, every vertex has the parent bone at full weight
+				mesh.skin_weight_list = Vectors(array('f', [1.0]) * mesh.vertices_count, 1)
+				mesh.skin_indice_list = Vectors(array('B', [0]) * mesh.vertices_count, 1)
 				skin.bone_map = [0]
-
-				mesh.skin_list.append(skin)
 				mesh.bone_name_list = [mesh.parent_bone]
-			
-
-			# indices
-			for b in range(mesh.indices_count):
-				mesh.indice_list.append(reader.read_uint16())   # 2 bytes indice
+			mesh.skin_list.append(skin)
 
 			mesh.BINDSKELETON = skeleton.name if skeleton != None else None
 
 			material = RMBMaterial()
-			if mesh.texture_index < len(textures):
-				material.diffuse = textures[mesh.texture_index].diffuse
-				material.specular = textures[mesh.texture_index].specular
-				material.normal = textures[mesh.texture_index].normal
+			if mesh.texture_index < len(model.textures):
+				material.diffuse = model.textures[mesh.texture_index].diffuse
+				material.specular = model.textures[mesh.texture_index].specular
+				material.normal = model.textures[mesh.texture_index].normal
 			else:
 				print('WARNING: Material index out of range: {0}'.format(mesh.texture_index))
 
 			mesh.material_list.append(material)
 
 			# bind mesh matrix to bone matrix
-			# print('Mesh parentBone: {0}'.format(mesh.parent_bone))
 			if skeleton != None:
 				for bone in skeleton.bone_list:
 					if bone.name == mesh.parent_bone:
@@ -961,102 +836,43 @@ class ImportRAB():
 		self.filename = os.path.basename(filepath)
 		self.filename, self.ext = os.path.splitext(self.filename)
 
-	def parse(self, reader):
+	def parse(self, reader=None):
 		if '_' not in self.filename:
 			print('ERROR: Invalid filename: {0}'.format(self.filename))
 			return
 
-		model_name, anim_name = self.filename.split('_')
+		with stage_timer.stage('parse_rab', self.filepath):
+			action_data = parse_rab(reader, self.filename) if reader is not None else model_cache.load_rab(self.filepath)
 
 		action = RABAction()
 		action.BONESPACE = True
 		action.BONESORT = True
-		action.name = 'action_' + anim_name
-		action.skeleton = model_name
-
-		X1 = reader.read_int32()           # always 2
-		X2 = reader.read_int32()           # always 0
-		X3 = reader.read_int32()           # unknown data varies from 0 to ~1920
-		X4 = reader.read_int32()           # always 30 except for the only one model (m10053) 6
-		X5 = reader.read_int32()           # always 160 except for the only one model (m10053) 800
-		X6 = reader.read_int32()           # always 0
-		X7 = reader.read_int32()           # always 0
-		bones_count = reader.read_int32()  # bones count
-		X9 = reader.read_int32()           # ?
-
-		# print('X1: {0}'.format(X1))
-		# print('X2: {0}'.format(X2))
-		# print('X3: {0}'.format(X3))
-		# print('X4: {0}'.format(X4))
-		# print('X5: {0}'.format(X5))
-		# print('X6: {0}'.format(X6))
-		# print('X7: {0}'.format(X7))
-		# print('X8 BonesCount: {0}'.format(bones_count))
-		# print('X9: {0}'.format(X9))
-
-		bones = []
-		for i in range(bones_count):
-			bone = RABActionBone()
-			bone.name = reader.read_string(64)
-			bone.rot_frame_count = reader.read_int32()
-			bone.pos_frame_count = reader.read_int32()
-			bones.append(bone)
-
-		# 	print('Bone: {0}'.format(bone.name))
-		# 	print('\tRotFrameCount: {0}'.format(bone.rot_frame_count))
-		# 	print('\tPosFrameCount: {0}'.format(bone.pos_frame_count))
-
-		# print('Position: {0}, Offset: {1}'.format(reader.tell(), X9))
-		
-		for i in range(bones_count):
-			bone = bones[i]
-			if not isinstance(bone, RABActionBone):
-				print('ERROR: bone is not ActionBone: {0}'.format(bone))
-				continue
+		action.name = 'action_' + action_data.anim_name
+		action.skeleton = action_data.model_name
 
-			bone.pos_frames = []
-			for j in range(bone.pos_frame_count):
-				bone.pos_frames.append(reader.read_int32())
-
-			bone.rot_frames = []
-			for j in range(bone.rot_frame_count):
-				bone.rot_frames.append(reader.read_int32())
-                
-			# position keyframes
-			for j in range(bone.pos_frame_count):
-				v = bone.pos_frames[j] // 160
-				bone.pos_frame_list.append(v)
-
-				x = reader.read_float32()
-				y = reader.read_float32()
-				z = reader.read_float32()
-				matrix = Utils.VectorMatrix((x, y, z))
-				bone.pos_key_list.append(matrix)
-
-			# rotation keyframes
-			for j in range(bone.rot_frame_count):
-				v = bone.rot_frames[j] // 160
-				bone.rot_frame_list.append(v)
-
-				x = reader.read_float32()
-				y = reader.read_float32()
-				z = reader.read_float32()
-				w = reader.read_float32()
-				matrix = Utils.QuatMatrix((x, y, z, w)).resize4x4().invert()
-
-				if j == 0:
-					bone.rot_key_list.append(matrix)
-				else:
-					matrix = bone.rot_key_list[j-1] * matrix
-					bone.rot_key_list.append(matrix)
+		# key matrices of every bone
+		with stage_timer.stage('action', self.filepath):
+			for bone_data in action_data.bones:
+				bone = RABActionBone()
+				bone.name = bone_data.name
+				bone.pos_frame_count = bone_data.pos_frame_count
+				bone.pos_frames = bone_data.pos_frames
+				bone.rot_frame_count = bone_data.rot_frame_count
+				bone.rot_frames = bone_data.rot_frames
+
+				# position keyframes
+				bone.pos_frame_list = bone_data.pos_frame_list
+				bone.pos_key_list = bone_data.pos_key_list
 
-			action.bone_list.append(bone)
+				# rotation keyframes, accumulated by the parser
+				bone.rot_frame_list = bone_data.rot_frame_list
+				bone.rot_key_list = bone_data.rot_accum_list
 
-		# print('Position: {0}'.format(reader.tell()))
-		# print('Total: {0}'.format(reader.size()))
+				action.bone_list.append(bone)
 
-		action.draw()
-		action.set_context()
+		with stage_timer.stage('keys', self.filepath):
+			action.draw()
+			action.set_context()
 
 
 def save_blend(filepath):
@@ -1103,6 +919,7 @@ def txt_import(filepath):
 		save_blend(os.path.join(outputpath, os.path.splitext(rab_file)[0] + '.blend'))
 
 def rmb_rab_import(filepath):
+	"""Import a .rmb/.rab/.txt file into the current scene, returns False if it failed"""
 	filename_with_ext = os.path.basename(filepath)
 	filename, ext = os.path.splitext(filename_with_ext)
 
@@ -1115,17 +932,20 @@ def rmb_rab_import(filepath):
 	
 		if ext == ".rmb":
 			importer = ImportRMB(filepath)
-			importer.parse(reader)
+			importer.parse(None if model_cache.enabled() else reader)
 		elif ext == ".rab":
 			importer = ImportRAB(filepath)
-			importer.parse(reader)
+			importer.parse(None if model_cache.enabled() else reader)
 		elif ext == ".txt":
 			txt_import(filepath)
 	except Exception as e:
 		print('Error reading file: {0}'.format(e))
+		return False
 	finally:
 		file.close()
 
+	return True
+
 
 if __name__ == '__main__':
 	Blender.Window.FileSelector(rmb_rab_import,'Import .rmb/.rab/.txt','rmb - skinned mesh, rab - animation') 	
\ No newline at end of file
@@ -0,0 +1,720 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Blender independent parser for RMB (mesh) and RAB (animation) files
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: this module is imported by the Blender 2.49 plugin (Python 2.6),
+# so keep it free of Blender imports and of Python 3 only syntax.
+
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from rmb_rab_format import cstring, RMB_HEADER, RMB_TEXTURE, RMB_MESH, RMB_BONE, RAB_HEADER, RAB_BONE
+from texture_index import find_texture, find_texture_dir, find_specific_texture, specific_texture_name
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+try:
+	from itertools import izip
+except ImportError:
+	izip = zip
+
+
+# rab key times are stored in ticks, 160 ticks per frame
+RAB_TICKS_PER_FRAME = 160
+
+# struct format -> little endian numpy dtype
+NUMPY_DTYPES = {
+	'B': 'u1',
+	'H': '<u2',
+	'i': '<i4',
+	'f': '<f4',
+}
+
+
+def typed_array(fmt, data, big_endian=False):
+	"""array of struct format `fmt` (B, H, i, f, d) from raw bytes in file byte order"""
+	values = array(fmt)
+	if hasattr(values, 'frombytes'):
+		values.frombytes(data)
+	else:
+		values.fromstring(data)
+	if big_endian != (sys.byteorder == 'big'):
+		values.byteswap()
+	return values
+
+class Vectors(object):
+	"""Vectors of `width` values stored in one flat typed array.
+
+	Indexing and iteration give tuples like the list of tuples it replaces, at 4 bytes
+	per float instead of a tuple and a float object per value. numpy.asarray() turns it
+	into a (count, width) array without a per vector loop."""
+	__slots__ = ('data', 'width')
+
+	def __init__(self, data, width):
+		self.data = data
+		self.width = width
+
+	def __len__(self):
+		return len(self.data) // self.width
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+
+		count = len(self)
+		if index < 0:
+			index += count
+		if index < 0 or index >= count:
+			raise IndexError('vector index out of range')
+		start = index * self.width
+		return tuple(self.data[start:start + self.width])
+
+	def __iter__(self):
+		data = self.data
+		return izip(*[data[i::self.width] for i in range(self.width)])
+
+	def __array__(self, dtype=None, copy=None):
+		values = numpy.frombuffer(self.data, dtype=self.data.typecode).reshape(-1, self.width)
+		if dtype is not None:
+			return values.astype(dtype)
+		return values
+
+
+def flat_array(values):
+	"""Flat typed array behind `values` (Vectors or array), None for any other sequence"""
+	if isinstance(values, Vectors):
+		values = values.data
+	if isinstance(values, array):
+		return values
+	return None
+
+
+class BinaryReader():
+	def __init__(self, file):
+		self.inputFile = file
+		self.endian = '<'
+		self.mode = self.inputFile.mode if hasattr(self.inputFile, 'mode') else None
+
+	def dirname(self):
+		return os.path.dirname(self.inputFile.name)
+
+	def tell(self):
+		val = self.inputFile.tell()
+		return val
+
+	def size(self):
+		back = self.inputFile.tell()
+		self.inputFile.seek(0, 2)
+		tell = self.inputFile.tell()
+		self.inputFile.seek(back)
+		return tell
+
+	def read_uint8(self):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(1)
+		data = struct.unpack(self.endian+'B', data)[0]
+		return data
+
+	def read_uint16(self):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(2)
+		data = struct.unpack(self.endian+'H', data)[0]
+		return data
+
+	def read_int32(self):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(4)
+		data = struct.unpack(self.endian+'i', data)[0]
+		return data
+
+	def read_float32(self):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(4)
+		data = struct.unpack(self.endian+'f', data)[0]
+		return data
+
+	def read_string(self, limit=1000):
+		if self.mode != 'rb':
+			return None
+
+		# always consume `limit` bytes to keep the cursor on the next field
+		return cstring(self.inputFile.read(limit))
+
+	def read_matrix4x4(self):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(16*4)
+		data = struct.unpack(self.endian+16*'f', data)
+
+		return list(data)
+
+	def read_record(self, layout):
+		if self.mode != 'rb':
+			return None
+
+		return layout.unpack_from(self.inputFile.read(layout.size))
+
+	def read_records(self, layout, count):
+		if self.mode != 'rb':
+			return None
+
+		return layout.unpack_array(self.inputFile.read(layout.size * max(count, 0)), 0, count)
+
+	def read_array(self, fmt, count):
+		"""Read `count` values of struct format `fmt` into a typed array"""
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(max(count, 0) * struct.calcsize(fmt))
+		return typed_array(fmt, data, self.endian == '>')
+
+	def read_vectors(self, fmt, count, width):
+		"""Read `count` vectors of `width` values each as Vectors"""
+		data = self.read_array(fmt, count * width)
+		if data is None:
+			return None
+
+		return Vectors(data, width)
+
+	def read_unknown(self, count):
+		if self.mode != 'rb':
+			return None
+
+		data = self.inputFile.read(count)
+		return data
+
+
+class MMapReader():
+	"""Reader over a memory mapped file, arrays are numpy views when numpy is available"""
+	def __init__(self, file):
+		self.inputFile = file
+		self.endian = '<'
+		self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.offset = 0
+
+	def dirname(self):
+		return os.path.dirname(self.inputFile.name)
+
+	def tell(self):
+		return self.offset
+
+	def size(self):
+		return len(self.buffer)
+
+	def seek(self, offset):
+		self.offset = offset
+
+	def unpack(self, fmt):
+		fmt = self.endian + fmt
+		data = struct.unpack_from(fmt, self.buffer, self.offset)
+		self.offset += struct.calcsize(fmt)
+		return data
+
+	def read_uint8(self):
+		return self.unpack('B')[0]
+
+	def read_uint16(self):
+		return self.unpack('H')[0]
+
+	def read_int32(self):
+		return self.unpack('i')[0]
+
+	def read_float32(self):
+		return self.unpack('f')[0]
+
+	def read_string(self, limit=1000):
+		data = cstring(self.buffer[self.offset:self.offset + limit])
+		self.offset += limit
+		return data
+
+	def read_matrix4x4(self):
+		return list(self.unpack(16*'f'))
+
+	def read_record(self, layout):
+		record = layout.unpack_from(self.buffer, self.offset)
+		self.offset += layout.size
+		return record
+
+	def read_records(self, layout, count):
+		records = layout.unpack_array(self.buffer, self.offset, count)
+		self.offset += layout.size * max(count, 0)
+		return records
+
+	def read_array(self, fmt, count):
+		"""Return `count` values of struct format `fmt` as a view into the file without copying"""
+		count = max(count, 0)
+		if numpy is None:
+			size = count * struct.calcsize(fmt)
+			data = typed_array(fmt, self.buffer[self.offset:self.offset + size], self.endian == '>')
+			self.offset += size
+			return data
+
+		data = numpy.frombuffer(self.buffer, dtype=NUMPY_DTYPES[fmt], count=count, offset=self.offset)
+		self.offset += data.nbytes
+		return data
+
+	def read_vectors(self, fmt, count, width):
+		"""Return `count` vectors of `width` values, a (count, width) numpy view or Vectors"""
+		data = self.read_array(fmt, count * width)
+		if numpy is None:
+			return Vectors(data, width)
+
+		return data.reshape(-1, width)
+
+	def read_unknown(self, count):
+		"""Skip `count` bytes, the unknown blocks are not used"""
+		self.offset += count
+
+	def close(self):
+		self.buffer.close()
+
+
+class RMBTextureData():
+	def __init__(self, name=None, diffuse=None, specular=None, normal=None):
+		self.name = name
+		self.diffuse = diffuse
+		self.specular = specular
+		self.normal = normal
+
+class RMBSkinData():
+	def __init__(self):
+		self.bone_map = ()
+		self.weight_list = []      # 4 float weights per vertex
+		self.indice_list = []      # 4 bone map indices per vertex
+
+class RMBMeshData():
+	def __init__(self):
+		self.index = None
+		self.name = None
+		self.parent_bone = None
+		self.has_armature = False
+		self.texture_index = 0
+		self.bone_map_count = 0
+		self.vertices_count = 0
+		self.indices_count = 0
+		self.vert_pos_list = []
+		self.vert_norm_list = []
+		self.vert_uv_list = []
+		self.indice_list = []
+		self.skin = None           # RMBSkinData for rigged meshes
+
+class RMBBoneData():
+	def __init__(self):
+		self.id = None
+		self.parent_id = None
+		self.name = None
+		self.parent_name = None
+		# raw 4x4 matrices (16 floats, row by row), matrix3 is the inverted bind matrix
+		self.matrix1 = None
+		self.matrix2 = None
+		self.matrix3 = None
+
+class RMBModelData():
+	def __init__(self, name=None):
+		self.name = name
+		self.item_flag = 0
+		self.data_offset = 0
+		self.texture_dir = None
+		self.textures = []
+		self.meshes = []
+		self.bones = []
+
+class RABBoneData():
+	def __init__(self):
+		self.name = None
+		# raw key times in ticks
+		self.pos_frame_count = 0
+		self.pos_frames = []
+		self.rot_frame_count = 0
+		self.rot_frames = []
+		# key times in frames
+		self.pos_frame_list = []
+		self.rot_frame_list = []
+		# (x, y, z) position keys and (x, y, z, w) rotation keys
+		self.pos_key_list = []
+		self.rot_key_list = []
+		# accumulated rotation keys, rot_key_list[0] * ... * rot_key_list[j]
+		self.rot_accum_list = []
+
+class RABActionData():
+	def __init__(self, name=None):
+		self.name = name
+		self.model_name = None
+		self.anim_name = None
+		self.header = {}
+		self.bones_count = 0
+		self.bones = []
+
+
+def get_specific_texture(base_name, tex_type):
+	filename = find_specific_texture(base_name, tex_type)
+	if filename is None:
+		print('\tTexture not found: {0}'.format(specific_texture_name(base_name, tex_type)), 'WARNING')
+	return filename
+
+def split_rab_filename(filename):
+	if '_' not in filename:
+		raise ValueError('Invalid filename: {0}'.format(filename))
+
+	model_name, anim_name = filename.split('_')
+	return model_name, anim_name
+
+def ticks_to_frames(ticks):
+	if numpy is not None and isinstance(ticks, numpy.ndarray):
+		return ticks // RAB_TICKS_PER_FRAME
+
+	return array('i', [v // RAB_TICKS_PER_FRAME for v in ticks])
+
+def quat_multiply(a, b):
+	"""Hamilton product of (x, y, z, w) quaternions, numpy arrays of shape (..., 4)"""
+	ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+	bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+	return numpy.stack([
+		aw*bx + ax*bw + ay*bz - az*by,
+		aw*by - ax*bz + ay*bw + az*bx,
+		aw*bz + ax*by - ay*bx + az*bw,
+		aw*bw - ax*bx - ay*by - az*bz,
+	], axis=-1)
+
+def accumulate_rotations(key_lists):
+	"""For every list of (x, y, z, w) keys return the running products q0 * q1 * ... * qj.
+
+	This matches chaining the inverted Blender 2.49 quaternion matrices key by key.
+	With numpy all bones are accumulated together by a segmented prefix scan, so the
+	number of array operations grows with log2 of the longest key list only."""
+	counts = [len(keys) for keys in key_lists]
+	if len(counts) == 0 or max(counts) == 0:
+		return [[] for keys in key_lists]
+
+	if numpy is None:
+		result = []
+		for keys in key_lists:
+			accum = array('d')
+			previous = None
+			for x, y, z, w in keys:
+				if previous is not None:
+					ax, ay, az, aw = previous
+					x, y, z, w = (
+						aw*x + ax*w + ay*z - az*y,
+						aw*y - ax*z + ay*w + az*x,
+						aw*z + ax*y - ay*x + az*w,
+						aw*w - ax*x - ay*y - az*z,
+					)
+				previous = (x, y, z, w)
+				accum.extend(previous)
+			result.append(Vectors(accum, 4))
+		return result
+
+	quats = numpy.concatenate([numpy.asarray(keys, dtype=numpy.float64).reshape(-1, 4) for keys in key_lists])
+	starts = numpy.repeat(numpy.cumsum([0] + counts[:-1]), counts)
+	index = numpy.arange(len(quats))
+
+	shift = 1
+	while shift < max(counts):
+		# keys with a predecessor `shift` steps back in the same bone take its running product
+		mask = (index - shift >= starts)[:, None]
+		quats[shift:] = numpy.where(mask[shift:], quat_multiply(quats[:-shift], quats[shift:]), quats[shift:])
+		shift *= 2
+
+	return numpy.split(quats, numpy.cumsum(counts)[:-1])
+
+def split_triangles(indices, ranges):
+	"""Build triangles and their material ids from a flat index buffer.
+
+	`ranges` holds one (id_start, id_count) index range per material, a trailing
+	partial triangle of a range is dropped. With numpy the result is an (N, 3) array
+	(a view of the buffer for a single range) and an id array built with one repeat
+	per material, otherwise a list of index tuples and a list of ids."""
+	if numpy is not None:
+		indices = numpy.asarray(indices)
+		blocks = []
+		for start, count in ranges:
+			block = indices[start:start + count]
+			blocks.append(block[:len(block) - len(block) % 3].reshape(-1, 3))
+
+		counts = [len(block) for block in blocks]
+		material_ids = numpy.repeat(numpy.arange(len(blocks)), counts)
+		if len(blocks) == 1:
+			return blocks[0], material_ids
+		elif len(blocks) == 0:
+			return numpy.empty((0, 3), dtype=indices.dtype), material_ids
+		return numpy.concatenate(blocks), material_ids
+
+	triangles = []
+	material_ids = []
+	for material_id in range(len(ranges)):
+		start, count = ranges[material_id]
+		block = indices[start:start + count]
+		block_triangles = list(zip(block[0::3], block[1::3], block[2::3]))
+		triangles.extend(block_triangles)
+		material_ids.extend([material_id] * len(block_triangles))
+
+	return triangles, material_ids
+
+def parse_rmb_header(reader, model):
+	"""Read everything in front of the vertex payload: header, texture names, mesh descriptors and bones"""
+	header = reader.read_record(RMB_HEADER)
+	model.item_flag = header['item_flag']
+	model.data_offset = header['data_offset']
+
+	for record in reader.read_records(RMB_TEXTURE, header['texture_count']):
+		model.textures.append(RMBTextureData(record['name']))
+
+	for record in reader.read_records(RMB_MESH, header['mesh_count']):
+		mesh = RMBMeshData()
+		mesh.index = record['index']
+		mesh.name = record['name']
+		mesh.parent_bone = record['parent_bone']
+		mesh.has_armature = record['has_armature'] != 0
+		mesh.texture_index = record['texture_index']
+		mesh.bone_map_count = record['bone_map_count']
+		mesh.vertices_count = record['vertices_count']
+		mesh.indices_count = record['indices_count']
+		model.meshes.append(mesh)
+
+	for record in reader.read_records(RMB_BONE, header['bone_count']):
+		bone = RMBBoneData()
+		bone.id = record['id']
+		bone.parent_id = record['parent_id']
+		bone.name = record['name']
+		bone.parent_name = record['parent_name']
+		bone.matrix1 = list(record['matrix1'])
+		bone.matrix2 = list(record['matrix2'])
+		bone.matrix3 = list(record['matrix3'])
+		model.bones.append(bone)
+
+def resolve_textures(model, dirname, texture_path=None):
+	model.texture_dir = find_texture_dir(dirname, texture_path)
+
+	for texture in model.textures:
+		texpath = os.path.join(model.texture_dir, texture.name)
+		texture.diffuse = find_texture(texpath) or texpath
+		texture.specular = get_specific_texture(texpath, '_sp')
+		texture.normal = get_specific_texture(texpath, '_n')
+
+def rmb_mesh_payload_size(mesh):
+	vertex_size = 12 + 12 + 8 + 12 + 12
+	if mesh.has_armature:
+		vertex_size += 16 + 4
+	return mesh.bone_map_count + mesh.vertices_count * vertex_size + mesh.indices_count * 2
+
+def parse_rmb_payload(reader, model):
+	for mesh in model.meshes:
+		bone_map = tuple([int(v) for v in reader.read_array('B', mesh.bone_map_count)])  # 1 byte per bone map entry
+
+		count = mesh.vertices_count
+		mesh.vert_pos_list = reader.read_vectors('f', count, 3)        # 12 bytes for each vertex position
+		mesh.vert_norm_list = reader.read_vectors('f', count, 3)       # 12 bytes for each vertex normal
+		mesh.vert_uv_list = reader.read_vectors('f', count, 2)         # 8 bytes for each vertex uv
+		reader.read_unknown(count=count*12)                            # unknown data, vertexCount * 12
+		reader.read_unknown(count=count*12)                            # unknown data, vertexCount * 12
+
+		if mesh.has_armature:
+			skin = RMBSkinData()
+			skin.bone_map = bone_map
+			skin.weight_list = reader.read_vectors('f', count, 4)      # 16 bytes for each vertex skin weight
+			skin.indice_list = reader.read_vectors('B', count, 4)      # 4 bytes for each vertex skin indice
+			mesh.skin = skin
+
+		mesh.indice_list = reader.read_array('H', mesh.indices_count)  # 2 bytes indice
+
+def parse_rmb(reader, name, texture_path=None):
+	model = RMBModelData(name)
+	parse_rmb_header(reader, model)
+	resolve_textures(model, reader.dirname(), texture_path)
+	parse_rmb_payload(reader, model)
+	return model
+
+def parse_rab_header(reader, action):
+	action.header = reader.read_record(RAB_HEADER)
+	action.bones_count = action.header['bones_count']
+
+	for record in reader.read_records(RAB_BONE, action.bones_count):
+		bone = RABBoneData()
+		bone.name = record['name']
+		bone.rot_frame_count = record['rot_frame_count']
+		bone.pos_frame_count = record['pos_frame_count']
+		action.bones.append(bone)
+
+def rab_bone_payload_size(bone):
+	return bone.pos_frame_count * (4 + 12) + bone.rot_frame_count * (4 + 16)
+
+def parse_rab_payload(reader, action):
+	for bone in action.bones:
+		bone.pos_frames = reader.read_array('i', bone.pos_frame_count)
+		bone.rot_frames = reader.read_array('i', bone.rot_frame_count)
+		bone.pos_key_list = reader.read_vectors('f', bone.pos_frame_count, 3)
+		bone.rot_key_list = reader.read_vectors('f', bone.rot_frame_count, 4)
+
+		bone.pos_frame_list = ticks_to_frames(bone.pos_frames)
+		bone.rot_frame_list = ticks_to_frames(bone.rot_frames)
+
+	accum_lists = accumulate_rotations([bone.rot_key_list for bone in action.bones])
+	for bone, accum in zip(action.bones, accum_lists):
+		bone.rot_accum_list = accum
+
+def parse_rab(reader, name):
+	action = RABActionData(name)
+	action.model_name, action.anim_name = split_rab_filename(name)
+	parse_rab_header(reader, action)
+	parse_rab_payload(reader, action)
+	return action
+
+def load_rmb(filepath, texture_path=None, use_mmap=False):
+	"""Parse a .rmb file. With `use_mmap` the file is memory mapped and the vertex,
+	skin and index blocks are numpy views into the mapping (no per element work)."""
+	name = os.path.splitext(os.path.basename(filepath))[0]
+	file = open(filepath, 'rb')
+	try:
+		reader = MMapReader(file) if use_mmap else BinaryReader(file)
+		return parse_rmb(reader, name, texture_path)
+	finally:
+		# the mapping stays alive while the numpy views reference it
+		file.close()
+
+def load_rab(filepath, use_mmap=False):
+	"""Parse a .rab file. With `use_mmap` the key tables are numpy views into the mapping."""
+	name = os.path.splitext(os.path.basename(filepath))[0]
+	file = open(filepath, 'rb')
+	try:
+		reader = MMapReader(file) if use_mmap else BinaryReader(file)
+		return parse_rab(reader, name)
+	finally:
+		file.close()
+
+def inspect_rmb(filepath):
+	"""Header stats of a .rmb file, the vertex payload is not read"""
+	model = RMBModelData(os.path.splitext(os.path.basename(filepath))[0])
+	file = open(filepath, 'rb')
+	try:
+		reader = MMapReader(file)
+		parse_rmb_header(reader, model)
+		payload_offset = reader.tell()
+		size = reader.size()
+		reader.close()
+	finally:
+		file.close()
+
+	meshes = []
+	expected_size = payload_offset
+	for mesh in model.meshes:
+		expected_size += rmb_mesh_payload_size(mesh)
+		meshes.append({
+			'name': mesh.name,
+			'parent_bone': mesh.parent_bone,
+			'has_armature': mesh.has_armature,
+			'texture_index': mesh.texture_index,
+			'bone_map_count': mesh.bone_map_count,
+			'vertices_count': mesh.vertices_count,
+			'indices_count': mesh.indices_count,
+		})
+
+	return {
+		'file': filepath,
+		'type': 'rmb',
+		'size': size,
+		'expected_size': expected_size,
+		'item_flag': model.item_flag,
+		'texture_count': len(model.textures),
+		'mesh_count': len(model.meshes),
+		'bone_count': len(model.bones),
+		'textures': [texture.name for texture in model.textures],
+		'meshes': meshes,
+		'bones': [bone.name for bone in model.bones],
+	}
+
+def inspect_rab(filepath):
+	"""Header stats of a .rab file, the key tables are not read"""
+	action = RABActionData(os.path.splitext(os.path.basename(filepath))[0])
+	file = open(filepath, 'rb')
+	try:
+		reader = MMapReader(file)
+		parse_rab_header(reader, action)
+		payload_offset = reader.tell()
+		size = reader.size()
+		reader.close()
+	finally:
+		file.close()
+
+	bones = []
+	expected_size = payload_offset
+	for bone in action.bones:
+		expected_size += rab_bone_payload_size(bone)
+		bones.append({
+			'name': bone.name,
+			'rot_frame_count': bone.rot_frame_count,
+			'pos_frame_count': bone.pos_frame_count,
+		})
+
+	return {
+		'file': filepath,
+		'type': 'rab',
+		'size': size,
+		'expected_size': expected_size,
+		'header': action.header,
+		'bones_count': action.bones_count,
+		'bones': bones,
+	}
+
+def rmb_texture_files(filepath, texture_path=None):
+	"""Existing diffuse/specular/normal texture files referenced by a .rmb file, the payload is not read"""
+	model = RMBModelData(os.path.splitext(os.path.basename(filepath))[0])
+	file = open(filepath, 'rb')
+	try:
+		reader = MMapReader(file)
+		parse_rmb_header(reader, model)
+		reader.close()
+	finally:
+		file.close()
+
+	return texture_files([texture.name for texture in model.textures], os.path.dirname(filepath), texture_path)
+
+def texture_files(texture_names, dirname, texture_path=None):
+	"""Existing diffuse/specular/normal texture files of the textures of a .rmb file in `dirname`"""
+	tex_dir = find_texture_dir(dirname, texture_path)
+	files = []
+	for texture_name in texture_names:
+		texpath = os.path.join(tex_dir, texture_name)
+		for found in (find_texture(texpath), find_specific_texture(texpath, '_sp'), find_specific_texture(texpath, '_n')):
+			if found is not None and found not in files:
+				files.append(found)
+	return files
+
+def inspect_file(filepath):
+	ext = os.path.splitext(filepath)[1].lower()
+	if ext == '.rmb':
+		return inspect_rmb(filepath)
+	elif ext == '.rab':
+		return inspect_rab(filepath)
+
+	raise ValueError('Unsupported file extension: {0}'.format(ext))
@@ -0,0 +1,283 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Writer for .rmb/.rab/.txt model files and generator of synthetic models
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# write_rmb/write_rab are the inverse of rmb_rab_parser.load_rmb/load_rab, the
+# unknown blocks of the format are written as zeros. The synthetic models have
+# valid skeletons (translation only bind poses), normalized skin weights and
+# unit rotation keys, so every backend can convert them.
+
+
+from array import array
+import math
+import os
+import random
+import xml.etree.ElementTree as ET
+from rmb_rab_format import RMB_HEADER, RMB_TEXTURE, RMB_MESH, RMB_BONE, RAB_HEADER, RAB_BONE
+from rmb_rab_parser import RMBModelData, RMBMeshData, RMBSkinData, RMBTextureData, RMBBoneData, RABActionData, RABBoneData
+from rmb_rab_parser import RAB_TICKS_PER_FRAME, accumulate_rotations, split_rab_filename, ticks_to_frames
+from model_cache import column_bytes
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# largest vertex count of a mesh, the index buffer is uint16
+RMB_MAX_VERTICES = 65536
+# bones referenced by the skin of one mesh
+RMB_MAX_BONE_MAP = 24
+# unknown per vertex blocks of the vertex payload, 2 * 12 bytes
+RMB_VERTEX_UNKNOWN_SIZE = 24
+
+
+def rmb_data_offset(model):
+	# the payload starts after the header, textures, mesh descriptors and bones
+	return RMB_HEADER.size + RMB_TEXTURE.size * len(model.textures) + RMB_MESH.size * len(model.meshes) + RMB_BONE.size * len(model.bones)
+
+def write_rmb(filepath, model):
+	"""Write a RMBModelData (parsed or synthetic) as a .rmb file"""
+	file = open(filepath, 'wb')
+	try:
+		file.write(RMB_HEADER.pack({
+			'item_flag': model.item_flag,
+			'texture_count': len(model.textures),
+			'mesh_count': len(model.meshes),
+			'bone_count': len(model.bones),
+			'data_offset': model.data_offset or rmb_data_offset(model),
+		}))
+		for texture in model.textures:
+			file.write(RMB_TEXTURE.pack({'name': texture.name}))
+
+		for mesh in model.meshes:
+			file.write(RMB_MESH.pack({
+				'index': mesh.index,
+				'name': mesh.name,
+				'parent_bone': mesh.parent_bone,
+				'has_armature': 1 if mesh.has_armature else 0,
+				'texture_index': mesh.texture_index,
+				'bone_map_count': mesh.bone_map_count,
+				'vertices_count': mesh.vertices_count,
+				'indices_count': mesh.indices_count,
+			}))
+
+		for bone in model.bones:
+			file.write(RMB_BONE.pack({
+				'id': bone.id,
+				'parent_id': bone.parent_id,
+				'name': bone.name,
+				'parent_name': bone.parent_name,
+				'matrix1': bone.matrix1,
+				'matrix2': bone.matrix2,
+				'matrix3': bone.matrix3,
+			}))
+
+		for mesh in model.meshes:
+			bone_map = mesh.skin.bone_map if mesh.skin is not None else ()
+			file.write(column_bytes(list(bone_map) + [0] * (mesh.bone_map_count - len(bone_map)), 'B'))
+			file.write(column_bytes(mesh.vert_pos_list, 'f'))
+			file.write(column_bytes(mesh.vert_norm_list, 'f'))
+			file.write(column_bytes(mesh.vert_uv_list, 'f'))
+			file.write(b'\x00' * (mesh.vertices_count * RMB_VERTEX_UNKNOWN_SIZE))
+			if mesh.has_armature:
+				file.write(column_bytes(mesh.skin.weight_list, 'f'))
+				file.write(column_bytes(mesh.skin.indice_list, 'B'))
+			file.write(column_bytes(mesh.indice_list, 'H'))
+	finally:
+		file.close()
+
+def write_rab(filepath, action):
+	"""Write a RABActionData (parsed or synthetic) as a .rab file"""
+	header = dict(action.header)
+	header['bones_count'] = len(action.bones)
+
+	file = open(filepath, 'wb')
+	try:
+		file.write(RAB_HEADER.pack(header))
+		for bone in action.bones:
+			file.write(RAB_BONE.pack({'name': bone.name, 'rot_frame_count': bone.rot_frame_count, 'pos_frame_count': bone.pos_frame_count}))
+
+		for bone in action.bones:
+			file.write(column_bytes(bone.pos_frames, 'i'))
+			file.write(column_bytes(bone.rot_frames, 'i'))
+			file.write(column_bytes(bone.pos_key_list, 'f'))
+			file.write(column_bytes(bone.rot_key_list, 'f'))
+	finally:
+		file.close()
+
+def write_model_txt(filepath, rmb_filename, actions):
+	"""Write a model .txt config, `actions` is a list of (action name, .rab file name)"""
+	root = ET.Element('Model')
+	ET.SubElement(ET.SubElement(root, 'Mesh'), 'FileName').text = rmb_filename
+	animation = ET.SubElement(root, 'Animation')
+	for action_name, rab_filename in actions:
+		ET.SubElement(ET.SubElement(animation, 'Action', Name=action_name), 'FileName').text = rab_filename
+
+	ET.ElementTree(root).write(filepath)
+
+
+class RandomValues():
+	"""Seeded random floats as numpy arrays, or as lists without numpy"""
+	def __init__(self, seed):
+		self.rng = numpy.random.RandomState(seed) if numpy is not None else random.Random(seed)
+
+	def uniform(self, low, high, count):
+		if numpy is not None:
+			return self.rng.uniform(low, high, count).astype(numpy.float32)
+		return [self.rng.uniform(low, high) for i in range(count)]
+
+	def integers(self, high, count):
+		if numpy is not None:
+			return self.rng.randint(0, high, count).astype(numpy.uint8)
+		return [self.rng.randrange(high) for i in range(count)]
+
+def vectors(values, width):
+	"""Flat values -> (N, width) array or list of tuples"""
+	if numpy is not None:
+		return numpy.asarray(values).reshape(-1, width)
+	return list(zip(*[iter(values)] * width))
+
+def normalized(values, width, total=False):
+	"""Rows of `width` flat values scaled to unit length, or to a sum of 1 with `total` (weights)"""
+	rows = vectors(values, width)
+	if numpy is not None:
+		norm = rows.sum(axis=1) if total else numpy.sqrt((rows * rows).sum(axis=1))
+		return (rows / norm[:, None]).astype(numpy.float32)
+
+	result = []
+	for row in rows:
+		norm = sum(row) if total else math.sqrt(sum([v * v for v in row]))
+		result.append(tuple([v / norm for v in row]))
+	return result
+
+def translation_matrix(x, y, z):
+	# row vector layout, the translation is the last row
+	return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, x, y, z, 1.0]
+
+def synthetic_rmb(name, mesh_count=1, vertices=1000, bone_count=16, texture_count=1, seed=0):
+	"""Rigged model of `mesh_count` meshes with `vertices` vertices each and a binary tree skeleton"""
+	if vertices < 3 or vertices > RMB_MAX_VERTICES:
+		raise ValueError('Vertex count out of range: {0}'.format(vertices))
+
+	values = RandomValues(seed)
+	model = RMBModelData(name)
+	model.item_flag = 1
+
+	for i in range(max(1, texture_count)):
+		model.textures.append(RMBTextureData('{0}_tex{1}.dds'.format(name, i)))
+
+	depths = []
+	for i in range(max(1, bone_count)):
+		bone = RMBBoneData()
+		bone.id = i
+		bone.parent_id = (i - 1) // 2 if i > 0 else -1
+		bone.name = 'bone{0:03d}'.format(i)
+		bone.parent_name = model.bones[bone.parent_id].name if i > 0 else ''
+		# bind pose 10 units above the parent, matrix3 is its inverse
+		depth = depths[bone.parent_id] + 1 if i > 0 else 0
+		depths.append(depth)
+		bone.matrix1 = translation_matrix(0.0, 0.0, 10.0 * depth)
+		bone.matrix2 = translation_matrix(0.0, 0.0, 10.0 * depth)
+		bone.matrix3 = translation_matrix(0.0, 0.0, -10.0 * depth)
+		model.bones.append(bone)
+
+	for i in range(mesh_count):
+		mesh = RMBMeshData()
+		mesh.index = i
+		mesh.name = '{0}_mesh{1}'.format(name, i)
+		mesh.parent_bone = model.bones[0].name
+		mesh.has_armature = True
+		mesh.texture_index = i % len(model.textures)
+		mesh.vertices_count = vertices
+		mesh.vert_pos_list = vectors(values.uniform(-50.0, 50.0, vertices * 3), 3)
+		mesh.vert_norm_list = normalized(values.uniform(-1.0, 1.0, vertices * 3), 3)
+		mesh.vert_uv_list = vectors(values.uniform(0.0, 1.0, vertices * 2), 2)
+
+		# a strip of triangles over consecutive vertices
+		if numpy is not None:
+			mesh.indice_list = (numpy.arange(vertices - 2, dtype=numpy.uint16)[:, None] + numpy.arange(3, dtype=numpy.uint16)).ravel()
+		else:
+			mesh.indice_list = array('H', [j + k for j in range(vertices - 2) for k in range(3)])
+		mesh.indices_count = len(mesh.indice_list)
+
+		skin = RMBSkinData()
+		skin.bone_map = tuple([(i + j) % len(model.bones) for j in range(min(len(model.bones), RMB_MAX_BONE_MAP))])
+		skin.weight_list = normalized(values.uniform(0.01, 1.0, vertices * 4), 4, True)
+		skin.indice_list = vectors(values.integers(len(skin.bone_map), vertices * 4), 4)
+		mesh.bone_map_count = len(skin.bone_map)
+		mesh.skin = skin
+		model.meshes.append(mesh)
+
+	model.data_offset = rmb_data_offset(model)
+	return model
+
+def synthetic_rab(name, bone_names, keys=30, seed=0):
+	"""Action `name` (<model>_<anim>) with `keys` position and rotation keys, one key per frame, on every bone"""
+	values = RandomValues(seed)
+	action = RABActionData(name)
+	action.model_name, action.anim_name = split_rab_filename(name)
+	action.header = {'x1': 2, 'x2': 0, 'x3': 0, 'x4': 30, 'ticks_per_frame': RAB_TICKS_PER_FRAME, 'x6': 0, 'x7': 0, 'bones_count': len(bone_names), 'x9': 0}
+	action.bones_count = len(bone_names)
+
+	ticks = [j * RAB_TICKS_PER_FRAME for j in range(keys)]
+	for bone_name in bone_names:
+		bone = RABBoneData()
+		bone.name = bone_name
+		bone.pos_frame_count = bone.rot_frame_count = keys
+		bone.pos_frames = numpy.array(ticks, dtype=numpy.int32) if numpy is not None else list(ticks)
+		bone.rot_frames = numpy.array(ticks, dtype=numpy.int32) if numpy is not None else list(ticks)
+		bone.pos_frame_list = ticks_to_frames(bone.pos_frames)
+		bone.rot_frame_list = ticks_to_frames(bone.rot_frames)
+		bone.pos_key_list = vectors(values.uniform(-5.0, 5.0, keys * 3), 3)
+
+		# small rotations around the identity, the keys are chained into each other
+		rotations = values.uniform(-0.05, 0.05, keys * 4)
+		for j in range(3, keys * 4, 4):
+			rotations[j] = 1.0
+		bone.rot_key_list = normalized(rotations, 4)
+		action.bones.append(bone)
+
+	for bone, accum in zip(action.bones, accumulate_rotations([bone.rot_key_list for bone in action.bones])):
+		bone.rot_accum_list = accum
+	return action
+
+def write_synthetic_model(dirname, name, mesh_count=1, vertices=1000, bone_count=16, keys=30, actions=('walk', 'idle'), seed=0):
+	"""Write <name>.rmb, one <name>_<action>.rab per action, <name>.txt and placeholder
+	textures into `dirname`, returns the .txt path"""
+	texture_dir = os.path.join(dirname, 'texture')
+	if not os.path.exists(texture_dir):
+		os.makedirs(texture_dir)
+
+	model = synthetic_rmb(name, mesh_count, vertices, bone_count, seed=seed)
+	write_rmb(os.path.join(dirname, name + '.rmb'), model)
+	for texture in model.textures:
+		base = os.path.splitext(texture.name)[0]
+		for suffix in ('', '_sp', '_n'):
+			open(os.path.join(texture_dir, base + suffix + '.dds'), 'wb').close()
+
+	config = []
+	bone_names = [bone.name for bone in model.bones]
+	for i, action_name in enumerate(actions):
+		rab_filename = '{0}_{1}.rab'.format(name, action_name)
+		write_rab(os.path.join(dirname, rab_filename), synthetic_rab(os.path.splitext(rab_filename)[0], bone_names, keys, seed + i + 1))
+		config.append(('A_' + action_name.upper(), rab_filename))
+
+	txt_path = os.path.join(dirname, name + '.txt')
+	write_model_txt(txt_path, name + '.rmb', config)
+	return txt_path
@@ -0,0 +1,112 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Opt-in cProfile capture of the jobs of the Blender scripts, one .prof file per job
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+#
+# The Blender scripts call start() when the converter passes --profile <dir> and wrap
+# every job (the import of the mesh or of one action, the export of one .blend file)
+# in `with script_profiler.profile(filepath):`. The job is written to
+# <dir>/<file name>.<process>.prof in the pstats format, parallel sessions that
+# import the same file get numbered files (<file name>.<process>.<n>.prof).
+# The stats are marshal version 0 data: the default format of Python 2 (dump_stats)
+# uses type codes Python 3 can not read, and the converter merges the files with Python 3.
+
+
+import errno
+import marshal
+import os
+
+try:
+	import cProfile
+except ImportError:
+	cProfile = None
+
+
+PROFILE_EXT = '.prof'
+
+
+class Profile():
+	"""Context manager profiling its block and dumping the stats when it ends"""
+	def __init__(self, filepath):
+		self.filepath = filepath
+
+	def __enter__(self):
+		self.profiler = cProfile.Profile()
+		self.profiler.enable()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.profiler.disable()
+		self.profiler.create_stats()
+		f = open(self.filepath, 'wb')
+		try:
+			marshal.dump(self.profiler.stats, f, 0)
+		finally:
+			f.close()
+		return False
+
+class NullProfile():
+	"""Job of a script that runs without --profile"""
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+
+# profile folder and process name of the running script, None until start() is called
+_profile_dir = None
+_process = None
+_null_profile = NullProfile()
+
+
+def start(profile_dir, process):
+	"""Profile the jobs of this process into `profile_dir`, None turns profiling off"""
+	global _profile_dir, _process
+	if profile_dir is not None and cProfile is None:
+		profile_dir = None
+	if profile_dir is not None and not os.path.isdir(profile_dir):
+		os.makedirs(profile_dir)
+	_profile_dir = profile_dir
+	_process = process
+
+def profile_file(filepath):
+	"""Claim an unused .prof path in the profile folder for the job of `filepath`"""
+	name = os.path.splitext(os.path.basename(filepath))[0]
+	n = 0
+	while True:
+		suffix = ''
+		if n:
+			suffix = '.{0}'.format(n)
+		path = os.path.join(_profile_dir, '{0}.{1}{2}{3}'.format(name, _process, suffix, PROFILE_EXT))
+		try:
+			# created exclusively, another session can not pick the same name
+			os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+			return path
+		except OSError as e:
+			if e.errno != errno.EEXIST:
+				raise
+		n += 1
+
+def profile(filepath):
+	"""`with profile(filepath):` profiles the job of `filepath` if profiling is started"""
+	if _profile_dir is None:
+		return _null_profile
+	return Profile(profile_file(filepath))
@@ -0,0 +1,152 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Wall and CPU time of named conversion stages, reported through JSON sidecar files
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+#
+# The Blender scripts call start() when the converter passes --timings <file>, wrap
+# their stages in `with stage_timer.stage(name, filepath):` and write() the sidecar
+# before they exit. The sidecar is {"process", "started", "wall", "cpu", "stages": [
+# {"process", "stage", "file", "wall", "cpu"}]}, times in seconds, "started" is the
+# time.time() of the script start (the converter derives the Blender startup from it).
+
+
+import json
+import os
+import threading
+import time
+
+
+TIMINGS_DIR = '.timings'
+
+
+def cpu_time():
+	# CPU time of the calling thread where available, parallel jobs of one process do not add up
+	if hasattr(time, 'thread_time'):
+		return time.thread_time()
+	if hasattr(time, 'process_time'):
+		return time.process_time()
+	user, system = os.times()[:2]
+	return user + system
+
+
+class Stage():
+	"""Context manager adding the wall and CPU time of its block to a StageTimer"""
+	def __init__(self, timer, name, filepath):
+		self.timer = timer
+		self.name = name
+		self.filepath = filepath
+
+	def __enter__(self):
+		self.wall = time.time()
+		self.cpu = cpu_time()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.timer.add(self.name, self.filepath, time.time() - self.wall, cpu_time() - self.cpu)
+		return False
+
+class NullStage():
+	"""Stage of a script that runs without --timings"""
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+class StageTimer():
+	"""Wall and CPU time of the stages of one process"""
+	def __init__(self, process):
+		self.process = process
+		self.started = time.time()
+		self.cpu_started = cpu_time()
+		self.records = []
+		self.lock = threading.Lock()
+
+	def stage(self, name, filepath=None):
+		return Stage(self, name, filepath)
+
+	def add(self, name, filepath, wall, cpu):
+		record = {'process': self.process, 'stage': name, 'file': filepath, 'wall': wall, 'cpu': cpu}
+		self.lock.acquire()
+		try:
+			self.records.append(record)
+		finally:
+			self.lock.release()
+
+	def to_dict(self):
+		return {
+			'process': self.process,
+			'started': self.started,
+			'wall': time.time() - self.started,
+			'cpu': cpu_time() - self.cpu_started,
+			'stages': list(self.records),
+		}
+
+	def write(self, filepath):
+		# write and swap, the converter reads the file as soon as the process is done
+		tmp_path = filepath + '.tmp'
+		f = open(tmp_path, 'w')
+		try:
+			json.dump(self.to_dict(), f)
+		finally:
+			f.close()
+		if os.path.exists(filepath):
+			os.remove(filepath)
+		os.rename(tmp_path, filepath)
+
+
+# timer of the running script, None until start() is called
+_timer = None
+_null_stage = NullStage()
+
+
+def start(process):
+	global _timer
+	_timer = StageTimer(process)
+	return _timer
+
+def stop():
+	"""Stop timing, later stages are not recorded until start() is called again"""
+	global _timer
+	_timer = None
+
+def stage(name, filepath=None):
+	"""`with stage(name, filepath):` times the block if the timer is started"""
+	if _timer is None:
+		return _null_stage
+	return _timer.stage(name, filepath)
+
+def write(filepath):
+	if _timer is not None:
+		_timer.write(filepath)
+
+def read(filepath):
+	"""Sidecar dict written by write(), None if the process did not write it. The file is removed."""
+	if not os.path.exists(filepath):
+		return None
+
+	f = open(filepath, 'r')
+	try:
+		data = json.load(f)
+	except ValueError:
+		data = None
+	f.close()
+	os.remove(filepath)
+	return data
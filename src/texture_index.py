@@ -0,0 +1,186 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Case insensitive texture lookup with one directory listing per texture directory
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# NOTE: shared by the Blender 2.49 plugin (Python 2.6) and the Blender 3.6 export
+# script, so keep it free of Blender imports and of Python 3 only syntax.
+
+
+import json
+import os
+
+
+CACHE_VERSION = 1
+
+# per process caches, dirname -> TextureIndex and (dirname, texture_path) -> texture dir
+_indexes = {}
+_texture_dirs = {}
+# optional json file that keeps the directory listings between processes of a batch run
+_cache_file = None
+_cache_data = None
+# listings of this process that are not in the cache file yet, written by save_cache()
+_new_dirs = {}
+
+
+class TextureIndex():
+	"""Case insensitive file name -> path map of a single directory"""
+	def __init__(self, dirname, files, mtime=None):
+		self.dirname = dirname
+		self.mtime = mtime
+		self.names = list(files)
+		self.files = {}
+		for name in self.names:
+			self.files.setdefault(name.lower(), name)
+
+	def find(self, filename):
+		name = self.files.get(filename.lower())
+		if name is None:
+			return None
+		return os.path.join(self.dirname, name)
+
+
+def get_mtime(dirname):
+	try:
+		return os.stat(dirname).st_mtime
+	except OSError:
+		return None
+
+def read_cache(filepath):
+	"""Cache file content, None if it is missing, unreadable or of another version"""
+	if filepath is None or not os.path.exists(filepath):
+		return None
+
+	try:
+		f = open(filepath, 'r')
+		try:
+			data = json.load(f)
+		finally:
+			f.close()
+	except (IOError, OSError, ValueError):
+		print('WARNING: Texture index cache ignored: {0}'.format(filepath))
+		return None
+	if not isinstance(data, dict) or data.get('version') != CACHE_VERSION or not isinstance(data.get('dirs'), dict):
+		return None
+	return data
+
+def set_cache_file(filepath):
+	"""Load (and later update) directory listings from `filepath`, None stops using a cache file.
+
+	Listings still pending for the previous cache file are saved first."""
+	global _cache_file, _cache_data
+	save_cache()
+	_cache_file = filepath
+	_cache_data = read_cache(filepath) or {'version': CACHE_VERSION, 'dirs': {}}
+
+def save_cache():
+	"""Merge the directories listed by this process into the cache file.
+
+	The Blender scripts call it once their work is done. The file is read again first,
+	so listings that parallel jobs saved meanwhile are kept. A failed write is only a
+	warning, the next process lists those directories itself."""
+	global _new_dirs
+	if _cache_file is None or not _new_dirs:
+		return
+
+	new_dirs = _new_dirs
+	_new_dirs = {}
+	data = read_cache(_cache_file) or {'version': CACHE_VERSION, 'dirs': {}}
+	data['dirs'].update(new_dirs)
+
+	# write next to the target and swap, parallel jobs may share the file
+	tmp_path = '{0}.{1}.tmp'.format(_cache_file, os.getpid())
+	try:
+		f = open(tmp_path, 'w')
+		try:
+			json.dump(data, f)
+		finally:
+			f.close()
+
+		if hasattr(os, 'replace'):
+			os.replace(tmp_path, _cache_file)
+		else:
+			try:
+				os.rename(tmp_path, _cache_file)
+			except OSError:
+				# Windows does not rename over an existing file
+				os.remove(_cache_file)
+				os.rename(tmp_path, _cache_file)
+	except (IOError, OSError):
+		# the file is open in another job (Windows) or was swapped by one meanwhile
+		print('WARNING: Texture index cache not saved: {0}'.format(_cache_file))
+		if os.path.exists(tmp_path):
+			try:
+				os.remove(tmp_path)
+			except OSError:
+				pass
+
+def get_index(dirname):
+	index = _indexes.get(dirname)
+	if index is not None:
+		return index
+
+	mtime = get_mtime(dirname)
+	cached = None
+	if _cache_data is not None:
+		cached = _cache_data['dirs'].get(dirname)
+
+	if cached is not None and mtime is not None and cached.get('mtime') == mtime:
+		index = TextureIndex(dirname, cached.get('files', []), mtime)
+	else:
+		files = os.listdir(dirname) if mtime is not None else []
+		index = TextureIndex(dirname, files, mtime)
+		if _cache_data is not None and mtime is not None:
+			_cache_data['dirs'][dirname] = {'mtime': mtime, 'files': index.names}
+			_new_dirs[dirname] = _cache_data['dirs'][dirname]
+
+	_indexes[dirname] = index
+	return index
+
+def find_texture(filepath):
+	"""Path of `filepath` with the file name matched case insensitively, None if missing"""
+	if filepath is None:
+		return None
+
+	return get_index(os.path.dirname(filepath)).find(os.path.basename(filepath))
+
+def specific_texture_name(filepath, tex_type):
+	"""texture.dds + '_sp' -> texture_sp.dds"""
+	name = os.path.basename(filepath)
+	return os.path.join(os.path.dirname(filepath), name.split('.')[0] + tex_type + '.' + name.split('.')[-1])
+
+def find_specific_texture(filepath, tex_type):
+	return find_texture(specific_texture_name(filepath, tex_type))
+
+def find_texture_dir(dirname, texture_path=None):
+	key = (dirname, texture_path)
+	if key in _texture_dirs:
+		return _texture_dirs[key]
+
+	if texture_path is not None and os.path.exists(texture_path):
+		tex_dir = texture_path
+	else:
+		# find texture path in the same directory as the model
+		tex_dir = os.path.join(dirname, 'texture')
+		if os.path.exists(tex_dir) == False:
+			# find texture path in the parent directory
+			tex_dir = dirname.split('model')[0]+'texture'
+			if os.path.exists(tex_dir) == False:
+				tex_dir = dirname
+
+	_texture_dirs[key] = tex_dir
+	return tex_dir
@@ -0,0 +1,99 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Shared fixtures of the tests: the source folder on sys.path, the converter module, a stub Blender executable
+# and the mesh stubs of the numpy/typed array comparisons
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(TESTS_DIR, '..', 'src'))
+sys.path.insert(0, SRC_DIR)
+
+STUB_BLENDER = os.path.join(TESTS_DIR, 'stub_blender.py')
+
+
+class Skin():
+    """Skin of a parsed mesh: bone map, 4 weights and 4 bone map indices per vertex"""
+    def __init__(self, bone_map, weight_list, indice_list):
+        self.bone_map = bone_map
+        self.weight_list = weight_list
+        self.indice_list = indice_list
+
+class Mesh():
+    """Parsed mesh with only the fields the skin and uv streams read"""
+    def __init__(self, skin=None, vert_uv_list=None, vertices_count=2):
+        self.skin = skin
+        self.vert_uv_list = vert_uv_list
+        self.vertices_count = vertices_count
+
+def use_numpy(monkeypatch, enabled, *modules):
+    """Run `modules` with numpy or on their typed array path, the test is skipped if it needs numpy and it is not installed"""
+    if enabled and numpy is None:
+        pytest.skip('numpy is not installed')
+    for module in modules:
+        monkeypatch.setattr(module, 'numpy', numpy if enabled else None)
+
+
+@pytest.fixture(scope='session')
+def python2():
+    """Python 2 interpreter ($PYTHON2) for the modules Blender 2.49 runs, the test is skipped without it"""
+    executable = os.environ.get('PYTHON2')
+    if not executable:
+        pytest.skip('PYTHON2 is not set to a Python 2 interpreter')
+    return executable
+
+def run_python2(python2, script):
+    """Output of `script` run by Python 2 with src on its path"""
+    prelude = 'import sys; sys.path.insert(0, {0!r})\n'.format(SRC_DIR)
+    return subprocess.check_output([python2, '-c', prelude + script], universal_newlines=True)
+
+@pytest.fixture(scope='session')
+def converter(tmp_path_factory):
+    """converter module, imported in a temporary folder since it writes app.log and config.ini there"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('converter'))
+    try:
+        import converter
+    finally:
+        os.chdir(cwd)
+    return converter
+
+@pytest.fixture(scope='session')
+def stub_blender(tmp_path_factory):
+    """Executable running stub_blender.py with this Python, in a folder with a space in its name"""
+    dirname = tmp_path_factory.mktemp('stub') / 'blender dir'
+    dirname.mkdir()
+    if sys.platform == 'win32':
+        path = dirname / 'blender.cmd'
+        path.write_text(f'@"{sys.executable}" "{STUB_BLENDER}" %*\n')
+    else:
+        path = dirname / 'blender'
+        path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{STUB_BLENDER}" "$@"\n')
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
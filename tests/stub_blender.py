@@ -0,0 +1,123 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Stand-in for Blender 2.49/3.6 that runs bpy249_import.py/bpy36_export.py jobs without Blender
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+# Started with the argv of converter.py's Blender commands. It writes placeholder
+# .blend/.fbx files, reports them with progress events and profiles every job with
+# script_profiler like the real scripts do.
+
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import progress_events
+import script_profiler
+
+
+# reply prefix of `bpy36_export.py --server`
+SERVER_REPLY = 'EXPORT_RESULT '
+
+def options(argv, name):
+    return [argv[i + 1] for i, arg in enumerate(argv[:-1]) if arg == name]
+
+def work(n):
+    # something for the profiler to see
+    return sum([i * i for i in range(n)])
+
+def write(filepath, data):
+    with open(filepath, 'w') as file:
+        file.write(data)
+    progress_events.saved(filepath)
+
+def import_249(argv):
+    """Mesh .blend and one .blend per --rab, as `bpy249_import.py --session`. Without --session
+    the mesh .blend and <mesh>_all.blend with every --rab, as the all in one import"""
+    out, rmb_file = options(argv, '--out')[0], options(argv, '--rmb')[0]
+    name = os.path.splitext(os.path.basename(rmb_file))[0]
+    model_dir = os.path.join(out, name)
+    os.makedirs(model_dir, exist_ok=True)
+    script_profiler.start((options(argv, '--profile') or [None])[0], 'blender249')
+
+    with script_profiler.profile(rmb_file):
+        work(20000)
+    if '--skip-mesh' not in argv:
+        write(os.path.join(model_dir, f'{name}.blend'), rmb_file)
+
+    if '--session' not in argv:
+        if options(argv, '--rab'):
+            write(os.path.join(model_dir, f'{name}_all.blend'), ' '.join(options(argv, '--rab')))
+        return
+
+    for rab_file in options(argv, '--rab'):
+        with script_profiler.profile(rab_file):
+            work(10000)
+        write(os.path.join(model_dir, os.path.splitext(os.path.basename(rab_file))[0] + '.blend'), rab_file)
+
+def export_36(blend_file, argv):
+    """FBX of `blend_file` in --out, as `bpy36_export.py`.
+
+    A .blend named *failing* reports an error event and still writes its FBX, like a
+    model whose materials were not found."""
+    out = options(argv, '--out')[0]
+    os.makedirs(out, exist_ok=True)
+    script_profiler.start((options(argv, '--profile') or [None])[0], 'blender36')
+
+    with script_profiler.profile(blend_file):
+        work(20000)
+    if 'failing' in os.path.basename(blend_file):
+        progress_events.error(f"Model not found: {blend_file}", blend_file)
+    write(os.path.join(out, os.path.splitext(os.path.basename(blend_file))[0] + '.fbx'), blend_file)
+
+def serve():
+    """Export server, as `bpy36_export.py --server`. The reply also carries the pid of the worker.
+
+    A .blend named *broken* fails with an error reply, one named *crash* kills the worker mid-job."""
+    for line in iter(sys.stdin.readline, ''):
+        if not line.strip():
+            continue
+
+        job = json.loads(line)
+        name = os.path.basename(job['blend'])
+        print(f'stub: exporting {name}')
+        if 'crash' in name:
+            sys.stdout.flush()
+            os._exit(3)
+
+        reply = {'id': job['id'], 'status': 'ok', 'error': None, 'timings': {}, 'pid': os.getpid()}
+        if 'broken' in name:
+            reply.update(status='error', error=f"Can not open {job['blend']}")
+        else:
+            export_36(job['blend'], ['--out', job['out']] + (['--profile', job['profile']] if job.get('profile') else []))
+        sys.stdout.write(SERVER_REPLY + json.dumps(reply) + '\n')
+        sys.stdout.flush()
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    if '--server' in argv:
+        serve()
+    elif '-P' in sys.argv:
+        import_249(argv)
+    else:
+        export_36(sys.argv[sys.argv.index('-b') + 1], argv)
+
+
+if __name__ == '__main__':
+    main()
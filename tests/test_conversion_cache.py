@@ -0,0 +1,83 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: The conversion cache records only the outputs of jobs that succeeded
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+
+import pytest
+
+import model_cache
+from conversion_cache import CACHE_MANIFEST
+from rmb_rab_writer import write_synthetic_model
+
+
+@pytest.fixture
+def run(converter, stub_blender, tmp_path, monkeypatch):
+    """process() of a synthetic model with the stub Blender, returns its result"""
+    for name in ('blender_249_path', 'blender_36_path'):
+        monkeypatch.setattr(converter, name, stub_blender)
+    for name in ('export_pool', 'timing_report', 'script_profiles'):
+        monkeypatch.setattr(converter, name, None)
+    monkeypatch.setattr(model_cache, '_cache_dir', None)
+
+    model_file = write_synthetic_model(str(tmp_path / 'models'), 'm1', 1, 30, 4, 3, ('walk', 'failing'))
+    output = tmp_path / 'output'
+    output.mkdir()
+
+    def run(all_in_one=False):
+        return converter.process(model_file, str(output), all_in_one, False, False, False, ['all'], False, jobs=1)
+    run.output = str(output)
+    return run
+
+def manifest(output):
+    with open(os.path.join(output, CACHE_MANIFEST)) as file:
+        return json.load(file)['units']
+
+
+def test_failed_export_is_not_cached(run, capsys):
+    assert run() == 'Error: 1 of 3 FBX exports failed.'
+    # the FBX of the failed export was written, but it is not recorded
+    assert os.path.exists(os.path.join(run.output, 'm1', 'm1_failing.fbx'))
+    units = manifest(run.output)
+    assert sorted(units) == ['m1/m1', 'm1/m1_failing', 'm1/m1_walk']
+    assert 'fbx' in units['m1/m1'] and 'fbx' in units['m1/m1_walk']
+    assert 'blend' in units['m1/m1_failing'] and 'fbx' not in units['m1/m1_failing']
+    capsys.readouterr()
+
+    # the second run exports only the failed .blend again, and fails again
+    assert run() == 'Error: 1 of 1 FBX exports failed.'
+    out = capsys.readouterr().out
+    assert 'All outputs are up to date' not in out
+    assert 'Cache: 2 of 3 outputs up to date, 1 rebuilt' in out
+    assert 'fbx' not in manifest(run.output)['m1/m1_failing']
+
+def test_all_in_one_outputs_are_cached(run, capsys):
+    # the mesh .blend and <mesh>_all.blend are the files the all in one import saves
+    assert run(all_in_one=True) == os.path.join(run.output, 'm1')
+    assert sorted(os.listdir(os.path.join(run.output, 'm1'))) == ['m1.blend', 'm1.fbx', 'm1_all.blend', 'm1_all.fbx']
+    units = manifest(run.output)
+    assert sorted(units) == ['m1/m1', 'm1/m1_all']
+    assert 'fbx' in units['m1/m1'] and 'fbx' in units['m1/m1_all']
+    capsys.readouterr()
+
+    assert run(all_in_one=True) == os.path.join(run.output, 'm1')
+    out = capsys.readouterr().out
+    assert 'All outputs are up to date' in out
+    assert 'Cache: 2 of 2 outputs up to date, 0 rebuilt' in out
@@ -0,0 +1,111 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Export server protocol of the converter, run against the stub Blender
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def pool(converter, stub_blender, monkeypatch):
+    monkeypatch.setattr(converter, 'blender_36_path', stub_blender)
+    monkeypatch.setattr(converter, 'export_pool', None)
+    monkeypatch.setattr(converter, 'timing_report', None)
+    monkeypatch.setattr(converter, 'script_profiles', None)
+    pool = converter.use_export_server(2)
+    yield pool
+    pool.close()
+
+def job(tmp_path, name):
+    return {'blend': str(tmp_path / 'blends' / f'{name}.blend'), 'out': str(tmp_path / 'fbx dir'), 'rmb': str(tmp_path / 'm001.rmb')}
+
+def test_default_command_is_argv(converter, pool, stub_blender):
+    assert pool.command == [stub_blender, '-b', '--python', './bpy36_export.py', '--', '--server']
+
+def test_ok_and_error_replies(converter, pool, tmp_path):
+    ok = job(tmp_path, 'm001_walk')
+    assert converter.export_blend_to_fbx(ok['blend'], ok['out'], ok['rmb']) == 0
+    assert os.path.exists(os.path.join(ok['out'], 'm001_walk.fbx'))
+
+    broken = job(tmp_path, 'm001_broken')
+    assert converter.export_blend_to_fbx(broken['blend'], broken['out'], broken['rmb']) == 1
+    reply = pool.run(broken)
+    assert reply['status'] == 'error'
+    assert 'm001_broken.blend' in reply['error']
+
+def test_error_event_fails_the_job(converter, pool, tmp_path):
+    # the reply is 'ok', the error event of the job makes it a failed export
+    failing = job(tmp_path, 'm001_failing')
+    assert converter.export_blend_to_fbx(failing['blend'], failing['out'], failing['rmb']) == 1
+    reply = pool.run(failing)
+    assert reply['status'] == 'error'
+    assert reply['error'] == f"Model not found: {failing['blend']}"
+
+    # the events of one job do not leak into the next one on the same worker
+    after = pool.run(job(tmp_path, 'm001_walk'))
+    assert after['status'] == 'ok'
+    assert after['pid'] == reply['pid']
+
+def test_workers_are_reused(pool, tmp_path):
+    pids = set([pool.run(job(tmp_path, f'm001_{i}'))['pid'] for i in range(5)])
+    # an error reply keeps the worker alive
+    pids.add(pool.run(job(tmp_path, 'm001_broken'))['pid'])
+    assert len(pids) == 1
+    assert len(pool.workers) == 1
+
+def test_concurrent_jobs_share_the_pool(pool, tmp_path):
+    replies = []
+    barrier = threading.Barrier(4)
+
+    def export(i):
+        barrier.wait()
+        for n in range(3):
+            replies.append(pool.run(job(tmp_path, f'm{i}_{n}')))
+
+    threads = [threading.Thread(target=export, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [reply['status'] for reply in replies] == ['ok'] * 12
+    # never more workers than the pool size
+    assert len(pool.workers) <= 2
+    assert len(set([reply['pid'] for reply in replies])) == len(pool.workers)
+
+def test_worker_dies_mid_job(pool, tmp_path):
+    first = pool.run(job(tmp_path, 'm001_walk'))
+    reply = pool.run(job(tmp_path, 'm001_crash'))
+    assert reply['status'] == 'error'
+    assert 'exited with code 3' in reply['error']
+
+    # the next job starts a new worker in the same slot
+    after = pool.run(job(tmp_path, 'm001_idle'))
+    assert after['status'] == 'ok'
+    assert after['pid'] != first['pid']
+    assert len(pool.workers) == 1
+
+def test_close_stops_the_workers(pool, tmp_path):
+    pool.run(job(tmp_path, 'm001_walk'))
+    workers = list(pool.workers)
+    pool.close()
+    assert pool.workers == [] and pool.idle == []
+    assert [worker.process for worker in workers] == [None]
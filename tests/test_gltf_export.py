@@ -0,0 +1,96 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: GLB files written by the native backend
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+import json
+import os
+import struct
+
+import pytest
+
+import gltf_export
+from conftest import Mesh, Skin, use_numpy
+from gltf_export import GLB_MAGIC, export_native_glb
+from rmb_rab_parser import Vectors
+from rmb_rab_writer import write_synthetic_model
+
+
+def read_glb_json(filepath):
+    with open(filepath, 'rb') as file:
+        data = file.read()
+    magic, version, length = struct.unpack_from('<4sII', data, 0)
+    assert (magic, version, length) == (GLB_MAGIC, 2, len(data))
+    chunk_length, _ = struct.unpack_from('<II', data, 12)
+    return json.loads(data[20:20 + chunk_length])
+
+def export_model(tmp_path, name, fallback=None):
+    model_dir = str(tmp_path / name)
+    txt_path = write_synthetic_model(model_dir, name, vertices=50, bone_count=4, keys=5, actions=())
+    if fallback:
+        for suffix in ('', '_sp', '_n'):
+            open(os.path.join(model_dir, 'texture', f'{name}_tex0{suffix}{fallback}'), 'wb').close()
+    written = export_native_glb(txt_path.replace('.txt', '.rmb'), [], str(tmp_path / 'output'))
+    return read_glb_json(written[0])
+
+def test_dds_without_fallback_requires_the_extension(tmp_path):
+    gltf = export_model(tmp_path, 'm101')
+    assert gltf['extensionsUsed'] == ['MSFT_texture_dds']
+    assert gltf['extensionsRequired'] == ['MSFT_texture_dds']
+    texture = gltf['textures'][0]
+    assert 'source' not in texture
+    assert gltf['images'][texture['extensions']['MSFT_texture_dds']['source']]['name'] == 'm101_tex0.dds'
+
+def test_dds_with_png_fallback(tmp_path):
+    gltf = export_model(tmp_path, 'm102', '.png')
+    assert gltf['extensionsUsed'] == ['MSFT_texture_dds']
+    assert 'extensionsRequired' not in gltf
+    # diffuse and normal map, each with its fallback
+    assert len(gltf['textures']) == 2
+    for texture in gltf['textures']:
+        fallback = gltf['images'][texture['source']]['name']
+        dds = gltf['images'][texture['extensions']['MSFT_texture_dds']['source']]['name']
+        assert fallback.endswith('.png') and dds == fallback.replace('.png', '.dds')
+
+def skin_bytes(mesh, bone_count):
+    joints, weights, component_type = gltf_export.skin_streams(mesh, bone_count, None)
+    return bytes(memoryview(joints).cast('B')), bytes(memoryview(weights).cast('B')), component_type
+
+@pytest.mark.parametrize('bone_map, indices, weights', [
+    ((2, 0, 1), [0, 1, 2, 0, 2, 2, 1, 0], [0.5, 0.25, 0.125, 0.125, 0.3, 0.3, 0.2, 0.1]),
+    # an index past the bone map, a bone past the skeleton and a vertex without weight
+    ((2, 0, 7), [0, 1, 2, 5, 2, 2, 1, 0], [0.5, 0.25, 0.25, 0.1, 0.0, 0.0, 0.0, 0.0]),
+])
+def test_skin_streams_match_numpy(monkeypatch, bone_map, indices, weights):
+    use_numpy(monkeypatch, True, gltf_export)
+    expected = skin_bytes(Mesh(Skin(bone_map, Vectors(array('f', weights), 4), Vectors(array('B', indices), 4))), 3)
+
+    use_numpy(monkeypatch, False, gltf_export)
+    # typed arrays of the parser and the lists of tuples of other callers
+    assert skin_bytes(Mesh(Skin(bone_map, Vectors(array('f', weights), 4), Vectors(array('B', indices), 4))), 3) == expected
+    assert skin_bytes(Mesh(Skin(bone_map, list(Vectors(array('f', weights), 4)), list(Vectors(array('B', indices), 4)))), 3) == expected
+
+def test_parser_arrays_are_written_without_a_copy(monkeypatch):
+    use_numpy(monkeypatch, False, gltf_export)
+    positions = Vectors(array('f', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]), 3)
+    assert gltf_export.stream(positions, gltf_export.GLTF_FLOAT, 3) is positions.data
+    # other types are converted into a new array
+    indices = array('i', [0, 1, 2])
+    data = gltf_export.stream(indices, gltf_export.GLTF_UNSIGNED_SHORT, 1)
+    assert data.typecode == 'H' and list(data) == [0, 1, 2]
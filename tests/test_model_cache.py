@@ -0,0 +1,172 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Model cache sidecars give the parsed data back, with and without numpy, and follow their source files
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+from array import array
+
+import pytest
+
+import model_cache
+import rmb_rab_parser
+from conftest import numpy, run_python2, use_numpy
+from rmb_rab_parser import Vectors
+from rmb_rab_writer import write_synthetic_model
+
+needs_numpy = pytest.mark.skipif(numpy is None, reason='numpy is not installed')
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Sidecar folder, and a count of the source files parsed instead of read from a sidecar"""
+    monkeypatch.setattr(model_cache, '_cache_dir', str(tmp_path / 'cache'))
+    parsed = []
+
+    def counted(parse):
+        def wrapper(filepath, *args, **kwargs):
+            parsed.append(os.path.basename(filepath))
+            return parse(filepath, *args, **kwargs)
+        return wrapper
+    monkeypatch.setattr(model_cache, 'parse_rmb_file', counted(model_cache.parse_rmb_file))
+    monkeypatch.setattr(model_cache, 'parse_rab_file', counted(model_cache.parse_rab_file))
+    return parsed
+
+@pytest.fixture
+def model_files(tmp_path):
+    write_synthetic_model(str(tmp_path / 'models'), 'm1', 2, 40, 5, 6, ('walk',), 1)
+    return str(tmp_path / 'models' / 'm1.rmb'), str(tmp_path / 'models' / 'm1_walk.rab')
+
+
+def values(rows):
+    """Python numbers of a column: vectors as tuples, flat columns as numbers"""
+    return [tuple([float(v) for v in row]) if not isinstance(row, (int, float)) and hasattr(row, '__len__') else float(row) for row in rows]
+
+def model_fields(model):
+    fields = {'model': (model.name, model.item_flag, model.data_offset, model.texture_dir)}
+    for texture in model.textures:
+        fields['texture', texture.name] = (texture.diffuse, texture.specular, texture.normal)
+    for bone in model.bones:
+        fields['bone', bone.name] = (bone.id, bone.parent_id, bone.parent_name, list(bone.matrix1), list(bone.matrix2), list(bone.matrix3))
+    for mesh in model.meshes:
+        fields['mesh', mesh.name] = (mesh.index, mesh.parent_bone, mesh.has_armature, mesh.texture_index, mesh.bone_map_count, mesh.vertices_count, mesh.indices_count, mesh.skin.bone_map)
+        for field in ('vert_pos_list', 'vert_norm_list', 'vert_uv_list', 'indice_list'):
+            fields[mesh.name, field] = values(getattr(mesh, field))
+        fields[mesh.name, 'weight_list'] = values(mesh.skin.weight_list)
+        fields[mesh.name, 'skin_indice_list'] = values(mesh.skin.indice_list)
+    return fields
+
+def action_fields(action):
+    fields = {'action': (action.name, action.model_name, action.anim_name, action.header, action.bones_count)}
+    for bone in action.bones:
+        fields['bone', bone.name] = (bone.pos_frame_count, bone.rot_frame_count)
+        for field in ('pos_frames', 'rot_frames', 'pos_frame_list', 'rot_frame_list', 'pos_key_list', 'rot_key_list', 'rot_accum_list'):
+            fields[bone.name, field] = values(getattr(bone, field))
+    return fields
+
+def load(filepath):
+    return model_cache.load_rmb(filepath) if filepath.endswith('.rmb') else model_cache.load_rab(filepath)
+
+def fields(data):
+    return model_fields(data) if isinstance(data, rmb_rab_parser.RMBModelData) else action_fields(data)
+
+
+@pytest.mark.parametrize('kind', ['rmb', 'rab'])
+@pytest.mark.parametrize('build_numpy, read_numpy', [(True, True), (True, False), (False, True), (False, False)],
+                         ids=['numpy', 'numpy sidecar read without numpy', 'typed array sidecar read with numpy', 'typed arrays'])
+def test_sidecar_gives_the_parsed_data(cache, model_files, monkeypatch, kind, build_numpy, read_numpy):
+    filepath = model_files[0] if kind == 'rmb' else model_files[1]
+    use_numpy(monkeypatch, build_numpy, rmb_rab_parser, model_cache)
+    # a miss parses the source file and writes the sidecar
+    parsed = fields(load(filepath))
+    assert os.path.exists(model_cache.sidecar_path(filepath))
+
+    use_numpy(monkeypatch, read_numpy, rmb_rab_parser, model_cache)
+    cached = load(filepath)
+    assert cache == [os.path.basename(filepath)]
+    assert fields(cached) == parsed
+
+    if not read_numpy:
+        columns = [cached.meshes[0].vert_pos_list, cached.meshes[0].indice_list] if kind == 'rmb' else [cached.bones[0].rot_accum_list, cached.bones[0].pos_frames]
+        assert [type(column) for column in columns] == [Vectors, array]
+
+def test_sidecar_is_kept_when_only_the_mtime_changes(cache, model_files):
+    rmb_file = model_files[0]
+    first = model_fields(load(rmb_file))
+    st = os.stat(rmb_file)
+    os.utime(rmb_file, (st.st_atime, st.st_mtime + 10))
+
+    # same size, the sha256 of the content decides
+    assert model_fields(load(rmb_file)) == first
+    assert cache == ['m1.rmb']
+
+@pytest.mark.parametrize('change', ['content', 'size'])
+def test_sidecar_is_rebuilt_when_the_source_changes(cache, model_files, tmp_path, change):
+    rmb_file, rab_file = model_files
+    first = [model_fields(load(rmb_file)), action_fields(load(rab_file))]
+
+    # another seed keeps every count (same size), more vertices and keys change the size
+    if change == 'content':
+        write_synthetic_model(str(tmp_path / 'models'), 'm1', 2, 40, 5, 6, ('walk',), 2)
+    else:
+        write_synthetic_model(str(tmp_path / 'models'), 'm1', 2, 41, 5, 7, ('walk',), 1)
+    for filepath in model_files:
+        st = os.stat(filepath)
+        os.utime(filepath, (st.st_atime, st.st_mtime + 10))
+
+    second = [model_fields(load(rmb_file)), action_fields(load(rab_file))]
+    assert second == [model_fields(rmb_rab_parser.load_rmb(rmb_file)), action_fields(rmb_rab_parser.load_rab(rab_file))]
+    assert second[0] != first[0] and second[1] != first[1]
+    assert cache == ['m1.rmb', 'm1_walk.rab'] * 2
+
+    # and the new sidecar is used from then on
+    load(rmb_file)
+    load(rab_file)
+    assert len(cache) == 4
+
+def test_broken_sidecar_is_rebuilt(cache, model_files):
+    rmb_file = model_files[0]
+    load(rmb_file)
+    with open(model_cache.sidecar_path(rmb_file), 'r+b') as file:
+        file.write(b'XXXX')
+
+    assert model_fields(load(rmb_file)) == model_fields(rmb_rab_parser.load_rmb(rmb_file))
+    load(rmb_file)
+    assert cache == ['m1.rmb', 'm1.rmb']
+
+@needs_numpy
+def test_python2_reads_a_numpy_sidecar(python2, cache, model_files):
+    # Blender 2.49 reads the sidecars the converter builds with numpy, with Python 2 and without numpy
+    rmb_file, rab_file = model_files
+    model, action = load(rmb_file), load(rab_file)
+    output = run_python2(python2, """
+import json
+import model_cache
+model_cache.set_cache_dir({0!r})
+assert model_cache.open_sidecar({1!r}, 'rmb') is not None
+model = model_cache.load_rmb({1!r})
+action = model_cache.load_rab({2!r})
+mesh = model.meshes[1]
+print(json.dumps([mesh.name, mesh.vert_pos_list[7], list(mesh.indice_list[:9]), mesh.skin.weight_list[3], action.bones[2].rot_accum_list[5]]))
+""".format(model_cache._cache_dir, rmb_file, rab_file))
+
+    mesh = model.meshes[1]
+    expected = [mesh.name, list(values(mesh.vert_pos_list)[7]), [int(v) for v in mesh.indice_list[:9]],
+                list(values(mesh.skin.weight_list)[3]), list(values(action.bones[2].rot_accum_list)[5])]
+    assert json.loads(output) == expected
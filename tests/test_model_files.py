@@ -0,0 +1,43 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Model .txt/.rmb inputs resolve to absolute .rmb/.rab paths
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+
+import pytest
+
+from rmb_rab_writer import write_synthetic_model
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    write_synthetic_model(str(tmp_path / 'models'), 'm1', 1, 10, 2, 2, ('walk', 'idle'))
+    # the converter is started from the folder above the models, with relative paths
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'models'
+
+@pytest.mark.parametrize('input_file', [os.path.join('models', 'm1.txt'), os.path.join('models', 'm1.rmb')])
+def test_relative_inputs_resolve_to_absolute_paths(converter, models, input_file):
+    rmb_file, rab_files = converter.resolve_model_files(input_file, False, ['all'], verbose=False)
+    assert rmb_file == str(models / 'm1.rmb')
+    assert rab_files == [str(models / 'm1_idle.rab'), str(models / 'm1_walk.rab')]
+
+def test_rmb_without_config(converter, models):
+    os.remove(models / 'm1.txt')
+    assert converter.resolve_model_files(os.path.join('models', 'm1.rmb'), False, ['all'], verbose=False) == (str(models / 'm1.rmb'), [])
@@ -0,0 +1,261 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Native FBX writer: the numpy and the typed array paths give the same data, and exported files read back
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from collections import Counter
+import os
+import struct
+import zlib
+
+import pytest
+
+import fbx_binary
+import model_cache
+import native_export
+from conftest import Mesh, Skin, use_numpy
+from fbx_binary import FBX_ALWAYS_NULL_RECORD, FBX_ARRAY_TYPES, FBX_FOOT_ID, FBX_FOOT_MAGIC, FBX_HEAD_MAGIC, FBX_NODE_HEADER, FBX_NULL_RECORD, FBX_VERSION
+from native_export import export_native_fbx
+from rmb_rab_parser import Vectors, load_rmb
+from rmb_rab_writer import write_synthetic_model
+
+FBX_SCALARS = {b'C': '<?', b'Y': '<h', b'I': '<i', b'L': '<q', b'F': '<f', b'D': '<d'}
+
+MESHES = 2
+VERTICES = 40
+BONES = 5
+KEYS = 6
+ACTIONS = ('walk', 'idle')
+
+
+def as_lists(clusters):
+    return dict([(bone, ([int(v) for v in vertices], [float(w) for w in weights])) for bone, (vertices, weights) in clusters.items()])
+
+@pytest.mark.parametrize('bone_map', [(), (2, 0, 1), (2, 0)])
+def test_skin_clusters_match_numpy(monkeypatch, bone_map):
+    # a zero weight, a bone listed twice for a vertex and an index past a short bone map
+    weights = array('f', [0.5, 0.25, 0.25, 0.0, 0.75, 0.125, 0.125, 0.5])
+    indices = array('B', [0, 1, 2, 0, 1, 1, 2, 0])
+    bones = [None] * 3
+
+    use_numpy(monkeypatch, True, native_export)
+    expected = as_lists(native_export.skin_clusters(Mesh(Skin(bone_map, Vectors(weights, 4), Vectors(indices, 4))), bones, None))
+    use_numpy(monkeypatch, False, native_export)
+    assert as_lists(native_export.skin_clusters(Mesh(Skin(bone_map, Vectors(weights, 4), Vectors(indices, 4))), bones, None)) == expected
+    assert as_lists(native_export.skin_clusters(Mesh(Skin(bone_map, list(Vectors(weights, 4)), list(Vectors(indices, 4)))), bones, None)) == expected
+
+def test_uvs_match_numpy(monkeypatch):
+    uvs = Vectors(array('f', [0.0, 0.25, 1.0, 0.5]), 2)
+    use_numpy(monkeypatch, True, native_export)
+    expected = native_export.mesh_uvs(Mesh(vert_uv_list=uvs)).ravel().tolist()
+    use_numpy(monkeypatch, False, native_export)
+    assert list(native_export.mesh_uvs(Mesh(vert_uv_list=uvs))) == expected
+    assert [value for uv in native_export.mesh_uvs(Mesh(vert_uv_list=list(uvs))) for value in uv] == expected
+
+@pytest.mark.parametrize('code, values', [
+    ('d', Vectors(array('f', [1.5, 2.0, -3.25]), 3)),
+    ('d', array('d', [1.5, 2.0, -3.25])),
+    ('i', array('i', [0, 1, ~2])),
+    ('i', [(0, 1, ~2)]),
+])
+def test_pack_array_matches_numpy(monkeypatch, code, values):
+    use_numpy(monkeypatch, True, fbx_binary)
+    expected = fbx_binary.pack_array(code, values)
+    use_numpy(monkeypatch, False, fbx_binary)
+    assert fbx_binary.pack_array(code, values) == expected
+
+
+class Node():
+    """Node read back from a binary FBX file"""
+    def __init__(self, name, props, elems):
+        self.name = name
+        self.props = props
+        self.elems = elems
+
+    def all(self, name):
+        return [elem for elem in self.elems if elem.name == name]
+
+    def one(self, name):
+        elems = self.all(name)
+        assert len(elems) == 1, name
+        return elems[0]
+
+def read_props(data, offset, count, encodings):
+    """`count` properties at `offset` -> (values, end), arrays are decoded into lists"""
+    props = []
+    for _ in range(count):
+        code = data[offset:offset + 1]
+        offset += 1
+        if code in FBX_SCALARS:
+            props.append(struct.unpack_from(FBX_SCALARS[code], data, offset)[0])
+            offset += struct.calcsize(FBX_SCALARS[code])
+        elif code in (b'S', b'R'):
+            length, = struct.unpack_from('<I', data, offset)
+            props.append(data[offset + 4:offset + 4 + length])
+            offset += 4 + length
+        else:
+            count, encoding, length = struct.unpack_from('<III', data, offset)
+            raw = data[offset + 12:offset + 12 + length]
+            assert len(raw) == length
+            offset += 12 + length
+            if encoding == 1:
+                raw = zlib.decompress(raw)
+            else:
+                assert encoding == 0
+            encodings.add(encoding)
+            # the stored count matches the decoded length
+            fmt = '<{0}{1}'.format(count, FBX_ARRAY_TYPES[code.decode('ascii')][0])
+            assert len(raw) == struct.calcsize(fmt)
+            props.append(list(struct.unpack(fmt, raw)))
+    return props, offset
+
+def read_node(data, offset, encodings):
+    """Node at `offset` -> (node, end), (None, end) for the null record ending a list of nodes"""
+    end, prop_count, prop_length, name_length = FBX_NODE_HEADER.unpack_from(data, offset)
+    if end == 0:
+        assert data[offset:offset + FBX_NODE_HEADER.size] == FBX_NULL_RECORD
+        return None, offset + FBX_NODE_HEADER.size
+
+    start = offset + FBX_NODE_HEADER.size + name_length
+    name = data[start - name_length:start]
+    props, offset = read_props(data, start, prop_count, encodings)
+    assert offset - start == prop_length
+
+    elems = []
+    closed = False
+    while offset < end:
+        elem, offset = read_node(data, offset, encodings)
+        if elem is None:
+            closed = True
+            break
+        elems.append(elem)
+    # the children end inside their parent, which ends right after the null record
+    assert offset == end
+    assert closed == bool(elems or not props or name in FBX_ALWAYS_NULL_RECORD)
+    return Node(name, props, elems), end
+
+def read_fbx(filepath):
+    """Top level nodes of a binary FBX file as a root Node, and the array encodings used"""
+    with open(filepath, 'rb') as file:
+        data = file.read()
+    assert data.startswith(FBX_HEAD_MAGIC)
+    assert struct.unpack_from('<I', data, len(FBX_HEAD_MAGIC)) == (FBX_VERSION,)
+
+    offset = len(FBX_HEAD_MAGIC) + 4
+    elems = []
+    encodings = set()
+    while True:
+        elem, offset = read_node(data, offset, encodings)
+        if elem is None:
+            break
+        elems.append(elem)
+
+    # footer id, the version at a 16 byte boundary, 120 zero bytes and the footer magic
+    assert data[offset:offset + len(FBX_FOOT_ID)] == FBX_FOOT_ID
+    version_offset = len(data) - len(FBX_FOOT_MAGIC) - 124
+    assert version_offset % 16 == 0
+    assert struct.unpack_from('<I', data, version_offset) == (FBX_VERSION,)
+    assert data[version_offset + 4:] == b'\x00' * 120 + FBX_FOOT_MAGIC
+    return Node(b'', [], elems), encodings
+
+def object_name(elem):
+    return elem.props[1].split(b'\x00\x01')[0].decode('utf-8')
+
+
+@pytest.fixture(scope='module')
+def model_files(tmp_path_factory):
+    dirname = str(tmp_path_factory.mktemp('model'))
+    write_synthetic_model(dirname, 'm1', MESHES, VERTICES, BONES, KEYS, ACTIONS, 2)
+    return os.path.join(dirname, 'm1.rmb'), [os.path.join(dirname, f'm1_{action}.rab') for action in ACTIONS]
+
+@pytest.mark.parametrize('all_in_one, compress', [(False, False), (True, False), (False, True)], ids=['per action', 'all in one', 'compressed arrays'])
+def test_exported_files_read_back(tmp_path, monkeypatch, model_files, all_in_one, compress):
+    monkeypatch.setattr(model_cache, '_cache_dir', None)
+    if compress:
+        monkeypatch.setattr(fbx_binary, 'FBX_COMPRESS_MIN', 0)
+    rmb_file, rab_files = model_files
+    written = export_native_fbx(rmb_file, rab_files, str(tmp_path), all_in_one)
+
+    if all_in_one:
+        files = {'m1.fbx': [], 'm1_all.fbx': list(ACTIONS)}
+    else:
+        files = {'m1.fbx': [], 'm1_walk.fbx': ['walk'], 'm1_idle.fbx': ['idle']}
+    assert [os.path.basename(filepath) for filepath in written] == list(files)
+
+    parsed = load_rmb(rmb_file)
+    clusters = sum([len(set([mesh.skin.bone_map[int(i)] for row in mesh.skin.indice_list for i in row])) for mesh in parsed.meshes])
+    # diffuse, specular and normal map placeholders for each mesh material
+    textures = 3 * MESHES
+
+    for filepath in written:
+        root, encodings = read_fbx(filepath)
+        assert encodings == ({1} if compress else {0})
+        assert root.one(b'FBXHeaderExtension').one(b'FBXVersion').props == [FBX_VERSION]
+
+        actions = files[os.path.basename(filepath)]
+        curve_nodes = 2 * BONES * len(actions)
+        expected = {
+            b'NodeAttribute': 1 + BONES,
+            b'Model': 1 + BONES + MESHES,
+            b'Geometry': MESHES,
+            b'Material': MESHES,
+            b'Texture': textures,
+            b'Video': textures,
+            b'Deformer': MESHES + clusters,
+            b'Pose': 1,
+            b'AnimationStack': len(actions),
+            b'AnimationLayer': len(actions),
+            b'AnimationCurveNode': curve_nodes,
+            b'AnimationCurve': 3 * curve_nodes,
+        }
+        expected = dict([(kind, count) for kind, count in expected.items() if count])
+        objects = root.one(b'Objects')
+        assert Counter([elem.name for elem in objects.elems]) == expected
+
+        definitions = root.one(b'Definitions')
+        counts = dict([(elem.props[0], elem.one(b'Count').props[0]) for elem in definitions.all(b'ObjectType')])
+        assert counts == dict(list(expected.items()) + [(b'GlobalSettings', 1)])
+        assert definitions.one(b'Count').props == [sum(expected.values()) + 1]
+
+        # every object but the pose and the stacks hangs below one parent, the diffuse texture
+        # also drives the emission, curve nodes are bound to a bone and the bones to their clusters
+        connections = root.one(b'Connections').all(b'C')
+        assert len(connections) == sum(expected.values()) - 1 - len(actions) + MESHES + curve_nodes + clusters
+        ids = set([elem.props[0] for elem in objects.elems] + [0])
+        for c in connections:
+            assert c.props[0] in (b'OO', b'OP') and c.props[1] in ids and c.props[2] in ids
+
+        for geometry in objects.all(b'Geometry'):
+            assert len(geometry.one(b'Vertices').props[0]) == 3 * VERTICES
+            indices = geometry.one(b'PolygonVertexIndex').props[0]
+            assert len(indices) == 3 * (VERTICES - 2)
+            assert all([index < 0 for index in indices[2::3]]) and all([index >= 0 for index in indices[0::3] + indices[1::3]])
+            assert len(geometry.one(b'LayerElementNormal').one(b'Normals').props[0]) == 3 * VERTICES
+            assert len(geometry.one(b'LayerElementUV').one(b'UV').props[0]) == 2 * VERTICES
+        for deformer in objects.all(b'Deformer'):
+            if deformer.props[2] == b'Cluster':
+                assert len(deformer.one(b'Indexes').props[0]) == len(deformer.one(b'Weights').props[0]) > 0
+                assert len(deformer.one(b'TransformLink').props[0]) == 16
+        pose = objects.one(b'Pose')
+        assert pose.one(b'NbPoseNodes').props == [BONES + MESHES] and len(pose.all(b'PoseNode')) == BONES + MESHES
+        for curve in objects.all(b'AnimationCurve'):
+            assert len(curve.one(b'KeyTime').props[0]) == len(curve.one(b'KeyValueFloat').props[0]) == KEYS
+
+        assert [object_name(elem) for elem in objects.all(b'AnimationStack')] == actions
+        assert [take.props[0].decode('utf-8') for take in root.one(b'Takes').all(b'Take')] == actions
@@ -0,0 +1,174 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Dry run job plans: the job graph of a model, its commands and the cost totals
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+
+import pytest
+
+from model_cache import MODEL_CACHE_DIR
+from rmb_rab_writer import write_synthetic_model
+
+MESHES = 2
+VERTICES = 100
+BONES = 4
+KEYS = 10
+# sorted like the .txt config actions: idle, run, walk
+ACTIONS = ('walk', 'idle', 'run')
+
+
+@pytest.fixture
+def model(converter, tmp_path, monkeypatch):
+    """Synthetic model and the paths its plans refer to, the Blender commands start with blender249/blender36"""
+    monkeypatch.setattr(converter, 'blender_249_path', 'blender249')
+    monkeypatch.setattr(converter, 'blender_36_path', 'blender36')
+    monkeypatch.setattr(converter, 'script_profiles', None)
+
+    dirname = str(tmp_path / 'models')
+    model = {
+        'txt': write_synthetic_model(dirname, 'm1', MESHES, VERTICES, BONES, KEYS, ACTIONS),
+        'rmb': os.path.join(dirname, 'm1.rmb'),
+        'output': str(tmp_path / 'output'),
+        'textures': [os.path.join(dirname, 'texture', f'm1_tex0{suffix}.dds') for suffix in ('', '_sp', '_n')],
+    }
+    for action in ACTIONS:
+        model[action] = os.path.join(dirname, f'm1_{action}.rab')
+    model['cache_args'] = ['--texture-cache', os.path.join(model['output'], 'texture_index.json'), '--model-cache', os.path.join(model['output'], MODEL_CACHE_DIR)]
+    return model
+
+def check_job(converter, job, process, command, sources, inputs, outputs, depends_on=()):
+    """`sources` are the .rmb and then the .rab files the job converts"""
+    # every bone has a position and a rotation key per frame
+    vertices = MESHES * VERTICES
+    keys = 2 * BONES * KEYS * (len(sources) - 1)
+    costs = converter.PLAN_COSTS[process]
+    assert job['process'] == process
+    assert job['command'] == command
+    assert job['inputs'] == inputs
+    assert job['outputs'] == outputs
+    assert job['depends_on'] == list(depends_on)
+    assert job['bytes'] == sum([os.path.getsize(filepath) for filepath in sources])
+    assert (job['vertices'], job['keys']) == (vertices, keys)
+    assert job['cost'] == round(costs['startup'] + costs['vertex'] * vertices + costs['key'] * keys, 3)
+
+def check_totals(plan, critical_path):
+    costs = {}
+    for job in plan['jobs']:
+        costs[job['process']] = costs.get(job['process'], 0.0) + job['cost']
+    assert plan['totals'] == {
+        'models': len(plan['models']),
+        'jobs': len(plan['jobs']),
+        'bytes': sum([model['bytes'] for model in plan['models']]),
+        'cost': round(sum(costs.values()), 3),
+        'cost_by_process': dict([(process, round(value, 3)) for process, value in sorted(costs.items())]),
+        'critical_path': round(critical_path, 3),
+    }
+
+def export_job(converter, model, job, name, sources, depends_on):
+    blend_file = os.path.join(model['output'], 'm1', f'{name}.blend')
+    command = ['blender36', '-b', blend_file, '--python', './bpy36_export.py', '--', '--out', os.path.join(model['output'], 'm1'), '--rmb', model['rmb']] + model['cache_args']
+    check_job(converter, job, 'blender36', command, sources, [blend_file, model['rmb']] + model['textures'],
+              [os.path.join(model['output'], 'm1', f'{name}.fbx')], depends_on)
+
+
+def test_per_action_sessions(converter, model):
+    plan = converter.plan_jobs([model['txt']], model['output'], anim_types=['all'], jobs=2).to_dict()
+    assert plan['errors'] == []
+    assert [(job['id'], job['kind']) for job in plan['jobs']] == [('m1/import/0', 'import'), ('m1/import/1', 'import')] + [(f'm1/export/{i}', 'export') for i in range(4)]
+    jobs = dict([(job['id'], job) for job in plan['jobs']])
+    rmb, idle, run, walk = model['rmb'], model['idle'], model['run'], model['walk']
+
+    def blend(name):
+        return os.path.join(model['output'], 'm1', f'{name}.blend')
+
+    # the actions are split round robin over 2 sessions, the first one also saves the mesh
+    session_command = ['blender249', '-b', '-P', './bpy249_import.py', '--', '--out', model['output'], '--rmb', rmb]
+    check_job(converter, jobs['m1/import/0'], 'blender249', session_command + ['--rab', idle, '--rab', walk, '--session'] + model['cache_args'],
+              [rmb, idle, walk], [rmb, idle, walk] + model['textures'], [blend('m1'), blend('m1_idle'), blend('m1_walk')])
+    check_job(converter, jobs['m1/import/1'], 'blender249', session_command + ['--rab', run, '--session', '--skip-mesh'] + model['cache_args'],
+              [rmb, run], [rmb, run] + model['textures'], [blend('m1_run')])
+
+    # one export per .blend, after the session writing it
+    export_job(converter, model, jobs['m1/export/0'], 'm1', [rmb], ['m1/import/0'])
+    export_job(converter, model, jobs['m1/export/1'], 'm1_idle', [rmb, idle], ['m1/import/0'])
+    export_job(converter, model, jobs['m1/export/2'], 'm1_run', [rmb, run], ['m1/import/1'])
+    export_job(converter, model, jobs['m1/export/3'], 'm1_walk', [rmb, walk], ['m1/import/0'])
+
+    assert plan['models'] == [{'name': 'm1', 'input': model['txt'], 'rmb': rmb, 'rabs': [idle, run, walk], 'textures': model['textures'],
+                               'bytes': sum([os.path.getsize(filepath) for filepath in (rmb, idle, run, walk)])}]
+    # the slower session and its slowest export
+    critical_path = max([jobs['m1/import/0']['cost'] + jobs[f'm1/export/{i}']['cost'] for i in (0, 1, 3)] + [jobs['m1/import/1']['cost'] + jobs['m1/export/2']['cost']])
+    check_totals(plan, critical_path)
+
+def test_all_in_one_import(converter, model):
+    plan = converter.plan_jobs([model['txt']], model['output'], all_in_one=True, anim_types=['all'], jobs=2).to_dict()
+    assert [job['id'] for job in plan['jobs']] == ['m1/import/0', 'm1/export/0', 'm1/export/1']
+    jobs = dict([(job['id'], job) for job in plan['jobs']])
+    sources = [model['rmb'], model['idle'], model['run'], model['walk']]
+
+    # one Blender 2.49 import without sessions saves <rmb>.blend and <rmb>_all.blend
+    command = ['blender249', '-b', '-P', './bpy249_import.py', '--', '--out', model['output'], '--rmb', model['rmb'],
+               '--rab', model['idle'], '--rab', model['run'], '--rab', model['walk']] + model['cache_args']
+    check_job(converter, jobs['m1/import/0'], 'blender249', command, sources, sources + model['textures'],
+              [os.path.join(model['output'], 'm1', 'm1.blend'), os.path.join(model['output'], 'm1', 'm1_all.blend')])
+    export_job(converter, model, jobs['m1/export/0'], 'm1', sources[:1], ['m1/import/0'])
+    export_job(converter, model, jobs['m1/export/1'], 'm1_all', sources, ['m1/import/0'])
+
+    check_totals(plan, jobs['m1/import/0']['cost'] + jobs['m1/export/1']['cost'])
+
+def test_anim_types_and_export_only(converter, model):
+    plan = converter.plan_jobs([model['txt']], model['output'], anim_types=['walk'], rmb2blend=False).to_dict()
+    # the .blend files are not written by the plan, the exports depend on nothing
+    assert [job['id'] for job in plan['jobs']] == ['m1/export/0', 'm1/export/1']
+    assert [job['outputs'] for job in plan['jobs']] == [[os.path.join(model['output'], 'm1', f'{name}.fbx')] for name in ('m1', 'm1_walk')]
+    assert [job['depends_on'] for job in plan['jobs']] == [[], []]
+    check_totals(plan, max([job['cost'] for job in plan['jobs']]))
+
+def test_native_backend(converter, model):
+    plan = converter.plan_jobs([model['txt']], model['output'], anim_types=['all'], backend='native', output_format='glb').to_dict()
+    assert [job['id'] for job in plan['jobs']] == ['m1/native/0']
+    job = plan['jobs'][0]
+    sources = [model['rmb'], model['idle'], model['run'], model['walk']]
+    command = converter.converter_command() + ['-i', model['txt'], '-o', model['output'], '--backend', 'native', '--format', 'glb', '--anim-types', 'all']
+    outputs = [os.path.join(model['output'], 'm1', f'{name}.glb') for name in ('m1', 'm1_idle', 'm1_run', 'm1_walk')]
+    check_job(converter, job, 'converter', command, sources, sources + model['textures'], outputs)
+    check_totals(plan, job['cost'])
+
+def test_unreadable_models_are_errors(converter, model):
+    missing = os.path.join(os.path.dirname(model['txt']), 'missing.txt')
+    plan = converter.plan_jobs([missing, model['txt']], model['output'], anim_types=['all'], jobs=4).to_dict()
+    assert [error['input'] for error in plan['errors']] == [missing]
+    # the 4 workers are spread over both inputs, the readable model gets 2 sessions
+    assert [job['id'] for job in plan['jobs'] if job['kind'] == 'import'] == ['m1/import/0', 'm1/import/1']
+    assert plan['totals']['models'] == 1
+
+def test_write_plan(converter, model, tmp_path, capsys):
+    plan = converter.plan_jobs([model['txt']], model['output'], anim_types=['all'], jobs=1)
+    expected = json.loads(json.dumps(plan.to_dict()))
+
+    converter.write_plan(plan, str(tmp_path / 'plan.json'))
+    with open(tmp_path / 'plan.json') as file:
+        assert json.load(file) == expected
+    assert capsys.readouterr().out == ''
+
+    # stdout holds the JSON only
+    converter.write_plan(plan, '-')
+    assert json.loads(capsys.readouterr().out) == expected
+    assert expected['version'] == converter.PLAN_VERSION and expected['costs'] == converter.PLAN_COSTS
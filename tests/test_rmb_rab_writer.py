@@ -0,0 +1,139 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Synthetic .rmb/.rab files written by rmb_rab_writer round-trip through the parser
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+from array import array
+
+import pytest
+
+import model_cache
+import rmb_rab_parser
+import rmb_rab_writer
+from rmb_rab_parser import load_rab, load_rmb
+from rmb_rab_writer import synthetic_rab, synthetic_rmb, write_rab, write_rmb, write_synthetic_model
+
+MESHES = 2
+VERTICES = 50
+BONES = 5
+KEYS = 7
+SEED = 3
+
+
+@pytest.fixture(params=['numpy', 'typed arrays', 'mmap'])
+def mode(request, monkeypatch):
+    """Write and parse with numpy, without numpy (lists and typed arrays), or with memory mapped numpy views"""
+    if request.param == 'typed arrays':
+        for module in (rmb_rab_parser, rmb_rab_writer, model_cache):
+            monkeypatch.setattr(module, 'numpy', None)
+    elif rmb_rab_parser.numpy is None:
+        pytest.skip('numpy is not installed')
+    return request.param
+
+@pytest.fixture
+def model_dir(tmp_path, mode):
+    write_synthetic_model(str(tmp_path), 'm1', MESHES, VERTICES, BONES, KEYS, ('walk',), SEED)
+    return str(tmp_path)
+
+
+def flat(rows, code='f'):
+    """Rows (numpy array, Vectors or list of tuples) as a flat typed array, floats rounded to float32"""
+    values = []
+    for row in rows:
+        values.extend([float(v) for v in row] if code in 'fd' else [int(v) for v in row])
+    return array(code, values)
+
+def quat_products(keys):
+    # plain running product q0 * q1 * ... * qj, key by key
+    result = []
+    for x, y, z, w in [[float(v) for v in key] for key in keys]:
+        if result:
+            ax, ay, az, aw = result[-1]
+            x, y, z, w = (
+                aw*x + ax*w + ay*z - az*y,
+                aw*y - ax*z + ay*w + az*x,
+                aw*z + ax*y - ay*x + az*w,
+                aw*w - ax*x - ay*y - az*z,
+            )
+        result.append((x, y, z, w))
+    return result
+
+
+def test_rmb_round_trip(model_dir, mode):
+    expected = synthetic_rmb('m1', MESHES, VERTICES, BONES, seed=SEED)
+    model = load_rmb(os.path.join(model_dir, 'm1.rmb'), use_mmap=mode == 'mmap')
+
+    assert (model.name, model.item_flag, model.data_offset) == ('m1', expected.item_flag, expected.data_offset)
+    assert [texture.name for texture in model.textures] == [texture.name for texture in expected.textures]
+    assert model.textures[0].diffuse == os.path.join(model_dir, 'texture', 'm1_tex0.dds')
+    assert model.textures[0].normal == os.path.join(model_dir, 'texture', 'm1_tex0_n.dds')
+
+    assert len(model.bones) == BONES
+    for bone, expected_bone in zip(model.bones, expected.bones):
+        assert (bone.id, bone.parent_id, bone.name, bone.parent_name) == (expected_bone.id, expected_bone.parent_id, expected_bone.name, expected_bone.parent_name)
+        assert (bone.matrix1, bone.matrix2, bone.matrix3) == (expected_bone.matrix1, expected_bone.matrix2, expected_bone.matrix3)
+
+    assert len(model.meshes) == MESHES
+    for mesh, expected_mesh in zip(model.meshes, expected.meshes):
+        assert (mesh.index, mesh.name, mesh.parent_bone, mesh.has_armature, mesh.texture_index) == \
+            (expected_mesh.index, expected_mesh.name, expected_mesh.parent_bone, expected_mesh.has_armature, expected_mesh.texture_index)
+        assert (mesh.vertices_count, mesh.indices_count, mesh.bone_map_count) == (VERTICES, (VERTICES - 2) * 3, BONES)
+        assert len(mesh.vert_pos_list) == len(mesh.vert_norm_list) == len(mesh.vert_uv_list) == VERTICES
+
+        assert flat(mesh.vert_pos_list) == flat(expected_mesh.vert_pos_list)
+        assert flat(mesh.vert_norm_list) == flat(expected_mesh.vert_norm_list)
+        assert flat(mesh.vert_uv_list) == flat(expected_mesh.vert_uv_list)
+        assert array('H', [int(v) for v in mesh.indice_list]) == array('H', [int(v) for v in expected_mesh.indice_list])
+
+        assert mesh.skin.bone_map == expected_mesh.skin.bone_map
+        assert flat(mesh.skin.weight_list) == flat(expected_mesh.skin.weight_list)
+        assert flat(mesh.skin.indice_list, 'B') == flat(expected_mesh.skin.indice_list, 'B')
+
+def test_rab_round_trip(model_dir, mode):
+    bone_names = ['bone{0:03d}'.format(i) for i in range(BONES)]
+    expected = synthetic_rab('m1_walk', bone_names, KEYS, SEED + 1)
+    action = load_rab(os.path.join(model_dir, 'm1_walk.rab'), use_mmap=mode == 'mmap')
+
+    assert (action.model_name, action.anim_name, action.bones_count) == ('m1', 'walk', BONES)
+    assert action.header == expected.header
+    assert [bone.name for bone in action.bones] == bone_names
+
+    for bone, expected_bone in zip(action.bones, expected.bones):
+        assert (bone.pos_frame_count, bone.rot_frame_count) == (KEYS, KEYS)
+        assert [int(v) for v in bone.pos_frames] == [int(v) for v in expected_bone.pos_frames]
+        assert [int(v) for v in bone.rot_frames] == [int(v) for v in expected_bone.rot_frames]
+        assert [int(v) for v in bone.pos_frame_list] == list(range(KEYS))
+        assert [int(v) for v in bone.rot_frame_list] == list(range(KEYS))
+        assert flat(bone.pos_key_list) == flat(expected_bone.pos_key_list)
+        assert flat(bone.rot_key_list) == flat(expected_bone.rot_key_list)
+
+        # the parsed keys are float32, accumulate them the plain way and compare with the parser
+        assert len(bone.rot_accum_list) == KEYS
+        accum = flat(bone.rot_accum_list, 'd')
+        assert list(accum) == pytest.approx(list(flat(quat_products(bone.rot_key_list), 'd')), abs=1e-12)
+        assert list(accum) == pytest.approx(list(flat(expected_bone.rot_accum_list, 'd')), abs=1e-6)
+
+def test_rewrite_is_byte_identical(model_dir, mode, tmp_path):
+    use_mmap = mode == 'mmap'
+    for filename, load, write in (('m1.rmb', load_rmb, write_rmb), ('m1_walk.rab', load_rab, write_rab)):
+        path = os.path.join(model_dir, filename)
+        copy = str(tmp_path / ('copy_' + filename))
+        write(copy, load(path, use_mmap=use_mmap))
+        with open(path, 'rb') as original, open(copy, 'rb') as rewritten:
+            assert rewritten.read() == original.read()
@@ -0,0 +1,89 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Profiling of the Blender script jobs with --profile, run against the stub Blender
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import pstats
+import shutil
+
+# m001_walk.blender249.prof was written by script_profiler under Python 2.7.18, the
+# Python of Blender 2.49, profiling work(10000) defined in a script read from stdin
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+PYTHON2_PROFILE = os.path.join(DATA_DIR, 'm001_walk.blender249.prof')
+
+
+def test_commands_are_argv_lists(converter, monkeypatch):
+    monkeypatch.setattr(converter, 'blender_249_path', 'C:/Program Files/Blender 2.49/blender.exe')
+    monkeypatch.setattr(converter, 'script_profiles', None)
+    command = converter.session_249_command('out dir', 'a b/m001.rmb', ['a b/m001_walk.rab'], False, 'out dir/texture_index.json')
+
+    assert command[0] == 'C:/Program Files/Blender 2.49/blender.exe'
+    assert command[command.index('--rmb') + 1] == 'a b/m001.rmb'
+    assert command[command.index('--rab') + 1] == 'a b/m001_walk.rab'
+    assert command[command.index('--texture-cache') + 1] == 'out dir/texture_index.json'
+    assert '--skip-mesh' in command
+    assert '--profile' not in command
+
+def test_profiles_are_merged(converter, stub_blender, tmp_path, monkeypatch):
+    monkeypatch.setattr(converter, 'blender_249_path', stub_blender)
+    monkeypatch.setattr(converter, 'blender_36_path', stub_blender)
+    monkeypatch.setattr(converter, 'script_profiles', None)
+    monkeypatch.setattr(converter, 'timing_report', None)
+    monkeypatch.setattr(converter, 'export_pool', None)
+    profiles = converter.use_script_profiles(str(tmp_path / 'profile dir'), 5)
+    output = str(tmp_path / 'output dir')
+    rmb_file = str(tmp_path / 'models' / 'm001.rmb')
+    rab_files = [str(tmp_path / 'models' / 'm001_walk.rab'), str(tmp_path / 'models' / 'm001_idle.rab')]
+
+    returncode, saved, errors, _ = converter.run_session_249(output, rmb_file, rab_files, True)
+    assert (returncode, errors) == (0, [])
+    assert saved == [os.path.join(output, 'm001', name) for name in ('m001.blend', 'm001_walk.blend', 'm001_idle.blend')]
+    assert converter.export_blend_to_fbx(os.path.join(output, 'm001', 'm001_walk.blend'), os.path.join(output, 'm001'), rmb_file) == 0
+
+    names = sorted([os.path.basename(filepath) for filepath in profiles.files()])
+    assert names == ['m001.blender249.prof', 'm001_idle.blender249.prof', 'm001_walk.blender249.prof', 'm001_walk.blender36.prof']
+
+    stats = profiles.finish()
+    assert stats is not None
+    merged = pstats.Stats(os.path.join(profiles.dir, converter.PROFILE_MERGED))
+    work = [func for func in merged.stats if func[2] == 'work']
+    assert len(work) == 1
+    # one call per job
+    assert merged.stats[work[0]][1] == 4
+
+    with open(os.path.join(profiles.dir, converter.PROFILE_SUMMARY)) as file:
+        summary = file.read()
+    assert 'stub_blender.py' in summary and 'work' in summary
+
+def test_python2_profiles_are_merged(converter, tmp_path):
+    data = converter.load_profile(PYTHON2_PROFILE)
+    assert data is not None
+    # Python 2 strings load as bytes, the keys are str like the ones of Python 3 profiles
+    assert data.stats[('<stdin>', 5, 'work')][1] == 1
+
+    profiles = converter.ScriptProfiles(str(tmp_path / 'profile dir'), 5)
+    shutil.copy(PYTHON2_PROFILE, profiles.dir)
+    with open(os.path.join(profiles.dir, 'm001.blender36.prof'), 'wb') as file:
+        file.write(b'not a profile')
+    assert profiles.finish() is not None
+
+    merged = pstats.Stats(os.path.join(profiles.dir, converter.PROFILE_MERGED))
+    assert ('<stdin>', 5, 'work') in merged.stats
+    with open(os.path.join(profiles.dir, converter.PROFILE_SUMMARY)) as file:
+        assert 'work' in file.read()
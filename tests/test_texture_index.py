@@ -0,0 +1,103 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Texture index cache file shared by parallel Blender jobs
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+
+import pytest
+
+import texture_index
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    # the index caches listings per process, every test starts without any
+    texture_index._indexes.clear()
+    texture_index._texture_dirs.clear()
+    yield
+    texture_index._new_dirs = {}
+    texture_index.set_cache_file(None)
+    texture_index._indexes.clear()
+
+def texture_dir(tmp_path, name, files):
+    dirname = tmp_path / name
+    dirname.mkdir()
+    for filename in files:
+        (dirname / filename).write_bytes(b'')
+    return str(dirname)
+
+def cached_dirs(cache_file):
+    with open(cache_file) as file:
+        return json.load(file)['dirs']
+
+def test_lookup_is_case_insensitive(tmp_path):
+    dirname = texture_dir(tmp_path, 'texture', ['Tex1.DDS', 'tex1_sp.dds'])
+    assert texture_index.find_texture(os.path.join(dirname, 'tex1.dds')) == os.path.join(dirname, 'Tex1.DDS')
+    assert texture_index.find_specific_texture(os.path.join(dirname, 'TEX1.dds'), '_sp') == os.path.join(dirname, 'tex1_sp.dds')
+    assert texture_index.find_specific_texture(os.path.join(dirname, 'tex1.dds'), '_n') is None
+
+def test_saved_once_when_done(tmp_path):
+    cache_file = str(tmp_path / 'texture_index.json')
+    dirname = texture_dir(tmp_path, 'texture', ['a.dds'])
+    texture_index.set_cache_file(cache_file)
+    texture_index.find_texture(os.path.join(dirname, 'a.dds'))
+    # nothing is written in the middle of the import
+    assert not os.path.exists(cache_file)
+
+    texture_index.save_cache()
+    assert cached_dirs(cache_file)[dirname]['files'] == ['a.dds']
+
+def test_parallel_jobs_keep_each_others_listings(tmp_path):
+    cache_file = str(tmp_path / 'texture_index.json')
+    first = texture_dir(tmp_path, 'first', ['a.dds'])
+    second = texture_dir(tmp_path, 'second', ['b.dds'])
+
+    # both jobs loaded the empty cache, the other one saves while this one is running
+    texture_index.set_cache_file(cache_file)
+    texture_index.find_texture(os.path.join(first, 'a.dds'))
+    with open(cache_file, 'w') as file:
+        json.dump({'version': texture_index.CACHE_VERSION, 'dirs': {second: {'mtime': os.stat(second).st_mtime, 'files': ['b.dds']}}}, file)
+    texture_index.save_cache()
+
+    assert sorted(cached_dirs(cache_file)) == sorted([first, second])
+
+def test_failed_write_is_a_warning(tmp_path, capsys):
+    # a directory in place of the file makes the swap fail like a file held open on Windows
+    cache_file = tmp_path / 'texture_index.json'
+    dirname = texture_dir(tmp_path, 'texture', ['a.dds'])
+    texture_index.set_cache_file(str(cache_file))
+    cache_file.mkdir()
+    assert texture_index.find_texture(os.path.join(dirname, 'a.dds')) == os.path.join(dirname, 'a.dds')
+
+    texture_index.save_cache()
+    assert 'Texture index cache not saved' in capsys.readouterr().out
+    # the temporary file is removed
+    assert sorted(os.listdir(tmp_path)) == ['texture', 'texture_index.json']
+
+def test_switching_files_saves_pending_listings(tmp_path):
+    first_cache = str(tmp_path / 'first.json')
+    dirname = texture_dir(tmp_path, 'texture', ['a.dds'])
+    texture_index.set_cache_file(first_cache)
+    texture_index.find_texture(os.path.join(dirname, 'a.dds'))
+
+    # the next export server job uses no cache file
+    texture_index.set_cache_file(None)
+    assert dirname in cached_dirs(first_cache)
+    texture_index.save_cache()
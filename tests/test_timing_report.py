@@ -0,0 +1,127 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Timing report: stages of the converter and of the Blender sidecars, summed per model and action
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+
+import pytest
+
+from stage_timer import StageTimer
+
+
+def write_sidecar(report, process, started, cpu, stages):
+    """Sidecar of a finished Blender process with (stage, file, wall, cpu) stages, returns its path"""
+    timer = StageTimer(process)
+    for name, filepath, wall, stage_cpu in stages:
+        timer.add(name, filepath, wall, stage_cpu)
+    data = timer.to_dict()
+    data.update(started=started, cpu=cpu)
+
+    sidecar = report.sidecar(process)
+    with open(sidecar, 'w') as file:
+        json.dump(data, file)
+    return sidecar
+
+def entry(count, wall, cpu):
+    return {'count': count, 'wall': wall, 'cpu': cpu}
+
+@pytest.fixture
+def report(converter, tmp_path):
+    """Report of m1 (a session importing two actions, an export and a crashed export) and m2 (a session)"""
+    report = converter.TimingReport(str(tmp_path))
+    sidecar = write_sidecar(report, 'blender249', 100.0, 5.0, [
+        ('parse', 'm1.rmb', 1.0, 0.75),
+        ('import_action', 'm1_walk.rab', 2.0, 1.5),
+        ('import_action', 'm1_idle.rab', 1.0, 1.0),
+        ('save', 'm1_walk.blend', 0.5, 0.25),
+    ])
+    report.collect('m1', 'blender249', sidecar, None, 6.0, launched=98.75)
+    sidecar = write_sidecar(report, 'blender36', 200.0, 2.5, [('export', 'm1_walk.blend', 2.0, 1.75)])
+    report.collect('m1', 'blender36', sidecar, 'm1_walk.blend', 3.0, launched=199.25)
+    # the process died before writing its sidecar
+    report.collect('m1', 'blender36', report.sidecar('blender36'), 'm1_idle.blend', 0.5, launched=300.0)
+
+    sidecar = write_sidecar(report, 'blender249', 400.0, 1.0, [('parse', 'm2.rmb', 0.5, 0.5)])
+    report.collect('m2', 'blender249', sidecar, None, 1.0)
+    return report
+
+
+def test_stages_are_grouped_by_action(report):
+    models = report.report()['models']
+    assert sorted(models) == ['m1', 'm2']
+    # stages of a .rab/.blend file belong to its action, the process totals without a file to the model
+    assert models['m1']['actions'] == {
+        'm1': {
+            'blender249/total': entry(1, 6.0, 5.0),
+            'blender249/startup': entry(1, 1.25, 0.0),
+            'blender249/parse': entry(1, 1.0, 0.75),
+        },
+        'm1_walk': {
+            'blender249/import_action': entry(1, 2.0, 1.5),
+            'blender249/save': entry(1, 0.5, 0.25),
+            'blender36/total': entry(1, 3.0, 2.5),
+            'blender36/startup': entry(1, 0.75, 0.0),
+            'blender36/export': entry(1, 2.0, 1.75),
+        },
+        'm1_idle': {
+            'blender249/import_action': entry(1, 1.0, 1.0),
+            'blender36/total': entry(1, 0.5, 0.0),
+        },
+    }
+    # without a launch time there is no startup stage
+    assert models['m2']['actions'] == {'m2': {'blender249/total': entry(1, 1.0, 1.0), 'blender249/parse': entry(1, 0.5, 0.5)}}
+
+def test_model_totals_leave_out_the_process_totals(report):
+    models = report.report()['models']
+    assert (models['m1']['wall'], models['m1']['cpu']) == (1.25 + 1.0 + 2.0 + 1.0 + 0.5 + 0.75 + 2.0, 0.75 + 1.5 + 1.0 + 0.25 + 1.75)
+    assert (models['m2']['wall'], models['m2']['cpu']) == (0.5, 0.5)
+
+def test_slowest_stages_of_every_model(report):
+    assert report.report()['slowest'] == [
+        {'stage': 'blender249/import_action', 'count': 2, 'wall': 3.0, 'cpu': 2.5, 'max_wall': 2.0},
+        {'stage': 'blender36/export', 'count': 1, 'wall': 2.0, 'cpu': 1.75, 'max_wall': 2.0},
+        {'stage': 'blender249/parse', 'count': 2, 'wall': 1.5, 'cpu': 1.25, 'max_wall': 1.0},
+        {'stage': 'blender249/startup', 'count': 1, 'wall': 1.25, 'cpu': 0.0, 'max_wall': 1.25},
+        {'stage': 'blender36/startup', 'count': 1, 'wall': 0.75, 'cpu': 0.0, 'max_wall': 0.75},
+        {'stage': 'blender249/save', 'count': 1, 'wall': 0.5, 'cpu': 0.25, 'max_wall': 0.5},
+    ]
+    assert [entry['stage'] for entry in report.report(top=2)['slowest']] == ['blender249/import_action', 'blender36/export']
+
+def test_converter_stages(converter, tmp_path):
+    report = converter.TimingReport(str(tmp_path))
+    for _ in range(2):
+        with report.stage('m1', 'native_fbx', 'm1.rmb'):
+            pass
+    with report.stage('m1', 'warm_cache'):
+        pass
+
+    actions = report.report()['models']['m1']['actions']
+    assert sorted(actions) == ['m1']
+    assert sorted(actions['m1']) == ['converter/native_fbx', 'converter/warm_cache']
+    assert actions['m1']['converter/native_fbx']['count'] == 2
+
+def test_finish_writes_the_report(converter, report, tmp_path, capsys):
+    expected = report.report()
+    assert report.finish(str(tmp_path)) == expected
+    with open(tmp_path / converter.TIMING_REPORT) as file:
+        assert json.load(file) == expected
+    # every sidecar was collected
+    assert not os.path.exists(report.dir)
+    assert 'blender249/import_action' in capsys.readouterr().out
@@ -0,0 +1,152 @@
+# Author: Trolll, https://github.com/Trolll67, https://vk.com/trolll67
+# Date: 2026-10-17
+# Description: Parsed models and actions give the same rows as typed arrays (no numpy) and as numpy arrays
+#
+# License: GNU General Public License v3.0
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+from array import array
+
+import pytest
+
+from conftest import run_python2, use_numpy
+
+numpy = pytest.importorskip('numpy')
+
+import model_cache
+import rmb_rab_parser
+from rmb_rab_parser import Vectors, load_rab, load_rmb, typed_array
+from rmb_rab_writer import write_synthetic_model
+
+# parse variants: plain stream, memory mapped file, model cache miss (parse and
+# write the sidecar) and model cache hit (sidecar built with the other numpy setting)
+VARIANTS = ['stream', 'mmap', 'cache miss', 'cache hit']
+
+
+@pytest.fixture(scope='module')
+def model_files(tmp_path_factory):
+    dirname = str(tmp_path_factory.mktemp('model'))
+    write_synthetic_model(dirname, 'm1', 2, 300, 6, 9, ('walk',), 5)
+    return os.path.join(dirname, 'm1.rmb'), os.path.join(dirname, 'm1_walk.rab')
+
+@pytest.fixture(scope='module')
+def reference(model_files):
+    # numpy views into the memory mapped files
+    return columns(load_rmb(model_files[0], use_mmap=True), load_rab(model_files[1], use_mmap=True))
+
+
+def load(monkeypatch, tmp_path, files, variant, with_numpy):
+    rmb_path, rab_path = files
+    use_numpy(monkeypatch, with_numpy, rmb_rab_parser, model_cache)
+    if variant in ('stream', 'mmap'):
+        monkeypatch.setattr(model_cache, '_cache_dir', None)
+        return load_rmb(rmb_path, use_mmap=variant == 'mmap'), load_rab(rab_path, use_mmap=variant == 'mmap')
+
+    monkeypatch.setattr(model_cache, '_cache_dir', str(tmp_path / 'cache'))
+    if variant == 'cache hit':
+        use_numpy(monkeypatch, not with_numpy, rmb_rab_parser, model_cache)
+        model_cache.load_rmb(rmb_path)
+        model_cache.load_rab(rab_path)
+        use_numpy(monkeypatch, with_numpy, rmb_rab_parser, model_cache)
+        for path, kind in ((rmb_path, 'rmb'), (rab_path, 'rab')):
+            sidecar = model_cache.open_sidecar(path, kind)
+            assert sidecar is not None
+            sidecar.close()
+    return model_cache.load_rmb(rmb_path), model_cache.load_rab(rab_path)
+
+def columns(model, action):
+    """Every vertex, index, skin and key column of a parsed model and action"""
+    result = {}
+    for mesh in model.meshes:
+        for field in ('vert_pos_list', 'vert_norm_list', 'vert_uv_list', 'indice_list'):
+            result[mesh.name, field] = getattr(mesh, field)
+        result[mesh.name, 'weight_list'] = mesh.skin.weight_list
+        result[mesh.name, 'skin_indice_list'] = mesh.skin.indice_list
+    for bone in action.bones:
+        for field in ('pos_frames', 'rot_frames', 'pos_frame_list', 'rot_frame_list', 'pos_key_list', 'rot_key_list', 'rot_accum_list'):
+            result[bone.name, field] = getattr(bone, field)
+    return result
+
+def rows(values):
+    """Vectors as tuples of Python floats, values of a flat column as Python floats"""
+    return [tuple([float(v) for v in row]) if isinstance(row, (tuple, numpy.ndarray)) else float(row) for row in values]
+
+
+@pytest.mark.parametrize('variant', VARIANTS)
+@pytest.mark.parametrize('with_numpy', [False, True], ids=['typed arrays', 'numpy'])
+def test_same_rows(monkeypatch, tmp_path, model_files, reference, variant, with_numpy):
+    model, action = load(monkeypatch, tmp_path, model_files, variant, with_numpy)
+    result = columns(model, action)
+    assert sorted(result) == sorted(reference)
+
+    for key in reference:
+        if not with_numpy:
+            assert isinstance(result[key], (Vectors, array)), key
+        assert len(result[key]) == len(reference[key]), key
+        if key[1] == 'rot_accum_list':
+            # a prefix scan with numpy, key by key without
+            assert [v for row in rows(result[key]) for v in row] == pytest.approx([v for row in rows(reference[key]) for v in row], abs=1e-12), key
+        else:
+            assert rows(result[key]) == rows(reference[key]), key
+
+def test_vectors_behave_like_a_list_of_tuples():
+    values = [(1.5, -2.0, 3.25), (4.0, 5.5, -6.0), (7.0, 8.0, 9.5)]
+    vectors = Vectors(array('f', [v for row in values for v in row]), 3)
+
+    assert len(vectors) == 3
+    assert list(vectors) == values
+    assert [vectors[i] for i in range(3)] == values
+    assert vectors[-1] == values[-1]
+    assert vectors[1:] == values[1:]
+    with pytest.raises(IndexError):
+        vectors[3]
+    assert numpy.asarray(vectors).tolist() == [list(row) for row in values]
+    assert numpy.asarray(vectors, dtype=numpy.float64).dtype == numpy.float64
+
+def test_typed_array_byte_order():
+    values = array('H', [0, 1, 2, 3])
+    assert typed_array('H', numpy.arange(4, dtype='<u2').tobytes()) == values
+    assert typed_array('H', numpy.arange(4, dtype='>u2').tobytes(), big_endian=True) == values
+
+def test_python2_mmap_parse_gives_the_same_rows(python2, model_files, reference):
+    # Blender 2.49 parses with Python 2 and without numpy
+    output = run_python2(python2, """
+import json
+import rmb_rab_parser
+model = rmb_rab_parser.load_rmb({0!r}, use_mmap=True)
+action = rmb_rab_parser.load_rab({1!r}, use_mmap=True)
+columns = {{}}
+for mesh in model.meshes:
+    columns[mesh.name + ' vert_pos_list'] = [list(row) for row in mesh.vert_pos_list]
+    columns[mesh.name + ' indice_list'] = list(mesh.indice_list)
+    columns[mesh.name + ' weight_list'] = [list(row) for row in mesh.skin.weight_list]
+for bone in action.bones:
+    columns[bone.name + ' rot_key_list'] = [list(row) for row in bone.rot_key_list]
+    columns[bone.name + ' rot_accum_list'] = [list(row) for row in bone.rot_accum_list]
+print(json.dumps(columns))
+""".format(*model_files))
+
+    columns = json.loads(output)
+    assert len(columns) == 2 * 3 + 6 * 2
+    for key, values in columns.items():
+        name, field = key.split(' ')
+        expected = rows(reference[name, field])
+        if field == 'rot_accum_list':
+            assert [v for row in values for v in row] == pytest.approx([v for row in expected for v in row], abs=1e-12), key
+        else:
+            assert [tuple(row) if isinstance(row, list) else row for row in values] == expected, key